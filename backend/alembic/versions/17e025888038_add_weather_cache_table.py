@@ -0,0 +1,35 @@
+"""Add weather_cache table
+
+Revision ID: 17e025888038
+Revises: 34c95c897902
+Create Date: 2026-10-19 11:40:02.917340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '17e025888038'
+down_revision: Union[str, Sequence[str], None] = '34c95c897902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('weather_cache',
+    sa.Column('cell_key', sa.String(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('stored_at', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('cell_key')
+    )
+    op.create_index(op.f('ix_weather_cache_stored_at'), 'weather_cache', ['stored_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_weather_cache_stored_at'), table_name='weather_cache')
+    op.drop_table('weather_cache')
@@ -0,0 +1,46 @@
+"""Add job_runs table
+
+Revision ID: 34c95c897902
+Revises: 2d13ccd14695
+Create Date: 2026-10-19 09:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '34c95c897902'
+down_revision: Union[str, Sequence[str], None] = '2d13ccd14695'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_name', sa.String(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=True),
+    sa.Column('users_scanned', sa.Integer(), nullable=True),
+    sa.Column('cells_fetched', sa.Integer(), nullable=True),
+    sa.Column('cache_hits', sa.Integer(), nullable=True),
+    sa.Column('rows_inserted', sa.Integer(), nullable=True),
+    sa.Column('rows_updated', sa.Integer(), nullable=True),
+    sa.Column('errors', sa.Integer(), nullable=True),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_job_runs_job_name'), 'job_runs', ['job_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_runs_job_name'), table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,47 @@
+"""Add plants.category with backfill
+
+Revision ID: 5c1e7a9d3b42
+Revises: 17e025888038
+Create Date: 2026-10-19 14:05:31.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d3b42'
+down_revision: Union[str, Sequence[str], None] = '17e025888038'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keywords as of this revision (app/data/plant_profiles.json); first match wins
+CATEGORY_KEYWORDS = [
+    ("flowering", ["rose", "lily", "flower", "orchid", "jasmine"]),
+    ("vegetables", ["tomato", "pepper", "spinach", "carrot", "potato"]),
+    ("herbs", ["basil", "mint", "thyme", "oregano", "tulsi"]),
+]
+
+
+def _category_case() -> str:
+    whens = []
+    for category, keywords in CATEGORY_KEYWORDS:
+        match = " OR ".join(f"lower(species) LIKE '%{keyword}%'" for keyword in keywords)
+        whens.append(f"WHEN {match} THEN '{category}'")
+    return f"CASE {' '.join(whens)} ELSE 'flowering' END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('plants', sa.Column('category', sa.String(), nullable=True))
+    op.create_index('ix_plants_user_id_category', 'plants', ['user_id', 'category'], unique=False)
+
+    op.execute(f"UPDATE plants SET category = {_category_case()} WHERE category IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_plants_user_id_category', table_name='plants')
+    op.drop_column('plants', 'category')
@@ -0,0 +1,41 @@
+"""Add garden_summaries table
+
+Revision ID: 8e4b2f6a1c07
+Revises: 5c1e7a9d3b42
+Create Date: 2026-10-19 15:22:47.631905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2f6a1c07'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are built lazily on first profile read and by the reconcile job
+    op.create_table('garden_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_plants', sa.Integer(), nullable=False),
+    sa.Column('flowering', sa.Integer(), nullable=False),
+    sa.Column('vegetables', sa.Integer(), nullable=False),
+    sa.Column('herbs', sa.Integer(), nullable=False),
+    sa.Column('health_sum', sa.Float(), nullable=False),
+    sa.Column('needs_attention', sa.Integer(), nullable=False),
+    sa.Column('last_activity_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('garden_summaries')
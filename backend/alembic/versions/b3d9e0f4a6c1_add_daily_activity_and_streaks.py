@@ -0,0 +1,62 @@
+"""Add daily_activity rollup and garden summary streaks
+
+Revision ID: b3d9e0f4a6c1
+Revises: 8e4b2f6a1c07
+Create Date: 2026-10-19 16:48:10.540273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9e0f4a6c1'
+down_revision: Union[str, Sequence[str], None] = '8e4b2f6a1c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _day_number(column: str) -> str:
+    # Days since 1970-01-01 UTC, matching app.services.activity.day_number
+    if op.get_bind().dialect.name == "sqlite":
+        return f"CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+    return f"CAST(FLOOR(EXTRACT(EPOCH FROM {column}) / 86400) AS INTEGER)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_activity',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day_number', sa.Integer(), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day_number')
+    )
+    op.add_column('garden_summaries', sa.Column('streak_days', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('garden_summaries', sa.Column('streak_last_day', sa.Integer(), nullable=True))
+
+    # Backfill the rollup from existing logs and scans
+    op.execute(f"""
+        INSERT INTO daily_activity (user_id, day_number, events)
+        SELECT plants.user_id, activity.day_number, COUNT(*)
+        FROM (
+            SELECT plant_id, {_day_number('recorded_at')} AS day_number FROM plant_logs WHERE recorded_at IS NOT NULL
+            UNION ALL
+            SELECT plant_id, {_day_number('timestamp')} AS day_number FROM disease_records WHERE timestamp IS NOT NULL
+        ) AS activity
+        JOIN plants ON plants.id = activity.plant_id
+        WHERE plants.user_id IS NOT NULL
+        GROUP BY plants.user_id, activity.day_number
+    """)
+    # Summaries are derived data: clear them so each is rebuilt with its
+    # streak on first profile read (or by the reconcile job)
+    op.execute("DELETE FROM garden_summaries")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('garden_summaries', 'streak_last_day')
+    op.drop_column('garden_summaries', 'streak_days')
+    op.drop_table('daily_activity')
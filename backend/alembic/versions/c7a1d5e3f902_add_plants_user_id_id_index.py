@@ -0,0 +1,28 @@
+"""Add plants (user_id, id) index for keyset pagination
+
+Revision ID: c7a1d5e3f902
+Revises: b3d9e0f4a6c1
+Create Date: 2026-10-19 18:03:54.117820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a1d5e3f902'
+down_revision: Union[str, Sequence[str], None] = 'b3d9e0f4a6c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_plants_user_id_id', 'plants', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_plants_user_id_id', table_name='plants')
@@ -0,0 +1,30 @@
+"""Add (plant_id, time) indexes for paginated plant history
+
+Revision ID: d4f8b2c6e1a3
+Revises: c7a1d5e3f902
+Create Date: 2026-10-19 19:12:40.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8b2c6e1a3'
+down_revision: Union[str, Sequence[str], None] = 'c7a1d5e3f902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_plant_logs_plant_id_recorded_at', 'plant_logs', ['plant_id', 'recorded_at'], unique=False)
+    op.create_index('ix_disease_records_plant_id_timestamp', 'disease_records', ['plant_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_disease_records_plant_id_timestamp', table_name='disease_records')
+    op.drop_index('ix_plant_logs_plant_id_recorded_at', table_name='plant_logs')
@@ -0,0 +1,32 @@
+"""Index image_path columns for blob reference counting
+
+Revision ID: e2a6c9f1b7d4
+Revises: d4f8b2c6e1a3
+Create Date: 2026-10-19 20:05:17.642398
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c9f1b7d4'
+down_revision: Union[str, Sequence[str], None] = 'd4f8b2c6e1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_plants_image_path', 'plants', ['image_path'], unique=False)
+    op.create_index('ix_plant_logs_image_path', 'plant_logs', ['image_path'], unique=False)
+    op.create_index('ix_disease_records_image_path', 'disease_records', ['image_path'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_disease_records_image_path', table_name='disease_records')
+    op.drop_index('ix_plant_logs_image_path', table_name='plant_logs')
+    op.drop_index('ix_plants_image_path', table_name='plants')
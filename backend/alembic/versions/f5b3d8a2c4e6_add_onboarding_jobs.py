@@ -0,0 +1,47 @@
+"""Add onboarding_jobs table and plants.onboarding_status
+
+Revision ID: f5b3d8a2c4e6
+Revises: e2a6c9f1b7d4
+Create Date: 2026-10-19 21:14:02.958163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b3d8a2c4e6'
+down_revision: Union[str, Sequence[str], None] = 'e2a6c9f1b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('plants', sa.Column('onboarding_status', sa.String(), server_default='ready', nullable=False))
+    op.create_table('onboarding_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plant_id', sa.Integer(), nullable=True),
+    sa.Column('idempotency_key', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['plant_id'], ['plants.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_onboarding_jobs_user_id_idempotency_key')
+    )
+    op.create_index(op.f('ix_onboarding_jobs_id'), 'onboarding_jobs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_onboarding_jobs_id'), table_name='onboarding_jobs')
+    op.drop_table('onboarding_jobs')
+    op.drop_column('plants', 'onboarding_status')
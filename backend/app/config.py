@@ -6,6 +6,68 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "supersecretkey" # Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60 # How long an authenticated user is reused without a DB lookup
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12 # Work factor; existing hashes are upgraded on next login
+    PASSWORD_HASH_WORKERS: int = 2 # Dedicated bcrypt threads (kept off the request threadpool)
+    PASSWORD_HASH_MAX_QUEUE: int = 32 # Waiting hash jobs before logins get 503
+    ADMIN_EMAILS: list[str] = [] # Users allowed to hit /admin endpoints
+
+    # Plant catalog
+    PLANT_PROFILES_PATH: str = "app/data/plant_profiles.json" # Care profiles + category keywords (relative to backend/)
+    SPECIES_RESOLVER_CACHE_SIZE: int = 4096 # Memoized free-text species lookups
+    ADVICE_CACHE_SIZE: int = 8192 # Memoized advice results for quantized inputs
+    ADVICE_CACHE_MAX_AGE: int = 3600 # Cache-Control max-age (seconds) for /advice/ responses
+
+    # Uploads
+    UPLOAD_DIR: str = "uploads" # Served at /uploads
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024 # Larger images get 413
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024 # Streaming read/write size
+    UPLOAD_FORM_OVERHEAD_BYTES: int = 64 * 1024 # Multipart framing + form fields allowed on top of the image
+    UPLOAD_ALLOWED_TYPES: list[str] = ["image/jpeg", "image/png", "image/webp"] # Checked against magic bytes
+    BLOB_RELEASE_GRACE_SECONDS: int = 300 # Unreferenced blobs touched more recently than this are kept
+    IMAGE_THUMB_SIZE: int = 256 # Bounding box (px) of /images/thumb renditions
+    IMAGE_MEDIUM_SIZE: int = 1024 # Bounding box (px) of /images/medium renditions
+    IMAGE_WEBP_QUALITY: int = 80
+
+    # Plant onboarding (POST /onboarding/plants)
+    ONBOARDING_WORKERS: int = 2 # Threads running first-leaf inference
+    ONBOARDING_STALE_SECONDS: int = 600 # "running" jobs untouched this long are re-queued on startup
+    ONBOARDING_EVENTS_POLL_SECONDS: float = 0.5 # Job status poll interval of the SSE stream
+    ONBOARDING_EVENTS_TIMEOUT_SECONDS: int = 120 # SSE streams close after this; clients reconnect or poll
+
+    # API pagination
+    PLANTS_PAGE_DEFAULT: int = 100 # GET /plants page size when no limit is given
+    PLANTS_PAGE_MAX: int = 500
+    HISTORY_PAGE_DEFAULT: int = 50 # Logs / disease records per page
+    HISTORY_PAGE_MAX: int = 200
+    PLANT_DETAIL_HISTORY_LIMIT: int = 20 # Latest logs / disease records embedded in GET /plants/{id}
+    PLANT_LIST_HISTORY_LIMIT: int = 5 # ...and in each plant of GET /plants?view=full
+
+    # Background jobs
+    JOB_RUN_HISTORY_LIMIT: int = 200 # Runs kept per job in job_runs
+    SCHEDULER_USER_CHUNK_SIZE: int = 500 # Users processed (and committed) per batch
+    GARDEN_SUMMARY_RECONCILE_MINUTES: int = 360 # Drift repair for garden_summaries
+    BLOB_SWEEP_MINUTES: int = 60 # Removal of unreferenced blobs past BLOB_RELEASE_GRACE_SECONDS
+
+    # Weather (Open-Meteo)
+    WEATHER_CONNECT_TIMEOUT_SECONDS: float = 3.05
+    WEATHER_READ_TIMEOUT_SECONDS: float = 10.0
+    WEATHER_MAX_CONNECTIONS: int = 16 # Keep-alive pool size and async concurrency cap
+    WEATHER_RETRY_ATTEMPTS: int = 3
+    WEATHER_RETRY_BASE_DELAY_SECONDS: float = 0.2
+    WEATHER_RETRY_MAX_DELAY_SECONDS: float = 2.0
+    WEATHER_BREAKER_FAILURE_THRESHOLD: int = 5 # Consecutive failed calls before failing fast
+    WEATHER_BREAKER_RESET_SECONDS: float = 30.0
+    WEATHER_FETCH_CONCURRENCY: int = 8 # Parallel upstream calls per scheduler job
+    WEATHER_BATCH_MAX_LOCATIONS: int = 100 # Locations per multi-location request
+    WEATHER_BATCH_MAX_QUERY_LENGTH: int = 1500 # Chars of lat/lon lists per request (keeps URLs < 2 KB)
+    WEATHER_CELL_DEGREES: float = 0.1 # Cache grid size (~11 km)
+    WEATHER_CACHE_TTL_SECONDS: int = 900 # Forecast refresh interval per cell
+    WEATHER_STALE_TTL_SECONDS: int = 21600 # Serve last good forecast this long past TTL while refreshing
+    WEATHER_FORECAST_DAYS: int = 2
+    WEATHER_CACHE_MAX_CELLS: int = 10000
+    WEATHER_CACHE_BACKEND: str = "memory" # "memory" or "database" (shared across workers)
 
     class Config:
         env_file = ".env"
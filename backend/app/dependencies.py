@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app import database
 from app.config import settings
 from app.models.user import User
+from app.services.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -21,8 +22,27 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+
+    issued_at = payload.get("iat")
+    user = principal_cache.get(db, email, issued_at)
+    if user is not None:
+        return user
+
+    # Tokens carry the user id, so a miss is a primary-key lookup
+    generation = principal_cache.generation(email)
+    user_id = payload.get("uid")
+    if user_id is not None:
+        user = db.get(User, user_id)
+        if user is not None and user.email != email:
+            user = None
+    else:
+        user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise credentials_exception
+    principal_cache.put(email, issued_at, user, generation)
     return user
+
+def get_current_admin(current_user: User = Depends(get_current_user)):
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
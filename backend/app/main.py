@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth, plants, disease, reminders, weather
-from app.services.scheduler import start_scheduler
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.weather_service import weather_service
+from app.services.password_hasher import password_hasher
+from app.services.onboarding import onboarding_queue
 # from app.config import settings
 
 app = FastAPI(
@@ -21,6 +24,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Location"],
 )
 
 app.include_router(auth.router)
@@ -32,24 +36,51 @@ from app.routers import advice
 app.include_router(advice.router)
 from app.routers import users
 app.include_router(users.router)
+from app.routers import admin
+app.include_router(admin.router)
+from app.routers import images
+app.include_router(images.router)
+from app.routers import onboarding
+app.include_router(onboarding.router)
 
-from fastapi.staticfiles import StaticFiles
+from app.config import settings
+from app.services.blob_store import blob_store
+from app.utils.http_cache import ImmutableStaticFiles, TransferCountingMiddleware, image_transfer_stats
+from app.utils.uploads import UploadSizeLimitMiddleware
 import os
 
 # Create uploads directory if not exists
-if not os.path.exists("uploads"):
-    os.makedirs("uploads")
+if not os.path.exists(settings.UPLOAD_DIR):
+    os.makedirs(settings.UPLOAD_DIR)
 
-# Mount uploads directory
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Mount uploads directory (content-addressed blobs are cached as immutable)
+app.mount(
+    "/uploads",
+    ImmutableStaticFiles(directory=settings.UPLOAD_DIR, etag_for=blob_store.content_etag),
+    name="uploads"
+)
+app.add_middleware(TransferCountingMiddleware, transfer_stats=image_transfer_stats)
+# Oversized uploads are refused before Starlette spools them to disk
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_BYTES + settings.UPLOAD_FORM_OVERHEAD_BYTES
+)
 
 from app.database import engine, Base
-from app.models import plant, user, plant_state, disease_record, reminder, plant_log
+from app.models import plant, user, plant_state, disease_record, reminder, plant_log, job_run, weather_cache_entry, garden_summary, daily_activity, onboarding_job
 
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
     start_scheduler()
+    onboarding_queue.recover()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_scheduler()
+    weather_service.close()
+    password_hasher.close()
+    onboarding_queue.close()
 
 @app.get("/")
 def read_root():
@@ -3,3 +3,8 @@ from .plant import Plant
 from .plant_state import PlantState
 from .disease_record import DiseaseRecord
 from .reminder import Reminder
+from .job_run import JobRun
+from .weather_cache_entry import WeatherCacheEntry
+from .garden_summary import GardenSummary
+from .daily_activity import DailyActivity
+from .onboarding_job import OnboardingJob
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class DailyActivity(Base):
+    """One row per user per UTC day with any garden activity (logs, scans, watering)."""
+    __tablename__ = "daily_activity"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day_number = Column(Integer, primary_key=True) # Days since 1970-01-01 (UTC)
+    events = Column(Integer, default=0, nullable=False)
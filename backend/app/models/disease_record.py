@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class DiseaseRecord(Base):
     __tablename__ = "disease_records"
+    __table_args__ = (
+        # Time-ordered history per plant
+        Index("ix_disease_records_plant_id_timestamp", "plant_id", "timestamp"),
+        # Blob reference counting (app/services/blob_store.py)
+        Index("ix_disease_records_image_path", "image_path"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     plant_id = Column(Integer, ForeignKey("plants.id"))
     predicted_class = Column(String)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+class GardenSummary(Base):
+    """Per-user garden counters, kept in step with plant writes (see services/garden_summary.py)."""
+    __tablename__ = "garden_summaries"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_plants = Column(Integer, default=0, nullable=False)
+    flowering = Column(Integer, default=0, nullable=False)
+    vegetables = Column(Integer, default=0, nullable=False)
+    herbs = Column(Integer, default=0, nullable=False)
+    health_sum = Column(Float, default=0.0, nullable=False) # Plants without a state count as 0
+    needs_attention = Column(Integer, default=0, nullable=False) # Plants with health_score < 50
+    streak_days = Column(Integer, default=0, nullable=False) # Consecutive active days ending at streak_last_day
+    streak_last_day = Column(Integer, nullable=True) # daily_activity.day_number
+    last_activity_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
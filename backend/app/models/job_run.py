@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+from app.database import Base
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Float, default=0.0)
+    users_scanned = Column(Integer, default=0)
+    cells_fetched = Column(Integer, default=0) # Upstream weather lookups
+    cache_hits = Column(Integer, default=0)
+    rows_inserted = Column(Integer, default=0)
+    rows_updated = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
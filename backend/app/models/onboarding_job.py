@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+class OnboardingJob(Base):
+    __tablename__ = "onboarding_jobs"
+    __table_args__ = (
+        # A retried POST with the same Idempotency-Key returns the original job
+        UniqueConstraint("user_id", "idempotency_key", name="uq_onboarding_jobs_user_id_idempotency_key"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    plant_id = Column(Integer, ForeignKey("plants.id", ondelete="SET NULL"), nullable=True)
+    idempotency_key = Column(String, nullable=False)
+    status = Column(String, default="queued", nullable=False) # queued / running / succeeded / failed
+    stage = Column(String, default="queued", nullable=False) # queued / analyzing / saving / done
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
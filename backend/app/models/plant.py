@@ -1,15 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Plant(Base):
     __tablename__ = "plants"
+    __table_args__ = (
+        # Garden stats aggregate per user, grouped by category
+        Index("ix_plants_user_id_category", "user_id", "category"),
+        # Keyset pagination of a user's plants (GET /plants)
+        Index("ix_plants_user_id_id", "user_id", "id"),
+        # Blob reference counting (app/services/blob_store.py)
+        Index("ix_plants_image_path", "image_path"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     name = Column(String, index=True)
     species = Column(String, index=True)
+    category = Column(String, nullable=True) # flowering / vegetables / herbs, resolved from species on create
     image_path = Column(String, nullable=True)
+    onboarding_status = Column(String, default="ready", server_default="ready", nullable=False) # pending / ready / failed (async onboarding)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     owner = relationship("app.models.user.User", back_populates="plants")
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class PlantLog(Base):
     __tablename__ = "plant_logs"
+    __table_args__ = (
+        # Time-ordered history per plant
+        Index("ix_plant_logs_plant_id_recorded_at", "plant_id", "recorded_at"),
+        # Blob reference counting (app/services/blob_store.py)
+        Index("ix_plant_logs_image_path", "image_path"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     plant_id = Column(Integer, ForeignKey("plants.id"))
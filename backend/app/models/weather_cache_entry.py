@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, Float, Text
+from app.database import Base
+
+class WeatherCacheEntry(Base):
+    """Shared weather cache row, one per rounded lat/lon cell."""
+    __tablename__ = "weather_cache"
+    cell_key = Column(String, primary_key=True) # "lat,lon" of the cell centre
+    payload = Column(Text) # JSON
+    stored_at = Column(Float, index=True) # unix timestamp
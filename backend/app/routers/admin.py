@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app import database
+from app.models.job_run import JobRun
+from app.models.user import User
+from app.schemas.job_run_schema import JobRunOut
+from app.dependencies import get_current_admin
+from app.services.weather_service import weather_service
+from app.utils.http_cache import image_transfer_stats
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"]
+)
+
+@router.get("/job-runs", response_model=List[JobRunOut])
+def get_job_runs(
+    job_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    query = db.query(JobRun)
+    if job_name:
+        query = query.filter(JobRun.job_name == job_name)
+    return query.order_by(JobRun.id.desc()).limit(limit).all()
+
+@router.get("/weather-cache")
+def get_weather_cache_stats(current_user: User = Depends(get_current_admin)):
+    # Per-process counters: each worker reports its own cache
+    return weather_service.stats()
+
+@router.get("/image-traffic")
+def get_image_traffic_stats(current_user: User = Depends(get_current_admin)):
+    # Per-process counters of /uploads and /images responses and bytes sent
+    return image_transfer_stats.stats()
@@ -1,5 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app import database
+from app.models.plant import Plant
+from app.models.user import User
+from app.config import settings
+from app.dependencies import get_current_user
+from app.schemas.advice_schema import GardenAdvice, PlantAdvice
 from app.services.care_advisor import care_advisor
+from app.services.weather_service import weather_service
+from app.utils.http_cache import cacheable_json
 
 router = APIRouter(
     prefix="/advice",
@@ -7,5 +17,70 @@ router = APIRouter(
 )
 
 @router.get("/")
-def get_plant_advice(species: str, temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0):
-    return care_advisor.get_advice(species, temperature, condition, humidity, wind_speed)
+def get_plant_advice(
+    request: Request,
+    species: str,
+    temperature: float = Query(..., ge=-90, le=60, description="Air temperature, °C"),
+    condition: str = "Clear",
+    humidity: float = Query(50.0, ge=0, le=100, description="Relative humidity, %"),
+    wind_speed: float = Query(0.0, ge=0, le=500, description="Wind speed, km/h"),
+    quantize: bool = False
+):
+    """
+    Advice is a pure function of the query, so responses are cacheable.
+    With quantize=true, inputs are snapped to the rule buckets (and shown
+    numbers rounded), which lets nearby readings share one cache entry.
+    Readings outside physical ranges (or inf/nan) are rejected with 422.
+    """
+    if quantize:
+        advice = care_advisor.get_quantized_advice(species, temperature, condition, humidity, wind_speed)
+    else:
+        advice = care_advisor.get_advice(species, temperature, condition, humidity, wind_speed)
+    return cacheable_json(request, advice, f"public, max-age={settings.ADVICE_CACHE_MAX_AGE}")
+
+@router.get("/garden", response_model=GardenAdvice)
+def get_garden_advice(db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)):
+    """
+    Advice for every plant in the user's garden under their current local weather.
+    """
+    if current_user.latitude is None or current_user.longitude is None:
+        raise HTTPException(status_code=400, detail="Set your garden location first")
+
+    weather = weather_service.get_current_weather(current_user.latitude, current_user.longitude)
+    if not weather:
+        retry_after = max(1, round(weather_service.breaker.retry_after()))
+        raise HTTPException(
+            status_code=503,
+            detail="Weather service unavailable",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    plants = (
+        db.query(Plant.id, Plant.name, Plant.species)
+        .filter(Plant.user_id == current_user.id)
+        .order_by(Plant.id)
+        .all()
+    )
+    advice = care_advisor.get_garden_advice(
+        (plant.species for plant in plants),
+        temperature=weather["temperature"],
+        condition=weather["condition"],
+        humidity=weather["humidity"],
+        wind_speed=weather["wind_speed"] or 0.0
+    )
+
+    return GardenAdvice(
+        weather=weather,
+        profiles_evaluated=len({entry["profile_name"] for entry in advice.values()}),
+        plants=[
+            PlantAdvice(
+                plant_id=plant.id,
+                name=plant.name,
+                species=plant.species,
+                profile_name=advice[plant.species]["profile_name"],
+                text=advice[plant.species]["text"],
+                severity=advice[plant.species]["severity"]
+            )
+            for plant in plants
+        ]
+    )
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 
 from app import database
 from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserOut, Token
-from app.utils.security import verify_password, get_password_hash, create_access_token
+from app.services.password_hasher import HasherBusyError, password_hasher
+from app.utils.security import create_access_token
 from app.config import settings
 
 router = APIRouter(
@@ -14,36 +16,69 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
+def busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts right now, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+# The routes are async so they can await the bounded hasher; their
+# (blocking) database steps run in the threadpool, never on the event loop.
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def _store_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+
 @router.post("/register", response_model=UserOut)
-def register_user(user: UserCreate, db: Session = Depends(database.get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def register_user(user: UserCreate, db: Session = Depends(database.get_db)):
+    db_user = await run_in_threadpool(_find_user, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except HasherBusyError:
+        raise busy_exception()
     new_user = User(
         email=user.email, 
         hashed_password=hashed_password,
         full_name=user.full_name,
         garden_type=user.garden_type
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(_add_user, db, new_user)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+    user = await run_in_threadpool(_find_user, db, form_data.username)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+        except HasherBusyError:
+            raise busy_exception()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Read before any commit expires them (a reload would run on the event loop)
+    claims = {"sub": user.email, "uid": user.id}
+    if new_hash:
+        # Stored hash used an older work factor; upgrade it transparently
+        await run_in_threadpool(_store_hash, db, user, new_hash)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    access_token = create_access_token(data=claims, expires_delta=access_token_expires)
     return {"access_token": access_token, "token_type": "bearer"}
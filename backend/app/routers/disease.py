@@ -1,8 +1,5 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException
 from sqlalchemy.orm import Session
-import shutil
-import os
-from datetime import datetime
 
 from app import database
 from app.models.plant import Plant
@@ -10,20 +7,19 @@ from app.models.disease_record import DiseaseRecord
 from app.models.user import User
 from app.dependencies import get_current_user
 from app.ml.inference import inference_service
+from app.services.image_variants import image_variants
 from app.services.twin_engine import TwinEngine
+from app.utils.uploads import save_upload
 
 router = APIRouter(
     prefix="/disease",
     tags=["Disease Intelligence"]
 )
 
-UPLOAD_DIR = "uploads"
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
-
 @router.post("/analyze/{plant_id}")
 async def analyze_leaf(
     plant_id: int, 
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...), 
     db: Session = Depends(database.get_db), 
     current_user: User = Depends(get_current_user)
@@ -34,13 +30,12 @@ async def analyze_leaf(
         raise HTTPException(status_code=404, detail="Plant not found")
 
     # Save file
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    file_path = os.path.join(UPLOAD_DIR, f"{plant_id}_{timestamp}_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    upload = await save_upload(file)
+    file_path = upload.url_path
+    background_tasks.add_task(image_variants.generate_all, upload.url_path)
         
     # Run Inference
-    result = inference_service.predict(file_path)
+    result = inference_service.predict(upload.path)
     predicted_class = result["class"]
     confidence = result["confidence"]
     
@@ -0,0 +1,35 @@
+import os
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.services.blob_store import blob_store
+from app.services.image_variants import image_variants
+from app.utils.http_cache import IMMUTABLE, etag_matches
+
+router = APIRouter(
+    prefix="/images",
+    tags=["Images"]
+)
+
+@router.get("/{variant}/{path:path}")
+def get_image_variant(request: Request, variant: Literal["thumb", "medium"], path: str):
+    """
+    A downscaled WebP rendition of /uploads/{path}, e.g.
+    /images/thumb/blobs/ab/cd/<sha>.jpg. Missing renditions are rendered on
+    first request and kept on disk. Renditions never change, so they are
+    cached as immutable and revalidations get a 304 without touching disk.
+    """
+    url_path = f"uploads/{path}"
+    parts = path.split("/")
+    if ".." in parts or "" in parts or not os.path.isfile(blob_store.path_for(url_path)):
+        raise HTTPException(status_code=404, detail="Image not found")
+    headers = {"ETag": image_variants.etag(url_path, variant), "Cache-Control": IMMUTABLE}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    try:
+        rendered = image_variants.ensure(url_path, variant)
+    except OSError:
+        raise HTTPException(status_code=415, detail="Image could not be decoded")
+    return FileResponse(rendered, media_type="image/webp", headers=headers)
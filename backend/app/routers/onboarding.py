@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Header, HTTPException, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import database
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models.onboarding_job import OnboardingJob
+from app.models.plant import Plant
+from app.models.plant_state import PlantState
+from app.models.user import User
+from app.schemas.onboarding_schema import OnboardingJobOut
+from app.services.blob_store import blob_store
+from app.services.image_variants import image_variants
+from app.services.onboarding import TERMINAL_STATUSES, find_job, onboarding_queue
+from app.services.species_resolver import species_resolver
+from app.utils.uploads import save_upload
+
+router = APIRouter(
+    prefix="/onboarding",
+    tags=["Onboarding"]
+)
+
+def _accepted(response: Response, job: OnboardingJob) -> OnboardingJob:
+    response.headers["Location"] = f"/onboarding/jobs/{job.id}"
+    return job
+
+# The route is async so it can stream the upload; its (blocking) database
+# steps run in the threadpool, never on the event loop.
+
+def _create_pending_plant(db: Session, user_id: int, name: str, species: str, idempotency_key: str, image_path: str):
+    """Plant, default state and job in one commit. Returns (job, created)."""
+    plant = Plant(
+        name=name,
+        species=species,
+        category=species_resolver.category(species),
+        user_id=user_id,
+        image_path=image_path,
+        onboarding_status="pending"
+    )
+    db.add(plant)
+    db.flush()
+    # Default twin state until inference scores it, so the plant is usable (and counted) like any other
+    db.add(PlantState(plant_id=plant.id))
+    job = OnboardingJob(user_id=user_id, plant_id=plant.id, idempotency_key=idempotency_key)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race
+        db.rollback()
+        blob_store.release(db, [image_path])
+        return find_job(db, user_id, idempotency_key), False
+    db.refresh(job)
+    return job, True
+
+@router.post("/plants", response_model=OnboardingJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_plant_onboarding(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    name: str = Form(...),
+    species: str = Form(...),
+    file: UploadFile = File(...),
+    idempotency_key: str = Header(..., max_length=255, description="Client-chosen key; retries with the same key return the original job"),
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Asynchronous POST /plants/: the plant is created right away with
+    onboarding_status "pending" and inference runs on the onboarding queue.
+    Follow the job via GET /onboarding/jobs/{id} or its /events stream.
+    """
+    user_id = current_user.id
+    existing = await run_in_threadpool(find_job, db, user_id, idempotency_key)
+    if existing:
+        return _accepted(response, existing)
+
+    upload = await save_upload(file)
+    job, created = await run_in_threadpool(
+        _create_pending_plant, db, user_id, name, species, idempotency_key, upload.url_path
+    )
+    if created:
+        onboarding_queue.submit(job.id)
+        background_tasks.add_task(image_variants.generate_all, upload.url_path)
+    return _accepted(response, job)
+
+def _get_job(db: Session, job_id: int, user: User) -> OnboardingJob:
+    job = db.query(OnboardingJob).filter(OnboardingJob.id == job_id, OnboardingJob.user_id == user.id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Onboarding job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=OnboardingJobOut)
+def get_onboarding_job(job_id: int, db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)):
+    return _get_job(db, job_id, current_user)
+
+@router.get("/jobs/{job_id}/events")
+def stream_onboarding_job(job_id: int, db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)):
+    """
+    Server-sent events: one "progress" event per status/stage change, ending
+    with a "done" event once the job succeeds or fails. The stream reads the
+    job row, so it works from any worker, and closes after
+    ONBOARDING_EVENTS_TIMEOUT_SECONDS; clients can then reconnect or poll.
+    """
+    _get_job(db, job_id, current_user)
+
+    def snapshot():
+        # A short-lived session per poll; the request's session is not held open for the stream
+        poll_db = onboarding_queue.session_factory()
+        try:
+            return OnboardingJobOut.model_validate(poll_db.get(OnboardingJob, job_id)).model_dump(mode="json")
+        finally:
+            poll_db.close()
+
+    async def events():
+        last = None
+        deadline = time.monotonic() + settings.ONBOARDING_EVENTS_TIMEOUT_SECONDS
+        while True:
+            data = await run_in_threadpool(snapshot)
+            done = data["status"] in TERMINAL_STATUSES
+            if (data["status"], data["stage"]) != last:
+                last = (data["status"], data["stage"])
+                yield f"event: {'done' if done else 'progress'}\ndata: {json.dumps(data)}\n\n"
+            if done or time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(settings.ONBOARDING_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,85 +1,97 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-import shutil
-import os
-import uuid
+from typing import List, Literal, Optional, Union
+from datetime import datetime
 
 from app import database
 from app.models.plant import Plant
 from app.models.plant_state import PlantState
 from app.models.disease_record import DiseaseRecord
 from app.models.user import User
-from app.schemas.plant_schema import PlantCreate, PlantOut
+from app.config import settings
+from app.schemas.plant_schema import PlantCreate, PlantOut, PlantSummaryOut
+from app.schemas.disease_record_schema import DiseaseRecordOut
 from app.dependencies import get_current_user
-from app.ml.inference import inference_service
+from app.services.activity import mark_activity
+from app.services.blob_store import blob_store, plant_image_paths
+from app.services.image_variants import image_variants
+from app.services.onboarding import predict_leaf
+from app.services.plant_queries import attach_latest_history, history_page, list_plants_page
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.uploads import save_upload
+from app.services.species_resolver import species_resolver
 
 router = APIRouter(
     prefix="/plants",
     tags=["Plants"]
 )
 
-@router.get("/", response_model=List[PlantOut])
-def get_plants(db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)):
-    return db.query(Plant).filter(Plant.user_id == current_user.id).all()
+def require_twin(plant: Plant):
+    """409 unless the plant has a scored twin state (not while onboarding is pending or after it failed)."""
+    if plant.onboarding_status != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Plant onboarding is {plant.onboarding_status}; try again once it is ready"
+        )
+    if plant.plant_state is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Plant has no twin state")
+
+@router.get("/", response_model=Union[List[PlantOut], List[PlantSummaryOut]])
+def get_plants(
+    response: Response,
+    limit: int = Query(settings.PLANTS_PAGE_DEFAULT, ge=1, le=settings.PLANTS_PAGE_MAX),
+    after_id: Optional[int] = Query(None, description="Return plants after this id (X-Next-Cursor of the previous page)"),
+    view: Literal["full", "summary"] = "full",
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    The user's plants in id order, one page at a time. The "full" view
+    includes each plant's latest PLANT_LIST_HISTORY_LIMIT logs and disease
+    records (full history: /plants/{id}/logs, /disease-records); "summary"
+    leaves them out. Either way the page is a fixed number of queries.
+    """
+    plants, next_cursor = list_plants_page(db, current_user.id, limit, after_id, view)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    schema = PlantSummaryOut if view == "summary" else PlantOut
+    return [schema.model_validate(plant) for plant in plants]
 
 @router.post("/", response_model=PlantOut)
 async def create_plant(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     species: str = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(database.get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 1. Save Image
-    UPLOAD_DIR = "uploads"
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    
-    file_extension = file.filename.split(".")[-1]
-    filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # 1. Save Image (thumbnails are rendered after the response is sent)
+    upload = await save_upload(file)
+    file_path = upload.path
+    background_tasks.add_task(image_variants.generate_all, upload.url_path)
         
     # 2. Run Initial Inference (Smart Onboarding - Universal)
     # Run analysis for all plants using the new Universal Model
-    prediction = inference_service.predict(file_path)
+    prediction = predict_leaf(file_path)
     disease_class = prediction["class"]
     confidence = prediction["confidence"]
     
     print(f"DEBUG: Create Plant Inference -> Class: {disease_class}, Conf: {confidence}")
 
-    # Calculate initial health
     # Calculate initial health using Twin Engine logic
     from app.services.twin_engine import TwinEngine
     
-    initial_health = 100.0
-    initial_risk = 0.0
-    
-    if "healthy" not in disease_class.lower() and "mock" not in disease_class.lower():
-            print("DEBUG: Disease Detected! Applying Health Penalty.")
-            # Use confidence as risk index (min 0.5 to show impact)
-            initial_risk = max(0.5, confidence)
-            
-            # Create a temporary state to calculate health
-            temp_state = PlantState(
-                water_stress=0.0,
-                heat_stress=0.0,
-                disease_risk_index=initial_risk
-            )
-            initial_health = TwinEngine.calculate_health_score(temp_state)
-            print(f"DEBUG: Calculated Initial Health: {initial_health}")
-    else:
-        print("DEBUG: Plant deemed Healthy. Health 100.")
+    initial_health, initial_risk = TwinEngine.initial_condition(disease_class, confidence)
+    print(f"DEBUG: Calculated Initial Health: {initial_health}")
 
     # 3. Create Plant
     new_plant = Plant(
         name=name,
         species=species,
+        category=species_resolver.category(species),
         user_id=current_user.id,
-        image_path=f"uploads/{filename}" # Store relative path for frontend
+        image_path=upload.url_path # Store relative path for frontend
     )
     db.add(new_plant)
     db.commit()
@@ -98,7 +110,7 @@ async def create_plant(
         plant_id=new_plant.id,
         predicted_class=disease_class,
         confidence=confidence,
-        image_path=f"uploads/{filename}"
+        image_path=upload.url_path
     )
     db.add(new_record)
     
@@ -112,19 +124,65 @@ from app.schemas.plant_log_schema import PlantLogCreate, PlantLogOut
 
 @router.get("/{plant_id}", response_model=PlantOut)
 def get_plant(plant_id: int, db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)):
-    # Eager load plant_state, logs, and disease_records
+    # Latest history only; the full history is paged via /logs and /disease-records
     plant = db.query(Plant).options(
-        joinedload(Plant.plant_state), 
-        joinedload(Plant.logs),
-        joinedload(Plant.disease_records)
+        joinedload(Plant.plant_state)
     ).filter(Plant.id == plant_id, Plant.user_id == current_user.id).first()
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    attach_latest_history(db, [plant], settings.PLANT_DETAIL_HISTORY_LIMIT)
     return plant
 
+def _history_response(db, current_user, response, plant_id, model, time_column, limit, cursor, since, until):
+    owned = db.query(Plant.id).filter(Plant.id == plant_id, Plant.user_id == current_user.id).first()
+    if not owned:
+        raise HTTPException(status_code=404, detail="Plant not found")
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows, next_position = history_page(db, model, time_column, plant_id, limit, position, since, until)
+    if next_position is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(*next_position)
+    return rows
+
+@router.get("/{plant_id}/logs", response_model=List[PlantLogOut])
+def get_plant_logs(
+    plant_id: int,
+    response: Response,
+    limit: int = Query(settings.HISTORY_PAGE_DEFAULT, ge=1, le=settings.HISTORY_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Growth logs, newest first."""
+    return _history_response(
+        db, current_user, response, plant_id, PlantLog, PlantLog.recorded_at, limit, cursor, since, until
+    )
+
+@router.get("/{plant_id}/disease-records", response_model=List[DiseaseRecordOut])
+def get_plant_disease_records(
+    plant_id: int,
+    response: Response,
+    limit: int = Query(settings.HISTORY_PAGE_DEFAULT, ge=1, le=settings.HISTORY_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Disease scan history, newest first."""
+    return _history_response(
+        db, current_user, response, plant_id, DiseaseRecord, DiseaseRecord.timestamp, limit, cursor, since, until
+    )
+
 @router.post("/{plant_id}/log", response_model=PlantLogOut)
 async def log_growth(
     plant_id: int, 
+    background_tasks: BackgroundTasks,
     height: float = Form(...),
     file: UploadFile = File(None), # Optional image
     db: Session = Depends(database.get_db), 
@@ -138,18 +196,8 @@ async def log_growth(
     
     image_path = None
     if file:
-        UPLOAD_DIR = "uploads"
-        if not os.path.exists(UPLOAD_DIR):
-            os.makedirs(UPLOAD_DIR)
-        
-        file_extension = file.filename.split(".")[-1]
-        filename = f"log_{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        image_path = f"uploads/{filename}"
+        image_path = (await save_upload(file)).url_path
+        background_tasks.add_task(image_variants.generate_all, image_path)
 
     new_log = PlantLog(
         plant_id=plant_id,
@@ -170,9 +218,12 @@ def delete_plant(plant_id: int, db: Session = Depends(database.get_db), current_
     
     # Manual logs cascade if needed, but we set cascade in model.
     # We rely on SQLAlchemy cascades for clean cleanup now
+    image_paths = plant_image_paths(plant)
     db.delete(plant)
         
     db.commit()
+    # Images are shared by content; only drop the ones nothing else uses
+    blob_store.release(db, image_paths)
     return {"message": "Plant deleted successfully"}
 
 @router.post("/{plant_id}/water")
@@ -182,20 +233,25 @@ def water_plant(plant_id: int, db: Session = Depends(database.get_db), current_u
     plant = db.query(Plant).options(joinedload(Plant.plant_state)).filter(Plant.id == plant_id, Plant.user_id == current_user.id).first()
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    require_twin(plant)
         
     if plant.plant_state:
         current_stress = plant.plant_state.water_stress
         message = "Plant watered."
         
         # Smart Logic: Check for Overwatering via Twin Engine
-        # Fetch weather context (Mocked for now)
-        from app.services.weather_service import WeatherService
-        precip_prob = 0.0 # WeatherService.get_precip() - To be implemented
+        # Rain chance for this hour comes from the cached cell forecast (no extra network call when warm)
+        from app.services.weather_service import weather_service
+        precip_prob = 0.0
+        if current_user.latitude is not None and current_user.longitude is not None:
+            forecast = weather_service.get_forecast(current_user.latitude, current_user.longitude)
+            chance = forecast.precipitation_probability_at() if forecast else None
+            if chance is not None:
+                precip_prob = chance / 100.0
         
-        if not TwinEngine.should_water(plant.plant_state, precip_prob):
-             # Auto-Pilot Interception (Not used in direct button click usually, but good for background tasks)
-             # For direct user action, we proceed but might warn.
-             pass
+        rain_expected = not TwinEngine.should_water(plant.plant_state, precip_prob)
+        # Auto-Pilot Interception (Not used in direct button click usually, but good for background tasks)
+        # For direct user action, we proceed but warn.
 
         if plant.plant_state.water_stress < 0.2: # Less than 20% stress
             # Overwatering Analysis
@@ -216,6 +272,11 @@ def water_plant(plant_id: int, db: Session = Depends(database.get_db), current_u
             gain = plant.plant_state.health_score - 0 # rough delta check needed? 
             message = "Plant watered. Absorption in progress..."
 
+        if rain_expected:
+            message += f" Heads up: {round(precip_prob * 100)}% chance of rain this hour."
+
+        mark_activity(db, current_user.id)
+
         db.add(plant.plant_state)
         db.commit()
         db.refresh(plant.plant_state)
@@ -239,6 +300,7 @@ def update_environment(
     plant = db.query(Plant).options(joinedload(Plant.plant_state)).filter(Plant.id == plant_id, Plant.user_id == current_user.id).first()
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    require_twin(plant)
         
     if plant.plant_state:
         plant.plant_state = TwinEngine.update_from_environment(plant.plant_state, env_data.temperature)
@@ -261,6 +323,7 @@ def update_stage(
     plant = db.query(Plant).options(joinedload(Plant.plant_state)).filter(Plant.id == plant_id, Plant.user_id == current_user.id).first()
     if not plant:
         raise HTTPException(status_code=404, detail="Plant not found")
+    require_twin(plant)
         
     if plant.plant_state:
         plant.plant_state.growth_stage = stage
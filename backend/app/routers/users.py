@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional, Dict
+from pydantic import BaseModel, Field
+from typing import Optional
 
 from app import database
 from app.models.user import User
-from app.models.plant import Plant
 from app.dependencies import get_current_user
-from app.schemas.user_schema import UserOut
+from app.schemas.user_schema import UserProfile
+from app.services.garden_summary import garden_summary_service
+from app.services.principal_cache import principal_cache
 
 router = APIRouter(
     prefix="/users",
@@ -15,75 +16,24 @@ router = APIRouter(
 )
 
 class LocationUpdate(BaseModel):
-    latitude: float
-    longitude: float
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
 
-class GardenStats(BaseModel):
-    total_plants: int
-    flowering: int
-    vegetables: int
-    herbs: int
-    streak_days: int # Mocked for now, or calculated from logs
-    garden_status: str # Good/Average/Bad based on avg health
-
-class UserProfile(UserOut):
-    garden_stats: GardenStats
+def build_profile(db: Session, user: User) -> UserProfile:
+    return UserProfile(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        garden_type=user.garden_type,
+        garden_stats=garden_summary_service.get_stats(db, user.id)
+    )
 
 @router.get("/me", response_model=UserProfile)
 def get_current_user_profile(
     db: Session = Depends(database.get_db),
     current_user: User = Depends(get_current_user)
 ):
-    plants = db.query(Plant).filter(Plant.user_id == current_user.id).all()
-    
-    total = len(plants)
-    flowering = 0
-    vegetables = 0
-    herbs = 0
-    
-    total_health = 0.0
-    
-    for plant in plants:
-        # Simple categorization based on species name (mock logic)
-        species_lower = plant.species.lower()
-        if any(x in species_lower for x in ['rose', 'lily', 'flower', 'orchid', 'jasmine']):
-            flowering += 1
-        elif any(x in species_lower for x in ['tomato', 'pepper', 'spinach', 'carrot', 'potato']):
-            vegetables += 1
-        elif any(x in species_lower for x in ['basil', 'mint', 'thyme', 'oregano', 'tulsi']):
-            herbs += 1
-        else:
-            # Default fallback for unclassified
-            flowering += 1 
-
-        if plant.plant_state:
-            total_health += plant.plant_state.health_score
-            
-    avg_health = total_health / total if total > 0 else 100.0
-    
-    garden_status = "Good"
-    if avg_health < 50:
-        garden_status = "Needs Attention"
-    elif avg_health < 80:
-        garden_status = "Average"
-        
-    stats = GardenStats(
-        total_plants=total,
-        flowering=flowering,
-        vegetables=vegetables,
-        herbs=herbs,
-        streak_days=12, # Mocked for Hackathon
-        garden_status=garden_status
-    )
-    
-    # Create response by copying user data and adding stats
-    return UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        full_name=current_user.full_name,
-        garden_type=current_user.garden_type,
-        garden_stats=stats
-    )
+    return build_profile(db, current_user)
 
 @router.post("/location")
 def update_location(
@@ -95,6 +45,7 @@ def update_location(
         current_user.latitude = loc_data.latitude
         current_user.longitude = loc_data.longitude
         db.commit()
+        principal_cache.invalidate(current_user.email)
         return {"message": "Location updated successfully"}
     except Exception as e:
         print(f"Error updating location: {e}")
@@ -116,51 +67,6 @@ def update_user_profile(
     
     db.commit()
     db.refresh(current_user)
+    principal_cache.invalidate(current_user.email)
     
-    # Re-fetch stats logic (reused from get_current_user_profile)
-    # Ideally refactor this into a service, but for now duplicate for speed/safety
-    plants = db.query(Plant).filter(Plant.user_id == current_user.id).all()
-    total = len(plants)
-    flowering = 0
-    vegetables = 0
-    herbs = 0
-    total_health = 0.0
-    
-    for plant in plants:
-        species_lower = plant.species.lower()
-        if any(x in species_lower for x in ['rose', 'lily', 'flower', 'orchid', 'jasmine']):
-            flowering += 1
-        elif any(x in species_lower for x in ['tomato', 'pepper', 'spinach', 'carrot', 'potato']):
-            vegetables += 1
-        elif any(x in species_lower for x in ['basil', 'mint', 'thyme', 'oregano', 'tulsi']):
-            herbs += 1
-        else:
-            flowering += 1 
-
-        if plant.plant_state:
-            total_health += plant.plant_state.health_score
-            
-    avg_health = total_health / total if total > 0 else 100.0
-    
-    garden_status = "Good"
-    if avg_health < 50:
-        garden_status = "Needs Attention"
-    elif avg_health < 80:
-        garden_status = "Average"
-        
-    stats = GardenStats(
-        total_plants=total,
-        flowering=flowering,
-        vegetables=vegetables,
-        herbs=herbs,
-        streak_days=12,
-        garden_status=garden_status
-    )
-    
-    return UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        full_name=current_user.full_name,
-        garden_type=current_user.garden_type,
-        garden_stats=stats
-    )
+    return build_profile(db, current_user)
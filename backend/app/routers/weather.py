@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from app.services.weather_service import weather_service
 
 router = APIRouter(
@@ -7,8 +7,13 @@ router = APIRouter(
 )
 
 @router.get("/")
-async def get_weather(lat: float, lon: float):
-    data = weather_service.get_current_weather(lat, lon)
+async def get_weather(lat: float = Query(..., ge=-90, le=90), lon: float = Query(..., ge=-180, le=180)):
+    data = await weather_service.get_current_weather_async(lat, lon)
     if not data:
-        raise HTTPException(status_code=503, detail="Weather service unavailable")
+        retry_after = max(1, round(weather_service.breaker.retry_after()))
+        raise HTTPException(
+            status_code=503,
+            detail="Weather service unavailable",
+            headers={"Retry-After": str(retry_after)}
+        )
     return data
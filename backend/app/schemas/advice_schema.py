@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class PlantAdvice(BaseModel):
+    plant_id: int
+    name: str
+    species: str
+    profile_name: Optional[str] = None # Catalog profile the species resolved to
+    text: str
+    severity: str
+
+class GardenAdvice(BaseModel):
+    weather: dict
+    profiles_evaluated: int
+    plants: List[PlantAdvice]
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class JobRunOut(BaseModel):
+    id: int
+    job_name: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: float
+    users_scanned: int
+    cells_fetched: int
+    cache_hits: int
+    rows_inserted: int
+    rows_updated: int
+    errors: int
+    last_error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -13,11 +13,19 @@ class PlantCreate(PlantBase):
 from .plant_log_schema import PlantLogOut
 from .disease_record_schema import DiseaseRecordOut
 
-class PlantOut(PlantBase):
+class PlantSummaryOut(PlantBase):
     id: int
     user_id: int
+    category: Optional[str] = None
+    image_path: Optional[str] = None
+    onboarding_status: str = "ready"
     created_at: datetime
     plant_state: Optional[PlantStateOut] = None
+
+    class Config:
+        from_attributes = True
+
+class PlantOut(PlantSummaryOut):
     logs: List[PlantLogOut] = []
     disease_records: List[DiseaseRecordOut] = []
     
@@ -20,6 +20,17 @@ class UserOut(UserBase):
     class Config:
         from_attributes = True
 
+class GardenStats(BaseModel):
+    total_plants: int
+    flowering: int
+    vegetables: int
+    herbs: int
+    streak_days: int # Mocked for now, or calculated from logs
+    garden_status: str # Good/Average/Bad based on avg health
+
+class UserProfile(UserOut):
+    garden_stats: GardenStats
+
 class Token(BaseModel):
     access_token: str
     token_type: str
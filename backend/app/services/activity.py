@@ -0,0 +1,124 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.daily_activity import DailyActivity
+from app.models.disease_record import DiseaseRecord
+from app.models.garden_summary import GardenSummary
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+from app.utils.upsert import upsert
+
+SECONDS_PER_DAY = 86400
+PENDING_KEY = "garden_activity"
+
+def day_number(when: datetime = None) -> int:
+    """UTC day index (days since 1970-01-01) for a naive UTC datetime."""
+    when = when or datetime.utcnow()
+    return (when - datetime(1970, 1, 1)).days
+
+def current_streak(streak_days: int, streak_last_day, today: int = None) -> int:
+    """A streak survives until the end of the day after its last active day."""
+    today = day_number() if today is None else today
+    if streak_last_day is None or streak_last_day < today - 1:
+        return 0
+    return streak_days
+
+def mark_activity(session: Session, user_id: int, when: datetime = None):
+    """Count an action with no row of its own (e.g. watering) as activity at the next flush."""
+    session.info.setdefault(PENDING_KEY, []).append((user_id, day_number(when)))
+
+def _plant_owner_id(session, obj):
+    plant = obj.__dict__.get("plant")
+    if plant is not None:
+        return plant.user_id
+    if obj.plant_id is None:
+        return None
+    with session.no_autoflush:
+        return session.scalar(select(Plant.user_id).where(Plant.id == obj.plant_id))
+
+def collect_activity(session: Session) -> dict:
+    """{user_id: {day_number: events}} for activity pending in the session."""
+    activity = defaultdict(lambda: defaultdict(int))
+    for user_id, day in session.info.pop(PENDING_KEY, []):
+        activity[user_id][day] += 1
+    for obj in session.new:
+        if isinstance(obj, PlantLog):
+            when = obj.recorded_at
+        elif isinstance(obj, DiseaseRecord):
+            when = obj.timestamp
+        else:
+            continue
+        user_id = _plant_owner_id(session, obj)
+        if user_id is not None:
+            activity[user_id][day_number(when)] += 1
+    return activity
+
+def record_days(session: Session, user_id: int, days: dict):
+    """Upsert the rollup rows for one user."""
+    for day, events in days.items():
+        upsert(
+            session, DailyActivity,
+            dict(user_id=user_id, day_number=day, events=events),
+            [DailyActivity.user_id, DailyActivity.day_number],
+            dict(events=DailyActivity.events + events)
+        )
+
+def advance_streak(session: Session, user_id: int, day: int):
+    """
+    Extend the summary's streak with activity on `day` in one atomic UPDATE:
+    same day -> unchanged, next day -> +1, later -> restart at 1. Back-dated
+    activity is left to the reconcile job.
+    """
+    last = GardenSummary.streak_last_day
+    session.execute(
+        update(GardenSummary)
+        .where(GardenSummary.user_id == user_id)
+        .values(
+            streak_days=case(
+                (last == None, 1),
+                (last >= day, GardenSummary.streak_days),
+                (last == day - 1, GardenSummary.streak_days + 1),
+                else_=1
+            ),
+            streak_last_day=case((last >= day, last), else_=day)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+def latest_streaks(db: Session, user_ids) -> dict:
+    """
+    {user_id: (streak_days, streak_last_day)} from the rollup via gaps-and-islands:
+    consecutive days share day_number - row_number(), so grouping by that
+    difference yields each run; the run with the latest day is the streak.
+    """
+    numbered = select(
+        DailyActivity.user_id,
+        DailyActivity.day_number,
+        (
+            DailyActivity.day_number
+            - func.row_number().over(partition_by=DailyActivity.user_id, order_by=DailyActivity.day_number)
+        ).label("island")
+    ).where(DailyActivity.user_id.in_(user_ids)).subquery()
+
+    islands = select(
+        numbered.c.user_id,
+        func.max(numbered.c.day_number).label("last_day"),
+        func.count().label("length")
+    ).group_by(numbered.c.user_id, numbered.c.island).subquery()
+
+    ranked = select(
+        islands.c.user_id,
+        islands.c.last_day,
+        islands.c.length,
+        func.row_number().over(partition_by=islands.c.user_id, order_by=islands.c.last_day.desc()).label("rank")
+    ).subquery()
+
+    rows = db.execute(
+        select(ranked.c.user_id, ranked.c.length, ranked.c.last_day).where(ranked.c.rank == 1)
+    ).all()
+    streaks = {user_id: (0, None) for user_id in user_ids}
+    streaks.update({user_id: (length, last_day) for user_id, length, last_day in rows})
+    return streaks
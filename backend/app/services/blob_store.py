@@ -0,0 +1,143 @@
+import glob
+import hashlib
+import os
+import time
+
+from sqlalchemy import func, select, union, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.disease_record import DiseaseRecord
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+
+# Every column that may point at a blob; a blob lives while any row references it
+IMAGE_COLUMNS = (Plant.image_path, PlantLog.image_path, DiseaseRecord.image_path)
+
+BLOB_PREFIX = "blobs"
+DERIVED_PREFIX = "variants" # renditions of a blob (thumbnails etc.), same sharding
+
+class BlobStore:
+    """
+    Content-addressed image store under UPLOAD_DIR.
+
+    A blob with sha256 "abcd12..." lives at blobs/ab/cd/abcd12....<ext>, so
+    identical images are stored once and no directory grows past a few
+    hundred entries. There is no separate refcount: the image_path columns
+    are the references, and a blob is deleted once none of them points at it.
+    """
+
+    def __init__(self, root: str, grace_seconds: float = 0):
+        self.root = root
+        self.grace_seconds = grace_seconds
+
+    @staticmethod
+    def relative_path(sha256: str, ext: str) -> str:
+        return "/".join((BLOB_PREFIX, sha256[:2], sha256[2:4], f"{sha256}.{ext}"))
+
+    def path_for(self, url_path: str) -> str:
+        """On-disk path of an "uploads/..." image_path."""
+        return os.path.join(self.root, *url_path.split("/")[1:])
+
+    @staticmethod
+    def blob_key(url_path: str) -> str:
+        """The blob's sha256; legacy flat uploads are keyed by a hash of their path."""
+        if url_path.startswith(f"uploads/{BLOB_PREFIX}/"):
+            return os.path.splitext(url_path.rsplit("/", 1)[-1])[0]
+        return hashlib.sha256(url_path.encode()).hexdigest()
+
+    def derived_path(self, url_path: str, variant: str, ext: str) -> str:
+        """On-disk path of a rendition of the image; removed along with the blob."""
+        key = self.blob_key(url_path)
+        return os.path.join(self.root, DERIVED_PREFIX, variant, key[:2], key[2:4], f"{key}.{ext}")
+
+    @staticmethod
+    def content_etag(relative_path: str):
+        """
+        Strong ETag for a path under UPLOAD_DIR whose name pins its bytes, else
+        None. A blob's tag is its sha256 (the same value strong_etag() gives for
+        its bytes); a rendition's is derived from its source blob and variant,
+        since renditions are rendered once and never rewritten.
+        """
+        parts = relative_path.split("/")
+        if parts[0] == BLOB_PREFIX and len(parts) == 4:
+            return '"' + os.path.splitext(parts[-1])[0][:32] + '"'
+        if parts[0] == DERIVED_PREFIX and len(parts) == 5:
+            key = os.path.splitext(parts[-1])[0]
+            return '"' + hashlib.sha256(f"{parts[1]}:{key}".encode()).hexdigest()[:32] + '"'
+        return None
+
+    def put(self, tmp_path: str, sha256: str, ext: str) -> str:
+        """
+        Move a finished temp file into the store (or drop it if the blob
+        already exists) and return the "uploads/blobs/..." image_path.
+        """
+        relative = self.relative_path(sha256, ext)
+        path = os.path.join(self.root, *relative.split("/"))
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            # Refresh mtime so a concurrent release() treats the blob as in use
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return f"uploads/{relative}"
+
+    def reference_count(self, db: Session, url_path: str) -> int:
+        counts = union_all(*(
+            select(func.count()).select_from(column.class_).where(column == url_path)
+            for column in IMAGE_COLUMNS
+        )).subquery()
+        return db.execute(select(func.sum(counts.c[0]))).scalar() or 0
+
+    def release(self, db: Session, url_paths) -> int:
+        """
+        Delete the blobs among url_paths that no row references any more.
+        Call after committing the deletes. Returns the number of files removed.
+        """
+        removed = 0
+        for url_path in set(filter(None, url_paths)):
+            if not url_path.startswith(f"uploads/{BLOB_PREFIX}/"):
+                continue # legacy flat files are left to migrate_blobs.py
+            if self.reference_count(db, url_path):
+                continue
+            path = self.path_for(url_path)
+            try:
+                if time.time() - os.path.getmtime(path) < self.grace_seconds:
+                    continue # just (re)uploaded; its row may not be committed yet
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            key = self.blob_key(url_path)
+            for derived in glob.glob(os.path.join(self.root, DERIVED_PREFIX, "*", key[:2], key[2:4], f"{key}.*")):
+                os.remove(derived)
+        return removed
+
+    def sweep(self, db: Session) -> int:
+        """
+        Delete every blob that no row references and that is older than the
+        grace period: blobs a release() had to skip because they were fresh,
+        and uploads whose row was never committed. Returns the files removed.
+        """
+        referenced = set(db.scalars(union(*(
+            select(column).where(column.like(f"uploads/{BLOB_PREFIX}/%"))
+            for column in IMAGE_COLUMNS
+        ))))
+        cutoff = time.time() - self.grace_seconds
+        orphans = []
+        for path in glob.glob(os.path.join(self.root, BLOB_PREFIX, "*", "*", "*")):
+            url_path = "uploads/" + os.path.relpath(path, self.root).replace(os.sep, "/")
+            try:
+                if url_path not in referenced and os.path.getmtime(path) < cutoff:
+                    orphans.append(url_path)
+            except FileNotFoundError:
+                pass
+        # release() re-checks each candidate, so a row committed meanwhile keeps its blob
+        return self.release(db, orphans)
+
+def plant_image_paths(plant: Plant) -> list:
+    """image_paths of a plant and everything that is deleted with it."""
+    return [plant.image_path] + [log.image_path for log in plant.logs] + [record.image_path for record in plant.disease_records]
+
+blob_store = BlobStore(settings.UPLOAD_DIR, grace_seconds=settings.BLOB_RELEASE_GRACE_SECONDS)
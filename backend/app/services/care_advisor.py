@@ -1,57 +1,23 @@
+import math
+from functools import lru_cache
+
+from app.config import settings
+from app.services.species_resolver import species_resolver
+
+def _is_raining(condition: str) -> bool:
+    condition = condition.lower()
+    return "rain" in condition or "drizzle" in condition or "shower" in condition
+
+def _ceil_to(value: float, step: int) -> float:
+    return float(step * math.ceil(value / step))
 
 class CareAdvisor:
-    # Knowledge Base: 60+ Common Plants
+    # Knowledge Base lives in app/data/plant_profiles.json
     # Water Need: 1 (Low/Drought Tol.), 2 (Medium), 3 (High/Thirsty)
     # Heat Tol: 1 (Low/Sensitive), 2 (Medium), 3 (High/Heat Loving)
-    PROFILES = {
-        # --- Common ML Species ---
-        "Tomato": {"water": 3, "heat": 2, "desc": "Thirsty crop, consistent moisture is key."},
-        "Potato": {"water": 2, "heat": 1, "desc": "Keep soil cool, tubers stop growing >30°C."},
-        "Pepper, Bell": {"water": 2, "heat": 3, "desc": "Loves heat, but keep soil moist."},
-        "Corn (Maize)": {"water": 3, "heat": 3, "desc": "High water user during silking."},
-        "Apple": {"water": 2, "heat": 2, "desc": "Deep watering needed for fruit set."},
-        "Cherry": {"water": 2, "heat": 1, "desc": "Sensitive to cracking in rain."},
-        "Grape": {"water": 1, "heat": 3, "desc": "Deep roots, drought tolerant once established."},
-        "Peach": {"water": 2, "heat": 3, "desc": "Needs water for fruit expansion."},
-        "Strawberry": {"water": 3, "heat": 1, "desc": "Shallow roots, dries out fast."},
-        "Squash": {"water": 3, "heat": 2, "desc": "Big leaves lose water fast."},
-        "Blueberry": {"water": 3, "heat": 1, "desc": "Acidic soil, shallow roots, needs steady water."},
-        "Raspberry": {"water": 2, "heat": 1, "desc": "Mulch heavily to keep roots cool."},
-        "Soybean": {"water": 2, "heat": 3, "desc": "Moderate drought tolerance."},
-        "Orange": {"water": 2, "heat": 3, "desc": "Deep watering, allow to dry slightly."},
-
-        # --- Common Houseplants ---
-        "Snake Plant": {"water": 1, "heat": 3, "desc": "Thrives on neglect. Let dry completely."},
-        "Aloe Vera": {"water": 1, "heat": 3, "desc": "Succulent. Rot prone if overwatered."},
-        "Peace Lily": {"water": 3, "heat": 1, "desc": "Wilts dramatically when thirsty."},
-        "Spider Plant": {"water": 2, "heat": 2, "desc": "Classic, easy care."},
-        "Monstera": {"water": 2, "heat": 2, "desc": "Let top inch dry out."},
-        "Pothos": {"water": 2, "heat": 2, "desc": "Forgiving, moderate water."},
-        "Fiddle Leaf Fig": {"water": 2, "heat": 3, "desc": "Consistent watering, hates drafts."},
-        "ZZ Plant": {"water": 1, "heat": 3, "desc": "Store water in rhizomes. Drought king."},
-        "Succulent": {"water": 1, "heat": 3, "desc": "Soak and dry method."},
-        "Cactus": {"water": 1, "heat": 3, "desc": "Desert native. Minimal water."},
-        "Fern": {"water": 3, "heat": 1, "desc": "Loves humidity, keep soil moist."},
-        "Orchid": {"water": 2, "heat": 2, "desc": "Soak roots, mist often."},
-        "Bamboo": {"water": 3, "heat": 2, "desc": "Keep water fresh."},
-
-        # --- Garden Flowers ---
-        "Rose": {"water": 3, "heat": 2, "desc": "Thirsty, avoid wetting leaves (Black Spot)."},
-        "Tulip": {"water": 2, "heat": 1, "desc": "Spring bulb, goes dormant in summer."},
-        "Lavender": {"water": 1, "heat": 3, "desc": "Mediterranean native, hates wet feet."},
-        "Sunflower": {"water": 2, "heat": 3, "desc": "Drought tolerant once established."},
-        "Marigold": {"water": 2, "heat": 3, "desc": "Hardy and heat loving."},
-        "Hydrangea": {"water": 3, "heat": 1, "desc": "Wilts in hot sun. Needs shade + water."},
-        
-        # --- Herbs ---
-        "Basil": {"water": 3, "heat": 3, "desc": "Loves sun and water. Wilts fast."},
-        "Mint": {"water": 3, "heat": 2, "desc": "Invasive roots, thirsty."},
-        "Cilantro": {"water": 2, "heat": 1, "desc": "Bolts (flowers) instantly in heat."},
-        "Rosemary": {"water": 1, "heat": 3, "desc": "Woody shrub, drought tolerant."},
-        "Thyme": {"water": 1, "heat": 3, "desc": "Ground cover, low water."},
-    }
+    PROFILES = species_resolver.profiles
 
-    DEFAULT_PROFILE = {"water": 2, "heat": 2, "desc": "General plant care."}
+    DEFAULT_PROFILE = species_resolver.default_profile
 
     @staticmethod
     def get_advice(species: str, temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0) -> dict:
@@ -59,21 +25,70 @@ class CareAdvisor:
         Generate smart context-aware advice.
         """
         # 1. Normalize Species Name
-        profile = CareAdvisor.DEFAULT_PROFILE
-        species_name = "Unknown Species"
-        
-        # Direct lookup
-        if species in CareAdvisor.PROFILES:
-            profile = CareAdvisor.PROFILES[species]
-            species_name = species
+        species_name, profile = species_resolver.resolve(species)
+        return CareAdvisor.evaluate(species_name or "Unknown Species", profile, temperature, condition, humidity, wind_speed)
+
+    @staticmethod
+    def quantize(temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0) -> tuple:
+        """
+        Snap inputs to the buckets the rules below distinguish, so every input
+        in a bucket yields the same advice. Numbers that show up in the advice
+        text (wind, dry-air humidity) are rounded to steps of 5 in a direction
+        that can't cross a threshold; the rest collapse to one value.
+        """
+        if temperature > 30.0:
+            temperature = 35.0
+        elif temperature < 10.0:
+            temperature = 5.0
         else:
-            # Fuzzy lookup
-            for key in CareAdvisor.PROFILES:
-                if key.lower() in species.lower():
-                    profile = CareAdvisor.PROFILES[key]
-                    species_name = key
-                    break
-        
+            temperature = 20.0
+
+        condition = "Rain" if _is_raining(condition) else "Clear"
+        # Only shown below 40 %; flooring keeps it below
+        humidity = float(5 * math.floor(humidity / 5)) if humidity < 40.0 else 50.0
+        # Only shown above 25 km/h; ceiling keeps it in the same band (25-50, >50)
+        wind_speed = _ceil_to(wind_speed, 5) if wind_speed > 25.0 else 0.0
+        return temperature, condition, humidity, wind_speed
+
+    @staticmethod
+    def get_quantized_advice(species: str, temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0) -> dict:
+        """
+        get_advice over quantized inputs, memoized per (profile, buckets).
+        """
+        species_name, _profile = species_resolver.resolve(species)
+        return CareAdvisor._cached_advice(species_name, *CareAdvisor.quantize(temperature, condition, humidity, wind_speed))
+
+    @staticmethod
+    @lru_cache(maxsize=settings.ADVICE_CACHE_SIZE)
+    def _cached_advice(species_name, temperature, condition, humidity, wind_speed) -> dict:
+        profile = CareAdvisor.PROFILES[species_name] if species_name else CareAdvisor.DEFAULT_PROFILE
+        return CareAdvisor.evaluate(species_name or "Unknown Species", profile, temperature, condition, humidity, wind_speed)
+
+    @staticmethod
+    def get_garden_advice(species_list, temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0) -> dict:
+        """
+        Advice for many species under the same weather, keyed by the input
+        species string. Rules run once per resolved profile, since plants
+        sharing a profile get identical advice.
+        """
+        by_profile = {}
+        advice = {}
+        for species in species_list:
+            if species in advice:
+                continue
+            species_name, profile = species_resolver.resolve(species)
+            if species_name not in by_profile:
+                by_profile[species_name] = CareAdvisor.evaluate(
+                    species_name or "Unknown Species", profile, temperature, condition, humidity, wind_speed
+                )
+            advice[species] = {**by_profile[species_name], "profile_name": species_name}
+        return advice
+
+    @staticmethod
+    def evaluate(species_name: str, profile: dict, temperature: float, condition: str = "Clear", humidity: float = 50.0, wind_speed: float = 0.0) -> dict:
+        """
+        Run the rules for an already-resolved profile.
+        """
         advice_text = ""
         severity = "info" # info, warning, critical, success
 
@@ -84,7 +99,7 @@ class CareAdvisor:
         is_humid = humidity > 80.0
         is_windy = wind_speed > 25.0
         is_stormy = wind_speed > 50.0
-        is_raining = "rain" in condition.lower() or "drizzle" in condition.lower() or "shower" in condition.lower()
+        is_raining = _is_raining(condition)
 
         # PRIORITY 1: DANGEROUS WIND/STORM
         if is_stormy:
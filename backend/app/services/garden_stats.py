@@ -0,0 +1,6 @@
+def garden_status(avg_health: float) -> str:
+    if avg_health < 50:
+        return "Needs Attention"
+    if avg_health < 80:
+        return "Average"
+    return "Good"
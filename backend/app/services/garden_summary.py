@@ -0,0 +1,248 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.orm import Session, attributes
+
+from app.models.garden_summary import GardenSummary
+from app.models.plant import Plant
+from app.models.plant_state import PlantState
+from app.schemas.user_schema import GardenStats
+from app.services import activity
+from app.services.garden_stats import garden_status
+from app.utils.upsert import upsert
+
+COUNTERS = ("total_plants", "flowering", "vegetables", "herbs", "health_sum", "needs_attention")
+NEEDS_ATTENTION_BELOW = 50.0
+DEFAULT_HEALTH = 100.0 # PlantState.health_score column default
+
+def category_counter(category) -> str:
+    # Anything not vegetables/herbs (incl. uncategorized) counts as flowering
+    return category if category in ("vegetables", "herbs") else "flowering"
+
+def _health_delta(old, new) -> dict:
+    old_attention = old is not None and old < NEEDS_ATTENTION_BELOW
+    new_attention = new is not None and new < NEEDS_ATTENTION_BELOW
+    return {
+        "health_sum": (new or 0.0) - (old or 0.0),
+        "needs_attention": int(new_attention) - int(old_attention)
+    }
+
+def _old_value(obj, key):
+    history = attributes.get_history(obj, key)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, key)
+
+def _owner_id(session, state: PlantState):
+    plant = state.__dict__.get("plant")
+    if plant is not None:
+        return plant.user_id
+    if state.plant_id is None:
+        return None
+    with session.no_autoflush:
+        return session.scalar(select(Plant.user_id).where(Plant.id == state.plant_id))
+
+class GardenSummaryService:
+    """
+    Keeps garden_summaries in step with plant writes.
+
+    A before_flush hook turns pending Plant inserts/deletes and PlantState
+    health changes into counter deltas, and PlantLog/DiseaseRecord inserts
+    (plus mark_activity calls) into daily activity, and applies them in the
+    same transaction with atomic `col = col + delta` UPDATEs. Writes that bypass
+    the ORM unit of work (bulk UPDATE/DELETE) are repaired by reconcile().
+    """
+
+    @staticmethod
+    def get_stats(db: Session, user_id: int) -> GardenStats:
+        """Garden stats from the summary row (a primary-key lookup), built on first use."""
+        summary = db.get(GardenSummary, user_id)
+        if summary is None:
+            GardenSummaryService.reconcile(db, [user_id])
+            db.commit()
+            summary = db.get(GardenSummary, user_id)
+        return GardenSummaryService.to_stats(summary)
+
+    @staticmethod
+    def to_stats(summary: GardenSummary) -> GardenStats:
+        avg_health = summary.health_sum / summary.total_plants if summary.total_plants > 0 else 100.0
+        return GardenStats(
+            total_plants=summary.total_plants,
+            flowering=summary.flowering,
+            vegetables=summary.vegetables,
+            herbs=summary.herbs,
+            streak_days=activity.current_streak(summary.streak_days, summary.streak_last_day),
+            garden_status=garden_status(avg_health)
+        )
+
+    @staticmethod
+    def collect_deltas(session: Session) -> dict:
+        """Counter deltas per user_id for everything pending in the session."""
+        deltas = defaultdict(lambda: defaultdict(float))
+
+        def add(user_id, changes):
+            if user_id is not None:
+                for key, value in changes.items():
+                    deltas[user_id][key] += value
+
+        for obj in session.new:
+            if isinstance(obj, Plant):
+                add(obj.user_id, {"total_plants": 1, category_counter(obj.category): 1})
+            elif isinstance(obj, PlantState):
+                health = DEFAULT_HEALTH if obj.health_score is None else obj.health_score
+                add(_owner_id(session, obj), _health_delta(None, health))
+
+        for obj in session.deleted:
+            if isinstance(obj, Plant):
+                add(_old_value(obj, "user_id"), {"total_plants": -1, category_counter(_old_value(obj, "category")): -1})
+            elif isinstance(obj, PlantState):
+                add(_owner_id(session, obj), _health_delta(_old_value(obj, "health_score"), None))
+
+        for obj in session.dirty:
+            if isinstance(obj, PlantState):
+                history = attributes.get_history(obj, "health_score")
+                if history.added and history.deleted:
+                    add(_owner_id(session, obj), _health_delta(history.deleted[0], history.added[0]))
+            elif isinstance(obj, Plant):
+                history = attributes.get_history(obj, "category")
+                if history.added and history.deleted:
+                    old, new = category_counter(history.deleted[0]), category_counter(history.added[0])
+                    if old != new:
+                        add(obj.user_id, {old: -1, new: 1})
+
+        return deltas
+
+    @staticmethod
+    def apply_deltas(session: Session, deltas: dict, active_days: dict = None, now: datetime = None):
+        """Apply counter deltas and {user_id: {day_number: events}} activity."""
+        now = now or datetime.utcnow()
+        active_days = active_days or {}
+        for user_id in set(deltas) | set(active_days):
+            changes = deltas.get(user_id, {})
+            days = active_days.get(user_id, {})
+            if days:
+                activity.record_days(session, user_id, days)
+
+            values = {
+                key: getattr(GardenSummary, key) + value
+                for key, value in changes.items() if value and key in COUNTERS
+            }
+            result = session.execute(
+                update(GardenSummary)
+                .where(GardenSummary.user_id == user_id)
+                .values(**values, last_activity_at=now, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                # First write for this user: start from what is already committed.
+                # A concurrent first write may insert the row in the meantime;
+                # then ours lands on top of it as a plain delta.
+                with session.no_autoflush:
+                    summary = GardenSummaryService.expected(session, [user_id])[user_id]
+                for key, value in changes.items():
+                    summary[key] += value
+                upsert(
+                    session, GardenSummary,
+                    dict(user_id=user_id, last_activity_at=now, updated_at=now, **summary),
+                    [GardenSummary.user_id],
+                    dict(values, last_activity_at=now, updated_at=now)
+                )
+            # Same-day or back-dated activity leaves the streak unchanged, so this
+            # is a no-op for a row that was just inserted with the current streak
+            for day in sorted(days):
+                activity.advance_streak(session, user_id, day)
+
+    @staticmethod
+    def aggregate(db: Session, user_ids) -> dict:
+        """Summary counters recomputed from plants/plant_states for the given users."""
+        is_veg = Plant.category == "vegetables"
+        is_herb = Plant.category == "herbs"
+        rows = db.execute(
+            select(
+                Plant.user_id,
+                func.count(Plant.id),
+                func.sum(case((is_veg, 1), else_=0)),
+                func.sum(case((is_herb, 1), else_=0)),
+                func.coalesce(func.sum(PlantState.health_score), 0.0),
+                func.sum(case((PlantState.health_score < NEEDS_ATTENTION_BELOW, 1), else_=0))
+            )
+            .outerjoin(PlantState, PlantState.plant_id == Plant.id)
+            .where(Plant.user_id.in_(user_ids))
+            .group_by(Plant.user_id)
+        ).all()
+
+        result = {user_id: dict.fromkeys(COUNTERS, 0) for user_id in user_ids}
+        for user_id, total, vegetables, herbs, health_sum, needs_attention in rows:
+            result[user_id] = {
+                "total_plants": total,
+                "flowering": total - vegetables - herbs,
+                "vegetables": vegetables,
+                "herbs": herbs,
+                "health_sum": float(health_sum),
+                "needs_attention": needs_attention
+            }
+        return result
+
+    @staticmethod
+    def expected(db: Session, user_ids) -> dict:
+        """aggregate() plus the streak recomputed from the daily_activity rollup."""
+        result = GardenSummaryService.aggregate(db, user_ids)
+        for user_id, (streak_days, streak_last_day) in activity.latest_streaks(db, user_ids).items():
+            result[user_id]["streak_days"] = streak_days
+            result[user_id]["streak_last_day"] = streak_last_day
+        return result
+
+    @staticmethod
+    def reconcile(db: Session, user_ids) -> tuple:
+        """
+        Rewrite summaries for user_ids that drifted from the source tables.
+        Returns (rows_inserted, rows_updated). Caller commits.
+        """
+        expected = GardenSummaryService.expected(db, user_ids)
+        existing = {
+            summary.user_id: summary
+            for summary in db.scalars(select(GardenSummary).where(GardenSummary.user_id.in_(user_ids)))
+        }
+        now = datetime.utcnow()
+        inserted = updated = 0
+        with db.no_autoflush:
+            for user_id, counters in expected.items():
+                summary = existing.get(user_id)
+                if summary is None:
+                    # A concurrent request (or the reconcile job) may create the
+                    # row first; that row is kept up to date already, so leave it
+                    result = upsert(
+                        db, GardenSummary, dict(user_id=user_id, updated_at=now, **counters),
+                        [GardenSummary.user_id]
+                    )
+                    inserted += result.rowcount
+                    continue
+                drifted = any(
+                    getattr(summary, key) != value if value is None or getattr(summary, key) is None
+                    else abs(getattr(summary, key) - value) > 1e-6
+                    for key, value in counters.items()
+                )
+                if drifted:
+                    for key, value in counters.items():
+                        setattr(summary, key, value)
+                    summary.updated_at = now
+                    updated += 1
+        return inserted, updated
+
+garden_summary_service = GardenSummaryService()
+
+@event.listens_for(Session, "before_flush")
+def _maintain_garden_summaries(session, flush_context, instances):
+    deltas = GardenSummaryService.collect_deltas(session)
+    active_days = activity.collect_activity(session)
+    if deltas or active_days:
+        GardenSummaryService.apply_deltas(session, deltas, active_days)
+
+@event.listens_for(PlantState.health_score, "set", active_history=True)
+def _load_previous_health(target, value, oldvalue, initiator):
+    # No-op; registering with active_history makes SQLAlchemy load the old
+    # score on assignment, so the flush-time delta is exact even for expired rows.
+    pass
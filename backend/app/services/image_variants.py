@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+
+from app.config import settings
+from app.services.blob_store import blob_store
+
+class ImageVariantService:
+    """
+    Downscaled WebP renditions of uploaded images for list and grid views.
+
+    Each variant is a bounding box (the image is shrunk to fit, never
+    enlarged). Renditions live on disk next to the blobs, keyed by the
+    source blob, so they are produced once: eagerly after an upload and
+    lazily on first request for anything older.
+    """
+
+    EXT = "webp"
+
+    def __init__(self, sizes: dict, quality: int):
+        self.sizes = sizes
+        self.quality = quality
+
+    def path_for(self, url_path: str, variant: str) -> str:
+        return blob_store.derived_path(url_path, variant, self.EXT)
+
+    def etag(self, url_path: str, variant: str) -> str:
+        relative = os.path.relpath(self.path_for(url_path, variant), blob_store.root)
+        return blob_store.content_etag(relative.replace(os.sep, "/"))
+
+    def ensure(self, url_path: str, variant: str) -> str:
+        """On-disk path of the variant, rendering it first if it does not exist yet."""
+        path = self.path_for(url_path, variant)
+        if not os.path.exists(path):
+            self._render(blob_store.path_for(url_path), path, self.sizes[variant])
+        return path
+
+    def generate_all(self, url_path: str):
+        """Render every variant of a freshly stored image (run as a background task)."""
+        for variant in self.sizes:
+            try:
+                self.ensure(url_path, variant)
+            except Exception as e:
+                print(f"Image variant {variant} failed for {url_path}: {e}")
+
+    def _render(self, source: str, path: str, size: int):
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image) # phone photos carry rotation in EXIF
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Concurrent renders each write their own temp file; the rename is atomic
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    image.save(out, format="WEBP", quality=self.quality, method=4)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+image_variants = ImageVariantService(
+    sizes={"thumb": settings.IMAGE_THUMB_SIZE, "medium": settings.IMAGE_MEDIUM_SIZE},
+    quality=settings.IMAGE_WEBP_QUALITY
+)
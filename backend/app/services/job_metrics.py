@@ -0,0 +1,90 @@
+import time
+from datetime import datetime
+from sqlalchemy import delete, select
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job_run import JobRun
+
+class JobRunRecorder:
+    """
+    Collects counters for one run of a background job and stores them as a
+    JobRun row on exit. History is trimmed to JOB_RUN_HISTORY_LIMIT per job.
+
+    Usage:
+        with JobRunRecorder("check_heat_emergencies") as run:
+            run.users_scanned += len(users)
+    """
+
+    def __init__(self, job_name: str, session_factory=None):
+        self.job_name = job_name
+        self.session_factory = session_factory or SessionLocal
+        self.started_at = None
+        self.finished_at = None
+        self.duration_ms = 0.0
+        self.users_scanned = 0
+        self.cells_fetched = 0
+        self.cache_hits = 0
+        self.rows_inserted = 0
+        self.rows_updated = 0
+        self.errors = 0
+        self.last_error = None
+        self._t0 = None
+
+    def __enter__(self):
+        self.started_at = datetime.utcnow()
+        self._t0 = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.record_error(exc)
+        self.finished_at = datetime.utcnow()
+        self.duration_ms = (time.monotonic() - self._t0) * 1000.0
+        print(
+            f"[{self.finished_at}] {self.job_name} finished in {self.duration_ms / 1000.0:.2f}s "
+            f"(users={self.users_scanned}, fetches={self.cells_fetched}, cache_hits={self.cache_hits}, "
+            f"inserted={self.rows_inserted}, updated={self.rows_updated}, errors={self.errors})"
+        )
+        self.save()
+        return False
+
+    def record_error(self, exc):
+        self.errors += 1
+        self.last_error = str(exc)[:500]
+
+    def save(self):
+        db = self.session_factory()
+        try:
+            db.add(JobRun(
+                job_name=self.job_name,
+                started_at=self.started_at,
+                finished_at=self.finished_at,
+                duration_ms=self.duration_ms,
+                users_scanned=self.users_scanned,
+                cells_fetched=self.cells_fetched,
+                cache_hits=self.cache_hits,
+                rows_inserted=self.rows_inserted,
+                rows_updated=self.rows_updated,
+                errors=self.errors,
+                last_error=self.last_error
+            ))
+            db.flush()
+
+            # Keep a bounded history per job
+            keep = (
+                select(JobRun.id)
+                .where(JobRun.job_name == self.job_name)
+                .order_by(JobRun.id.desc())
+                .limit(settings.JOB_RUN_HISTORY_LIMIT)
+            )
+            db.execute(
+                delete(JobRun)
+                .where(JobRun.job_name == self.job_name, JobRun.id.not_in(keep))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to record job run for {self.job_name}: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+import threading
+from filelock import FileLock, Timeout
+from sqlalchemy import text
+from app.database import engine
+
+class LeaderElection:
+    """
+    Cross-process leader lock so background jobs run on exactly one worker.
+
+    Postgres: a session-level advisory lock held on a dedicated connection.
+    SQLite: an OS file lock next to the database file.
+    Both are released by the server / OS when the holding process dies, so a
+    follower picks up leadership on its next attempt.
+    """
+
+    def __init__(self, name: str, bind=engine):
+        self.name = name
+        self.engine = bind
+        self._mutex = threading.Lock()
+        self._conn = None
+        self._file_lock = None
+
+    @property
+    def lock_key(self) -> int:
+        # Stable signed 64-bit key for pg_try_advisory_lock
+        digest = hashlib.sha1(self.name.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+    @property
+    def lock_path(self) -> str:
+        database = self.engine.url.database
+        if database and database != ":memory:":
+            return f"{os.path.abspath(database)}.{self.name}.lock"
+        return os.path.join(tempfile.gettempdir(), f"{self.name}.lock")
+
+    def is_leader(self) -> bool:
+        """
+        Return True if this process holds leadership, trying to acquire it if not.
+        Never blocks waiting for another holder.
+        """
+        with self._mutex:
+            if self.engine.dialect.name == "postgresql":
+                return self._check_advisory_lock()
+            return self._check_file_lock()
+
+    def release(self):
+        with self._mutex:
+            if self._conn is not None:
+                try:
+                    self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+                    self._conn.commit()
+                except Exception as e:
+                    print(f"Leader lock release failed: {e}")
+                finally:
+                    self._conn.close()
+                    self._conn = None
+            if self._file_lock is not None and self._file_lock.is_locked:
+                self._file_lock.release()
+
+    def _check_advisory_lock(self) -> bool:
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except Exception as e:
+                # Connection is gone, and the server dropped our lock with it
+                print(f"Leader connection lost, re-electing: {e}")
+                self._conn.invalidate()
+                self._conn.close()
+                self._conn = None
+
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+
+        if acquired:
+            self._conn = conn
+            return True
+        conn.close()
+        return False
+
+    def _check_file_lock(self) -> bool:
+        if self._file_lock is None:
+            # Jobs run on APScheduler pool threads, so the lock must not be thread-local
+            self._file_lock = FileLock(self.lock_path, thread_local=False)
+        if self._file_lock.is_locked:
+            return True
+        try:
+            self._file_lock.acquire(timeout=0)
+            return True
+        except Timeout:
+            return False
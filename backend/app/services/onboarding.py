@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.disease_record import DiseaseRecord
+from app.models.onboarding_job import OnboardingJob
+from app.models.plant import Plant
+from app.models.plant_state import PlantState
+from app.services.blob_store import blob_store
+from app.services.twin_engine import TwinEngine
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+def predict_leaf(image_path: str) -> dict:
+    # Imported on first use so the API can start (and tests run) without the model stack
+    from app.ml.inference import inference_service
+    return inference_service.predict(image_path)
+
+def find_job(db: Session, user_id: int, idempotency_key: str):
+    return db.query(OnboardingJob).filter(
+        OnboardingJob.user_id == user_id,
+        OnboardingJob.idempotency_key == idempotency_key
+    ).first()
+
+class OnboardingQueue:
+    """
+    Runs first-leaf inference for plants created in the pending state
+    (with a default PlantState, which the job then scores).
+
+    Jobs are rows in onboarding_jobs; this is only the in-process executor
+    that works through them. A worker claims a job by flipping it from
+    queued to running in a single UPDATE, so a job submitted twice (or
+    recovered by two processes) runs once. Jobs left behind by a restart
+    are picked up again by recover().
+    """
+
+    def __init__(self, max_workers: int, session_factory=SessionLocal, predict=predict_leaf):
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self.predict = predict
+        self._executor = None
+
+    def submit(self, job_id: int):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="onboarding")
+        return self._executor.submit(self.run, job_id)
+
+    def recover(self) -> int:
+        """Re-queue unfinished jobs (e.g. after a restart). Returns how many were submitted."""
+        db = self.session_factory()
+        try:
+            stale = datetime.utcnow() - timedelta(seconds=settings.ONBOARDING_STALE_SECONDS)
+            db.query(OnboardingJob).filter(
+                OnboardingJob.status == "running", OnboardingJob.updated_at < stale
+            ).update({"status": "queued", "stage": "queued"}, synchronize_session=False)
+            db.commit()
+            job_ids = [job_id for (job_id,) in db.query(OnboardingJob.id).filter(OnboardingJob.status == "queued")]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.submit(job_id)
+        if job_ids:
+            print(f"Onboarding: re-queued {len(job_ids)} unfinished jobs")
+        return len(job_ids)
+
+    def run(self, job_id: int):
+        db = self.session_factory()
+        try:
+            claimed = db.query(OnboardingJob).filter(
+                OnboardingJob.id == job_id, OnboardingJob.status == "queued"
+            ).update({"status": "running", "stage": "analyzing", "updated_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return
+
+            job = db.get(OnboardingJob, job_id)
+            try:
+                self._onboard(db, job)
+            except Exception as e:
+                db.rollback()
+                print(f"Onboarding job {job_id} failed: {e}")
+                self._finish(db, job, "failed", error=str(e)[:500])
+        finally:
+            db.close()
+
+    def _onboard(self, db: Session, job: OnboardingJob):
+        plant = db.get(Plant, job.plant_id) if job.plant_id else None
+        if plant is None:
+            raise LookupError("Plant was deleted before onboarding finished")
+
+        prediction = self.predict(blob_store.path_for(plant.image_path))
+        disease_class = prediction["class"]
+        confidence = prediction["confidence"]
+        job.stage = "saving"
+        job.updated_at = datetime.utcnow()
+        db.commit()
+
+        # The pending plant was created with a default state; score it now
+        state = plant.plant_state or PlantState(plant_id=plant.id)
+        state.health_score, state.disease_risk_index = TwinEngine.initial_condition(disease_class, confidence)
+        db.add(state)
+        db.add(DiseaseRecord(
+            plant_id=plant.id,
+            predicted_class=disease_class,
+            confidence=confidence,
+            image_path=plant.image_path
+        ))
+        plant.onboarding_status = "ready"
+        self._finish(db, job, "succeeded")
+
+    @staticmethod
+    def _finish(db: Session, job: OnboardingJob, status: str, error: str = None):
+        now = datetime.utcnow()
+        job.status = status
+        job.stage = "done"
+        job.error = error
+        job.updated_at = job.finished_at = now
+        if status == "failed" and job.plant_id:
+            db.query(Plant).filter(Plant.id == job.plant_id).update({"onboarding_status": "failed"}, synchronize_session=False)
+        db.commit()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+onboarding_queue = OnboardingQueue(max_workers=settings.ONBOARDING_WORKERS)
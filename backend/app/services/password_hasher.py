@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.utils.security import pwd_context
+
+class HasherBusyError(Exception):
+    """Raised instead of queueing when the hashing pool is saturated."""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own small thread pool instead of the shared request
+    threadpool, so a burst of logins can only ever occupy `max_workers`
+    threads. At most `max_queue` more calls may wait; beyond that callers get
+    HasherBusyError right away rather than piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, context=pwd_context):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.context = context
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0 # running + queued
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str):
+        """(valid, new_hash); new_hash is set when the stored hash uses an outdated work factor."""
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "rejected": self.rejected
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusyError("Password hashing queue is full")
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
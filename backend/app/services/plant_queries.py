@@ -0,0 +1,96 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.config import settings
+from app.models.disease_record import DiseaseRecord
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+from app.utils.pagination import before_position, newest_first
+
+# Relationships each view eager-loads with one SELECT ... WHERE plant_id IN (...)
+# each. The "full" view's histories are attached separately, capped per plant.
+VIEW_RELATIONSHIPS = {
+    "summary": (Plant.plant_state,),
+    "full": (Plant.plant_state,),
+}
+
+# Histories embedded in plant responses: relationship, model, time column
+HISTORY_RELATIONSHIPS = (
+    ("logs", PlantLog, PlantLog.recorded_at),
+    ("disease_records", DiseaseRecord, DiseaseRecord.timestamp),
+)
+
+def list_plants_page(db: Session, user_id: int, limit: int, after_id: int = None, view: str = "full",
+                     history_limit: int = None):
+    """
+    One keyset page of a user's plants in id order, with exactly the
+    relationships the view needs loaded. The "full" view embeds only the
+    latest `history_limit` logs and disease records of each plant, so a
+    page's size is bounded by `limit`.
+    Returns (plants, next_cursor); next_cursor is None on the last page.
+    """
+    query = db.query(Plant).filter(Plant.user_id == user_id)
+    if after_id is not None:
+        query = query.filter(Plant.id > after_id)
+    query = query.options(*(selectinload(rel) for rel in VIEW_RELATIONSHIPS[view]))
+
+    plants = query.order_by(Plant.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(plants) > limit:
+        plants = plants[:limit]
+        next_cursor = plants[-1].id
+    if view == "full" and plants:
+        attach_latest_history(db, plants, history_limit or settings.PLANT_LIST_HISTORY_LIMIT)
+    return plants, next_cursor
+
+def history_page(db: Session, model, time_column, plant_id: int, limit: int,
+                 cursor: tuple = None, since=None, until=None):
+    """
+    One newest-first page of a plant's history rows (logs, disease records),
+    keyset-paginated on (time_column, id) and served by the
+    (plant_id, time) index. Rows without a time come last; since/until
+    bound the time range (inclusive) and so exclude them.
+    Returns (rows, next_position) where next_position is (time, id) or None.
+    """
+    query = db.query(model).filter(model.plant_id == plant_id)
+    if since is not None:
+        query = query.filter(time_column >= since)
+    if until is not None:
+        query = query.filter(time_column <= until)
+    if cursor is not None:
+        query = query.filter(before_position(time_column, model.id, *cursor))
+
+    rows = query.order_by(*newest_first(time_column, model.id)).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (getattr(last, time_column.key), last.id)
+    return rows, None
+
+def attach_latest_history(db: Session, plants: list, limit: int) -> list:
+    """
+    Populate each plant's logs / disease_records with only its latest `limit`
+    rows (oldest first, as before), one ranked query per relationship for
+    all the plants, without loading or flagging the full collections.
+    """
+    plant_ids = [plant.id for plant in plants]
+    for rel, model, time_column in HISTORY_RELATIONSHIPS:
+        rank = func.row_number().over(
+            partition_by=model.plant_id,
+            order_by=newest_first(time_column, model.id)
+        ).label("rank")
+        ranked = select(model.id, rank).where(model.plant_id.in_(plant_ids)).subquery()
+        rows = (
+            db.query(model)
+            .join(ranked, model.id == ranked.c.id)
+            .filter(ranked.c.rank <= limit)
+            .order_by(model.plant_id, ranked.c.rank.desc())
+            .all()
+        )
+        by_plant = {plant_id: [] for plant_id in plant_ids}
+        for row in rows:
+            by_plant[row.plant_id].append(row)
+        for plant in plants:
+            set_committed_value(plant, rel, by_plant[plant.id])
+    return plants
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+class PrincipalCache:
+    """
+    Short-lived, size-bounded cache of authenticated users keyed by the
+    token's (sub, iat), so most requests resolve their user without a query.
+
+    Entries are plain column snapshots; each request gets its own instance
+    attached to its session via merge(load=False), which emits no SQL.
+    invalidate(sub) drops every cached token of a user in this process;
+    other workers catch up within the TTL.
+
+    invalidate() works by bumping a per-user generation. A generation is
+    only kept for one TTL after its last bump: by then every entry cached
+    under an older generation has expired, so forgetting it (and falling
+    back to 0) cannot revive a stale entry, and the map stays bounded by the
+    users invalidated within the last TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.clock = clock
+        self._generations = OrderedDict() # sub -> (generation, bumped_at), oldest bump first
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, sub: str, iat):
+        entry = self.cache.get((sub, iat))
+        if entry is None:
+            return None
+        generation, snapshot = entry
+        if generation != self.generation(sub):
+            return None
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def put(self, sub: str, iat, user: User, generation: int):
+        """
+        Cache user as loaded under `generation` (read it before the DB lookup).
+        Skipped if the user was invalidated meanwhile, so no entry outlives
+        its generation by more than the TTL.
+        """
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self._lock:
+            if generation == self._generation(sub):
+                self.cache.set((sub, iat), (generation, snapshot))
+
+    def invalidate(self, sub: str):
+        with self._lock:
+            now = self.clock()
+            generation = self._generation(sub, now) + 1
+            self._generations.pop(sub, None)
+            self._generations[sub] = (generation, now)
+
+    def generation(self, sub: str) -> int:
+        with self._lock:
+            return self._generation(sub)
+
+    def _generation(self, sub: str, now: float = None) -> int:
+        # Caller holds the lock. Forget generations bumped more than a TTL ago.
+        cutoff = (self.clock() if now is None else now) - self.ttl
+        while self._generations:
+            oldest, (_, bumped_at) = next(iter(self._generations.items()))
+            if bumped_at > cutoff:
+                break
+            del self._generations[oldest]
+        return self._generations.get(sub, (0, None))[0]
+
+principal_cache = PrincipalCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+)
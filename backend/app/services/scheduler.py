@@ -1,105 +1,267 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from collections import defaultdict
 from datetime import datetime, timedelta
+import functools
+from sqlalchemy import Boolean, DateTime, insert, literal, select, update
+from app.config import settings
 from app.database import SessionLocal
 from app.models.user import User
 from app.models.plant import Plant
 from app.models.reminder import Reminder
-from app.services.weather_service import weather_service
+from app.services.blob_store import blob_store
+from app.services.garden_summary import garden_summary_service
+from app.services.job_metrics import JobRunRecorder
+from app.services.leader_election import LeaderElection
+from app.services.weather_service import weather_cell, weather_service
 
 scheduler = BackgroundScheduler()
 
+# Every worker schedules the jobs, but only the elected leader executes them.
+leader = LeaderElection("greentwin-scheduler")
+
+def run_if_leader(job):
+    @functools.wraps(job)
+    def wrapper():
+        try:
+            if not leader.is_leader():
+                return
+        except Exception as e:
+            print(f"Scheduler leader election failed, skipping {job.__name__}: {e}")
+            return
+        job()
+    return wrapper
+
+def fetch_weather_for_users(users, run=None):
+    """
+    Resolve current weather for every distinct weather cell of the given users.
+    Cached cells are served directly; the rest are fetched with batched
+    multi-location requests, several batches in parallel.
+    Returns a dict keyed by weather_cell(); failed fetches map to None.
+    """
+    # Each cell is looked up in the cache once, so hit/miss stats stay accurate
+    results, missing = weather_service.split_cached(
+        {weather_cell(user.latitude, user.longitude) for user in users}
+    )
+    if run is not None:
+        run.cache_hits += len(results)
+        run.cells_fetched += len(missing)
+    if missing:
+        results.update(weather_service.fetch_current_many(
+            missing, concurrency=settings.WEATHER_FETCH_CONCURRENCY
+        ))
+    return results
+
+def insert_heat_reminders(db, user_ids, now):
+    """
+    Create one urgent water reminder per plant of the given users, unless the
+    plant already has an open water reminder due today. Single INSERT ... SELECT.
+    """
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    already_alerted = select(Reminder.id).where(
+        Reminder.plant_id == Plant.id,
+        Reminder.reminder_type == "water",
+        Reminder.next_due_date >= today_start,
+        Reminder.is_completed == False
+    ).exists()
+
+    stmt = insert(Reminder).from_select(
+        ["plant_id", "reminder_type", "next_due_date", "frequency", "is_completed"],
+        select(
+            Plant.id,
+            literal("water"),
+            literal(now, DateTime),
+            literal("once"),
+            literal(False, Boolean)
+        ).where(Plant.user_id.in_(user_ids), ~already_alerted)
+    )
+    return db.execute(stmt).rowcount
+
+def skip_water_reminders(db, user_ids, now):
+    """
+    Mark every open water reminder due within the next 12h as completed for
+    the given users. Single bulk UPDATE.
+    """
+    stmt = (
+        update(Reminder)
+        .where(
+            Reminder.plant_id.in_(select(Plant.id).where(Plant.user_id.in_(user_ids))),
+            Reminder.reminder_type == "water",
+            Reminder.is_completed == False,
+            Reminder.next_due_date <= now + timedelta(hours=12)
+        )
+        .values(is_completed=True)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+def iter_user_chunks(db, chunk_size, located_only=True):
+    """
+    Keyset-paginate users (by default only those with a location) as light
+    (id, latitude, longitude) rows, one chunk at a time, so no User objects
+    pile up in the session. Each chunk is one LIMITed query, which is what
+    bounds memory.
+    """
+    last_id = 0
+    while True:
+        query = select(User.id, User.latitude, User.longitude).where(User.id > last_id)
+        if located_only:
+            query = query.where(User.latitude != None)
+        users = db.execute(query.order_by(User.id).limit(chunk_size)).all()
+        if not users:
+            return
+        yield users
+        last_id = users[-1].id
+
+def process_user_chunks(db, run, handle_chunk, located_only=True):
+    """
+    Run handle_chunk(db, run, users) per chunk, committing each chunk on its own.
+    A failing chunk is rolled back and recorded without aborting the whole run.
+    """
+    for users in iter_user_chunks(db, settings.SCHEDULER_USER_CHUNK_SIZE, located_only):
+        run.users_scanned += len(users)
+        try:
+            handle_chunk(db, run, users)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            run.record_error(e)
+            print(f"Scheduler Error (users {users[0].id}-{users[-1].id}): {e}")
+        finally:
+            db.expunge_all()
+
+def _alert_heat_for_chunk(db, run, users):
+    # 1. Get Weather for the chunk up front (concurrent)
+    weather_by_cell = fetch_weather_for_users(users, run)
+    run.errors += sum(1 for weather in weather_by_cell.values() if not weather)
+
+    # 2. Check Threshold, grouping hot users by weather cell
+    hot_users_by_cell = defaultdict(list)
+    for user in users:
+        weather = weather_by_cell.get(weather_cell(user.latitude, user.longitude))
+        if weather and (weather.get("temperature") or 0) > 35.0:
+            hot_users_by_cell[weather_cell(user.latitude, user.longitude)].append(user.id)
+
+    # 3. Create Urgent Reminders for ALL plants if not already alerted today
+    now = datetime.utcnow()
+    for cell, user_ids in hot_users_by_cell.items():
+        temp = weather_by_cell[cell]["temperature"]
+        created = insert_heat_reminders(db, user_ids, now)
+        run.rows_inserted += created
+        print(f"🔥 EXTREME HEAT ({temp}°C) at {cell}: {created} urgent reminders for {len(user_ids)} users")
+
+def _skip_rain_for_chunk(db, run, users):
+    weather_by_cell = fetch_weather_for_users(users, run)
+    run.errors += sum(1 for weather in weather_by_cell.values() if not weather)
+
+    rainy_user_ids = []
+    for user in users:
+        weather = weather_by_cell.get(weather_cell(user.latitude, user.longitude))
+        if not weather: continue
+        
+        condition = weather.get("condition", "").lower()
+        if "rain" in condition or "drizzle" in condition or "shower" in condition:
+            rainy_user_ids.append(user.id)
+
+    if rainy_user_ids:
+        # Reminder has no notes/status field, so a skip is recorded as completed.
+        skipped = skip_water_reminders(db, rainy_user_ids, datetime.utcnow())
+        run.rows_updated += skipped
+        print(f"🌧️ RAIN DETECTED for {len(rainy_user_ids)} users. Skipped {skipped} water tasks")
+
+def _reconcile_summaries_for_chunk(db, run, users):
+    inserted, updated = garden_summary_service.reconcile(db, [user.id for user in users])
+    run.rows_inserted += inserted
+    run.rows_updated += updated
+    if updated:
+        print(f"🧮 Repaired {updated} drifted garden summaries (users {users[0].id}-{users[-1].id})")
+
 def check_heat_emergencies():
     """
     Background job to check for extreme heat and alert users.
     """
     print(f"[{datetime.now()}] 🌡️ Checking Heat Emergencies...")
-    db = SessionLocal()
-    try:
-        users = db.query(User).filter(User.latitude != None).all()
-        for user in users:
-            # 1. Get Weather for User
-            weather = weather_service.get_current_weather(user.latitude, user.longitude)
-            if not weather: 
-                continue
-                
-            temp = weather.get("temperature", 0)
-            
-            # 2. Check Threshold
-            if temp > 35.0:
-                print(f"🔥 EXTREME HEAT ({temp}°C) for User {user.email}")
-                
-                # 3. Create Urgent Reminders for ALL plants if not already exists today
-                plants = db.query(Plant).filter(Plant.user_id == user.id).all()
-                for plant in plants:
-                    # Check if we already alerted today to avoid spam
-                    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                    existing = db.query(Reminder).filter(
-                        Reminder.plant_id == plant.id,
-                        Reminder.reminder_type == "water", # Reuse type or new 'urgent'
-                        Reminder.due_date >= today_start,
-                        Reminder.is_completed == False
-                    ).first()
-                    
-                    if not existing:
-                        # Create Urgent Task
-                        new_reminder = Reminder(
-                            plant_id=plant.id,
-                            reminder_type="water",
-                            message=f"🔥 HEAT EMERGENCY! {temp}°C. Water immediately!",
-                            due_date=datetime.utcnow(),
-                            is_completed=False
-                        )
-                        db.add(new_reminder)
-                        print(f"   -> Created Urgent Reminder for {plant.name}")
-        db.commit()
-    except Exception as e:
-        print(f"Scheduler Error: {e}")
-    finally:
-        db.close()
+    with JobRunRecorder("check_heat_emergencies") as run:
+        db = SessionLocal()
+        try:
+            process_user_chunks(db, run, _alert_heat_for_chunk)
+        except Exception as e:
+            db.rollback()
+            run.record_error(e)
+            print(f"Scheduler Error: {e}")
+        finally:
+            db.close()
 
 def smart_skip_logic():
     """
     Check if it's raining and auto-complete/skip reminders.
     """
     print(f"[{datetime.now()}] 🌧️ Checking Rain Skips...")
-    db = SessionLocal()
-    try:
-        users = db.query(User).filter(User.latitude != None).all()
-        for user in users:
-            weather = weather_service.get_current_weather(user.latitude, user.longitude)
-            if not weather: continue
-            
-            condition = weather.get("condition", "").lower()
-            is_raining = "rain" in condition or "drizzle" in condition or "shower" in condition
-            
-            if is_raining:
-                print(f"🌧️ RAIN DETECTED for User {user.email}. Skipping tasks...")
-                plants = db.query(Plant).filter(Plant.user_id == user.id).all()
-                for plant in plants:
-                    # Find pending water reminders
-                    reminders = db.query(Reminder).filter(
-                        Reminder.plant_id == plant.id,
-                        Reminder.reminder_type == "water",
-                        Reminder.is_completed == False,
-                        Reminder.due_date <= datetime.utcnow() + timedelta(hours=12)
-                    ).all()
-                    
-                    for rem in reminders:
-                        rem.is_completed = True
-                        # Append a note? We don't have a notes field on reminder. 
-                        # Only on PlantLog? 
-                        # Ideally, we'd have a 'status' field. 
-                        print(f"   -> Skipped Water Task for {plant.name}")
-        db.commit()
-    except Exception as e:
-        print(f"Scheduler Error: {e}")
-    finally:
-        db.close()
+    with JobRunRecorder("smart_skip_logic") as run:
+        db = SessionLocal()
+        try:
+            process_user_chunks(db, run, _skip_rain_for_chunk)
+        except Exception as e:
+            db.rollback()
+            run.record_error(e)
+            print(f"Scheduler Error: {e}")
+        finally:
+            db.close()
+
+def reconcile_garden_summaries():
+    """
+    Recompute garden summaries from plants/plant_states and repair any drift
+    (e.g. from bulk writes that bypass the ORM hooks).
+    """
+    print(f"[{datetime.now()}] 🧮 Reconciling Garden Summaries...")
+    with JobRunRecorder("reconcile_garden_summaries") as run:
+        db = SessionLocal()
+        try:
+            process_user_chunks(db, run, _reconcile_summaries_for_chunk, located_only=False)
+        except Exception as e:
+            db.rollback()
+            run.record_error(e)
+            print(f"Scheduler Error: {e}")
+        finally:
+            db.close()
+
+def sweep_orphan_blobs():
+    """
+    Delete uploaded images nothing references any more. release() skips
+    blobs inside the upload grace period (a plant deleted right after its
+    upload, a rejected duplicate onboarding request); this picks them up.
+    """
+    print(f"[{datetime.now()}] 🧹 Sweeping Orphan Blobs...")
+    with JobRunRecorder("sweep_orphan_blobs") as run:
+        db = SessionLocal()
+        try:
+            removed = blob_store.sweep(db)
+            if removed:
+                print(f"🧹 Removed {removed} unreferenced blobs")
+        except Exception as e:
+            run.record_error(e)
+            print(f"Scheduler Error: {e}")
+        finally:
+            db.close()
 
 def start_scheduler():
     # Check heat every 30 mins
-    scheduler.add_job(check_heat_emergencies, 'interval', minutes=30)
+    scheduler.add_job(run_if_leader(check_heat_emergencies), 'interval', minutes=30, max_instances=1, coalesce=True)
     # Check rain skip every 60 mins
-    scheduler.add_job(smart_skip_logic, 'interval', minutes=60)
+    scheduler.add_job(run_if_leader(smart_skip_logic), 'interval', minutes=60, max_instances=1, coalesce=True)
+    # Repair garden summary drift
+    scheduler.add_job(
+        run_if_leader(reconcile_garden_summaries), 'interval',
+        minutes=settings.GARDEN_SUMMARY_RECONCILE_MINUTES, max_instances=1, coalesce=True
+    )
+    # Free blobs that were still in their grace period when released
+    scheduler.add_job(
+        run_if_leader(sweep_orphan_blobs), 'interval',
+        minutes=settings.BLOB_SWEEP_MINUTES, max_instances=1, coalesce=True
+    )
     
     scheduler.start()
+
+def stop_scheduler():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    leader.release()
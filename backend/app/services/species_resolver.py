@@ -0,0 +1,143 @@
+import json
+import os
+import pathlib
+from collections import deque
+from functools import lru_cache
+
+from app.config import settings
+
+BASE_DIR = pathlib.Path(__file__).parent.parent.parent.absolute()
+
+def normalize_species(text: str) -> str:
+    """Case- and whitespace-insensitive form used for every species comparison."""
+    return " ".join((text or "").casefold().split())
+
+class _PatternMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of patterns.
+
+    `best(text)` scans the text once and returns the smallest tag of any
+    pattern occurring in it, so "first match in catalog order" costs
+    O(len(text)) no matter how many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None] # smallest tag ending at this node (incl. via fail links)
+
+        for pattern, tag in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._best[node] = tag if self._best[node] is None else min(self._best[node], tag)
+
+        # Breadth-first so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def best(self, text: str):
+        node = 0
+        best = None
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            tag = self._best[node]
+            if tag is not None and (best is None or tag < best):
+                best = tag
+                if best == 0:
+                    break
+        return best
+
+class SpeciesResolver:
+    """
+    Maps free-text species names to a care profile and a garden category.
+
+    A name that equals a catalog key (ignoring case/whitespace) resolves to
+    it; otherwise the first catalog key contained in the name wins, as does
+    the first category with a matching keyword. Results are memoized since
+    the same few species strings are resolved over and over.
+    """
+
+    def __init__(self, profiles: dict, default_profile: dict, categories: dict, default_category: str, cache_size: int = 4096):
+        self.profiles = profiles
+        self.default_profile = default_profile
+        self.category_names = list(categories)
+        self.default_category = default_category
+
+        self._names = list(profiles)
+        self._exact = {}
+        for index, name in enumerate(self._names):
+            self._exact.setdefault(normalize_species(name), index)
+        self._profile_matcher = _PatternMatcher(
+            (normalize_species(name), index) for index, name in enumerate(self._names)
+        )
+        self._category_matcher = _PatternMatcher(
+            (normalize_species(keyword), index)
+            for index, keywords in enumerate(categories.values())
+            for keyword in keywords
+        )
+
+        self._resolve = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+        self._category = lru_cache(maxsize=cache_size)(self._category_uncached)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "SpeciesResolver":
+        with open(os.path.join(BASE_DIR, path), encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            profiles=data["profiles"],
+            default_profile=data["default_profile"],
+            categories=data["categories"],
+            default_category=data["default_category"],
+            **kwargs
+        )
+
+    def resolve(self, species: str):
+        """(catalog name, profile) for species; (None, default profile) if unknown."""
+        return self._resolve(species or "")
+
+    def category(self, species: str) -> str:
+        return self._category(species or "")
+
+    def cache_info(self) -> dict:
+        return {"resolve": self._resolve.cache_info()._asdict(), "category": self._category.cache_info()._asdict()}
+
+    def _resolve_uncached(self, species: str):
+        key = normalize_species(species)
+        index = self._exact.get(key)
+        if index is None:
+            index = self._profile_matcher.best(key)
+        if index is None:
+            return None, self.default_profile
+        name = self._names[index]
+        return name, self.profiles[name]
+
+    def _category_uncached(self, species: str) -> str:
+        index = self._category_matcher.best(normalize_species(species))
+        return self.default_category if index is None else self.category_names[index]
+
+species_resolver = SpeciesResolver.from_file(
+    settings.PLANT_PROFILES_PATH,
+    cache_size=settings.SPECIES_RESOLVER_CACHE_SIZE
+)
@@ -61,6 +61,19 @@ class TwinEngine:
         
         return state
 
+    @staticmethod
+    def initial_condition(disease_class: str, confidence: float):
+        """
+        (health_score, disease_risk_index) for a newly onboarded plant from
+        its first leaf prediction.
+        """
+        if "healthy" in disease_class.lower() or "mock" in disease_class.lower():
+            return 100.0, 0.0
+        # Use confidence as risk index (min 0.5 to show impact)
+        risk = max(0.5, confidence)
+        state = PlantState(water_stress=0.0, heat_stress=0.0, disease_risk_index=risk)
+        return TwinEngine.calculate_health_score(state), risk
+
     @staticmethod
     def simulate_recovery(state: PlantState, water_added: bool = False) -> PlantState:
         """
@@ -0,0 +1,41 @@
+import json
+from app.database import SessionLocal
+from app.models.weather_cache_entry import WeatherCacheEntry
+
+class DatabaseCacheBackend:
+    """
+    Shared TTLCache backend stored in the app database, so every worker
+    (and replica) sees the same weather cells.
+    """
+
+    def __init__(self, session_factory=None, encode=None, decode=None):
+        self.session_factory = session_factory or SessionLocal
+        # Convert cached values to / from JSON-friendly structures
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+
+    @staticmethod
+    def _key(cell):
+        lat, lon = cell
+        return f"{lat},{lon}"
+
+    def get(self, cell):
+        db = self.session_factory()
+        try:
+            entry = db.get(WeatherCacheEntry, self._key(cell))
+            if entry is None:
+                return None
+            return self.decode(json.loads(entry.payload)), entry.stored_at
+        finally:
+            db.close()
+
+    def set(self, cell, value, stored_at):
+        db = self.session_factory()
+        try:
+            db.merge(WeatherCacheEntry(cell_key=self._key(cell), payload=json.dumps(self.encode(value)), stored_at=stored_at))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
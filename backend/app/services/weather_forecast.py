@@ -0,0 +1,92 @@
+import math
+import time
+from array import array
+
+HOUR = 3600
+
+def _series(values):
+    # Open-Meteo uses null for missing hours; keep them as NaN in a float array
+    return array("f", (math.nan if v is None else v for v in values))
+
+def _value(series, index):
+    if index is None or index >= len(series):
+        return None
+    value = series[index]
+    return None if math.isnan(value) else round(value, 2)
+
+class CellForecast:
+    """
+    Current conditions plus the hourly forecast for one weather cell.
+
+    Hourly series are compact float arrays on a fixed one-hour grid starting at
+    `start` (unix seconds), so any timestamp maps to its slot in O(1).
+    """
+
+    def __init__(self, current: dict, start: int, temperature, humidity, precipitation_probability):
+        self.current = current
+        self.start = int(start)
+        self.temperature = _series(temperature)
+        self.humidity = _series(humidity)
+        self.precipitation_probability = _series(precipitation_probability)
+
+    @classmethod
+    def from_open_meteo(cls, data: dict) -> "CellForecast":
+        """Build from an Open-Meteo response requested with timeformat=unixtime."""
+        current = data.get("current_weather", {})
+        hourly = data.get("hourly", {})
+        times = hourly.get("time") or []
+        return cls(
+            current={
+                "temperature": current.get("temperature"),
+                "wind_speed": current.get("windspeed"),
+                "weathercode": current.get("weathercode"),
+                "is_day": current.get("is_day")
+            },
+            start=times[0] if times else int(time.time()) // HOUR * HOUR,
+            temperature=hourly.get("temperature_2m") or [],
+            humidity=hourly.get("relativehumidity_2m") or [],
+            precipitation_probability=hourly.get("precipitation_probability") or []
+        )
+
+    def index_at(self, ts: float = None):
+        ts = time.time() if ts is None else ts
+        index = int((ts - self.start) // HOUR)
+        return index if index >= 0 else None
+
+    def temperature_at(self, ts: float = None):
+        return _value(self.temperature, self.index_at(ts))
+
+    def humidity_at(self, ts: float = None):
+        return _value(self.humidity, self.index_at(ts))
+
+    def precipitation_probability_at(self, ts: float = None):
+        """Chance of precipitation (0-100 %) for the hour containing ts."""
+        return _value(self.precipitation_probability, self.index_at(ts))
+
+    def temperatures_next(self, hours: int, ts: float = None) -> list:
+        """Hourly temperatures for the next `hours` hours starting at ts's hour."""
+        index = self.index_at(ts)
+        if index is None:
+            index = 0
+        return [_value(self.temperature, i) for i in range(index, min(index + hours, len(self.temperature)))]
+
+    def to_dict(self) -> dict:
+        return {
+            "current": self.current,
+            "start": self.start,
+            "temperature": [_value(self.temperature, i) for i in range(len(self.temperature))],
+            "humidity": [_value(self.humidity, i) for i in range(len(self.humidity))],
+            "precipitation_probability": [
+                _value(self.precipitation_probability, i) for i in range(len(self.precipitation_probability))
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CellForecast":
+        return cls(
+            current=data["current"],
+            start=data["start"],
+            temperature=data["temperature"],
+            humidity=data["humidity"],
+            precipitation_probability=data["precipitation_probability"]
+        )
@@ -1,48 +1,249 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import anyio
 import requests
+from requests.adapters import HTTPAdapter
+from app.config import settings
+from app.services.weather_forecast import CellForecast
+from app.utils.cache import TTLCache
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, retry_with_jitter
+
+def weather_cell(lat: float, lon: float):
+    """
+    Snap a coordinate to the centre of its WEATHER_CELL_DEGREES grid cell.
+    Nearby users share a cell, and therefore one cached forecast.
+    """
+    step = settings.WEATHER_CELL_DEGREES
+    return (round(round(lat / step) * step, 4), round(round(lon / step) * step, 4))
 
 class WeatherService:
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
+    def __init__(self):
+        backend = None
+        if settings.WEATHER_CACHE_BACKEND == "database":
+            from app.services.weather_cache import DatabaseCacheBackend
+            backend = DatabaseCacheBackend(encode=CellForecast.to_dict, decode=CellForecast.from_dict)
+        self.cache = TTLCache(
+            maxsize=settings.WEATHER_CACHE_MAX_CELLS,
+            ttl=settings.WEATHER_CACHE_TTL_SECONDS,
+            stale_ttl=settings.WEATHER_STALE_TTL_SECONDS,
+            backend=backend
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.WEATHER_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.WEATHER_BREAKER_RESET_SECONDS
+        )
+        self._counter_lock = threading.Lock()
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+        # Keep-alive connection pool shared by all threads
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.WEATHER_MAX_CONNECTIONS)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.timeout = (settings.WEATHER_CONNECT_TIMEOUT_SECONDS, settings.WEATHER_READ_TIMEOUT_SECONDS)
+        self._async_limiter = None
+
+    def get_forecast(self, lat: float, lon: float):
+        """
+        CellForecast for the cell containing (lat, lon). Fetched once per cell
+        per cache TTL; past that, the last good forecast is served while a
+        background refresh runs. None if nothing usable is available.
+        """
+        forecast, _age = self._get_forecast_with_age(lat, lon)
+        return forecast
+
+    def get_current_weather(self, lat: float, lon: float):
+        """
+        Current weather for the cell containing (lat, lon), served from the
+        cached forecast. `age_seconds` / `stale` tell the caller how old it is.
+        Returns None if nothing usable is available.
+        """
+        forecast, age = self._get_forecast_with_age(lat, lon)
+        if not forecast:
+            return None
+        weather = self.format_current(forecast)
+        weather["age_seconds"] = round(age)
+        weather["stale"] = age > settings.WEATHER_CACHE_TTL_SECONDS
+        return weather
+
+    async def get_current_weather_async(self, lat: float, lon: float):
+        """
+        Awaitable get_current_weather for async routes. The blocking call runs on
+        a worker thread capped at WEATHER_MAX_CONNECTIONS, so a slow upstream
+        neither blocks the event loop nor drains FastAPI's shared threadpool.
+        """
+        if self._async_limiter is None:
+            self._async_limiter = anyio.CapacityLimiter(settings.WEATHER_MAX_CONNECTIONS)
+        return await anyio.to_thread.run_sync(
+            self.get_current_weather, lat, lon, limiter=self._async_limiter
+        )
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "circuit_state": self.breaker.state,
+            "short_circuited": self.breaker.short_circuited
+        }
+
+    def _get_forecast_with_age(self, lat: float, lon: float):
+        cell = weather_cell(lat, lon)
+        return self.cache.get_or_load_with_age(cell, lambda: self.fetch_forecast(*cell))
+
     @staticmethod
-    def get_current_weather(lat: float, lon: float):
+    def format_current(forecast: CellForecast, ts: float = None) -> dict:
+        """The /weather payload: current conditions plus this hour's humidity and rain chance."""
+        humidity = forecast.humidity_at(ts)
+        return {
+            "temperature": forecast.current.get("temperature"),
+            "humidity": 50 if humidity is None else humidity, # Default
+            "wind_speed": forecast.current.get("wind_speed"),
+            "condition": WeatherService._get_condition_code(forecast.current.get("weathercode")),
+            "is_day": forecast.current.get("is_day"),
+            "precipitation_probability": forecast.precipitation_probability_at(ts)
+        }
+
+    def get_current_weather_many(self, cells, concurrency: int = 1) -> dict:
+        """
+        Current weather for many cells at once: cached cells are served directly
+        and the rest are fetched with as few multi-location requests as possible.
+        Returns a dict keyed by cell; failed cells map to None.
+        """
+        results, missing = self.split_cached(cells)
+        results.update(self.fetch_current_many(missing, concurrency))
+        return results
+
+    def split_cached(self, cells):
+        """
+        (current weather of the cells with a fresh cached forecast, the other
+        cells). One cache lookup per distinct cell; never calls upstream.
+        """
+        results = {}
+        missing = []
+        for cell in set(cells):
+            forecast = self.cache.get(cell)
+            if forecast:
+                results[cell] = self.format_current(forecast)
+            else:
+                missing.append(cell)
+        return results, missing
+
+    def fetch_current_many(self, cells, concurrency: int = 1) -> dict:
+        """Fetch and cache current weather for cells split_cached() missed; failed cells map to None."""
+        results = {}
+        for cell, forecast in self.fetch_forecasts(cells, concurrency).items():
+            if forecast:
+                self.cache.set(cell, forecast)
+            else:
+                # Upstream failed: fall back to the last good forecast if we still have one
+                forecast = self.cache.get(cell, allow_stale=True)
+            results[cell] = self.format_current(forecast) if forecast else None
+        return results
+
+    def fetch_forecast(self, lat: float, lon: float):
+        """Uncached Open-Meteo call for a single point."""
+        return self.fetch_forecasts([(lat, lon)])[(lat, lon)]
+
+    def fetch_forecasts(self, cells, concurrency: int = 1) -> dict:
+        """
+        Uncached Open-Meteo calls for many points. Points are packed into
+        comma-separated latitude/longitude lists, split into URL-safe batches,
+        and batches run up to `concurrency` at a time.
+        """
+        batches = list(self._batches(cells))
+        results = {}
+        if not batches:
+            return results
+        if concurrency <= 1 or len(batches) == 1:
+            for batch in batches:
+                results.update(self._fetch_batch(batch))
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(batches)), thread_name_prefix="weather-fetch") as pool:
+            for batch_results in pool.map(self._fetch_batch, batches):
+                results.update(batch_results)
+        return results
+
+    def _batches(self, cells):
+        # Each location adds "lat%2C" and "lon%2C" to the query string
+        batch = []
+        length = 0
+        for lat, lon in cells:
+            cost = len(str(lat)) + len(str(lon)) + 6
+            if batch and (
+                len(batch) >= settings.WEATHER_BATCH_MAX_LOCATIONS
+                or length + cost > settings.WEATHER_BATCH_MAX_QUERY_LENGTH
+            ):
+                yield batch
+                batch, length = [], 0
+            batch.append((lat, lon))
+            length += cost
+        if batch:
+            yield batch
+
+    def _fetch_batch(self, batch) -> dict:
         try:
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "current_weather": "true",
-                "hourly": "relativehumidity_2m",
-                "timezone": "auto"
-            }
-            response = requests.get(WeatherService.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            current = data.get("current_weather", {})
-            hourly = data.get("hourly", {})
-            
-            temp = current.get("temperature")
-            wind_speed = current.get("windspeed")
-            
-            # Open-Meteo humidity is hourly. Get the one closest to now.
-            # actually for simplicity, just take the first one or current hour index
-            # simplistic approach: take index 0 if available
-            humidity = 50 # Default
-            if "relativehumidity_2m" in hourly and hourly["relativehumidity_2m"]:
-                 # We should find the current hour, but for MVP taking the current hour (usually near index 0 or by time)
-                 # Let's just take the first value which represents "now" roughly in 1-hr forecast usually
-                 # Better: Use datetime. But to keep it simple and robust:
-                 humidity = hourly["relativehumidity_2m"][0]
-
-            return {
-                "temperature": temp,
-                "humidity": humidity,
-                "wind_speed": wind_speed,
-                "condition": WeatherService._get_condition_code(current.get("weathercode")),
-                "is_day": current.get("is_day")
-            }
+            locations = self.breaker.call(
+                retry_with_jitter,
+                lambda: self._request_batch(batch),
+                attempts=settings.WEATHER_RETRY_ATTEMPTS,
+                base_delay=settings.WEATHER_RETRY_BASE_DELAY_SECONDS,
+                max_delay=settings.WEATHER_RETRY_MAX_DELAY_SECONDS,
+                should_retry=self._is_retryable,
+                is_failure=self._is_upstream_failure
+            )
+            return {cell: CellForecast.from_open_meteo(item) for cell, item in zip(batch, locations)}
+        except CircuitOpenError:
+            # Fail fast while upstream is known to be down
+            return {cell: None for cell in batch}
         except Exception as e:
-            print(f"Weather API Error: {e}")
-            return None
+            with self._counter_lock:
+                self.upstream_errors += 1
+            print(f"Weather API Error ({len(batch)} locations): {e}")
+            return {cell: None for cell in batch}
+
+    def _request_batch(self, batch) -> list:
+        with self._counter_lock:
+            self.upstream_calls += 1
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in batch),
+            "longitude": ",".join(str(lon) for _, lon in batch),
+            "current_weather": "true",
+            "hourly": "temperature_2m,relativehumidity_2m,precipitation_probability",
+            "forecast_days": settings.WEATHER_FORECAST_DAYS,
+            "timeformat": "unixtime",
+            "timezone": "auto"
+        }
+        response = self.http.get(self.BASE_URL, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+
+        # One location returns an object, several return a list in request order
+        locations = data if isinstance(data, list) else [data]
+        if len(locations) != len(batch):
+            raise ValueError(f"Expected {len(batch)} locations, got {len(locations)}")
+        return locations
+
+    @staticmethod
+    def _is_retryable(error) -> bool:
+        # Network trouble, 429 and 5xx are worth another try; other 4xx are not
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    @staticmethod
+    def _is_upstream_failure(error) -> bool:
+        # Only an unreachable or erroring upstream should open the circuit, not a bad request
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def close(self):
+        self.http.close()
 
     @staticmethod
     def _get_condition_code(code):
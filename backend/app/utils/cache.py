@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class _Flight:
+    """A load in progress; concurrent callers for the same key wait on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and single-flight loading.
+
+    With `stale_ttl`, entries stay usable for that long past their TTL:
+    get_or_load returns a stale value immediately and revalidates it in the
+    background (stale-while-revalidate), so the last good value keeps being
+    served while loads fail.
+
+    An optional shared backend (any object with get(key) -> (value, stored_at)
+    or None, and set(key, value, stored_at)) sits behind the in-process LRU so
+    several workers can share entries. stored_at is a unix timestamp.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, backend=None, stale_ttl: float = 0, refresh_workers: int = 4):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend
+        self.refresh_workers = refresh_workers
+        self._entries = OrderedDict() # key -> (value, stored_at)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._refresher = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.loads = 0
+
+    def get(self, key, allow_stale: bool = False):
+        """Return a fresh (or, if allowed, stale) value or None, without loading."""
+        entry = self._lookup(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        value, stored_at = entry
+        if not allow_stale and self._is_stale(stored_at):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, stored_at: float = None):
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock:
+            self._set_local(key, value, stored_at)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, stored_at)
+            except Exception as e:
+                print(f"Shared cache write failed for {key}: {e}")
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for key, calling loader() on a miss.
+        Concurrent misses for the same key share one loader call.
+        A None result from loader is returned but not cached.
+        """
+        value, _age = self.get_or_load_with_age(key, loader)
+        return value
+
+    def get_or_load_with_age(self, key, loader):
+        """
+        Like get_or_load, but returns (value, age_seconds). Age is 0 for a value
+        loaded by this call and None when nothing could be served.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            value, stored_at = entry
+            stale = self._is_stale(stored_at)
+            with self._lock:
+                self.hits += 1
+                if stale:
+                    self.stale_hits += 1
+            if stale:
+                self._refresh_in_background(key, loader)
+            return value, time.time() - stored_at
+
+        with self._lock:
+            self.misses += 1
+            # Someone may have filled it while we checked the shared backend
+            entry = self._get_local(key)
+            if entry is not None:
+                return entry[0], time.time() - entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, (0.0 if flight.value is not None else None)
+
+        self._run_flight(key, loader, flight)
+        if flight.error is not None:
+            raise flight.error
+        return flight.value, (0.0 if flight.value is not None else None)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "refreshing": len(self._flights),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _run_flight(self, key, loader, flight):
+        try:
+            with self._lock:
+                self.loads += 1
+            flight.value = loader()
+            if flight.value is not None:
+                self.set(key, flight.value)
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=self.refresh_workers, thread_name_prefix="cache-refresh")
+        self._refresher.submit(self._run_flight, key, loader, flight)
+
+    def _is_stale(self, stored_at) -> bool:
+        return time.time() - stored_at > self.ttl
+
+    def _lookup(self, key):
+        """(value, stored_at) from the local LRU or the shared backend, within ttl + stale_ttl."""
+        with self._lock:
+            entry = self._get_local(key)
+        if entry is None or (self._is_stale(entry[1]) and self.backend is not None):
+            # Another worker may already hold a fresher copy
+            shared = self._get_shared(key)
+            if shared is not None and (entry is None or shared[1] > entry[1]):
+                entry = shared
+                with self._lock:
+                    self._set_local(key, *shared)
+                    self.shared_hits += 1
+        return entry
+
+    def _get_local(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set_local(self, key, value, stored_at):
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key):
+        if self.backend is None:
+            return None
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            print(f"Shared cache read failed for {key}: {e}")
+            return None
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.time() - stored_at > self.ttl + self.stale_ttl:
+            return None
+        return value, stored_at
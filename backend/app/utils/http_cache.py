@@ -0,0 +1,121 @@
+import hashlib
+import json
+import threading
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+def strong_etag(body: bytes) -> str:
+    """Strong validator: identical bytes <=> identical tag."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+def cacheable_json(request: Request, content, cache_control: str) -> Response:
+    """
+    JSON response with a content-hash ETag and Cache-Control, or an empty
+    304 when the client already holds the same representation.
+    """
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    etag = strong_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles for write-once content.
+
+    `etag_for(relative_path)` returns a strong content-hash ETag for files
+    whose name pins their bytes (or None). Those are served with
+    Cache-Control: immutable and a year's max-age, so clients and proxies
+    never revalidate them; everything else gets `default_cache_control` and
+    Starlette's mtime/size ETag. If-None-Match yields a 304 and Range
+    requests get 206 partial content (FileResponse handles both Range and
+    If-Range). Nothing is precompressed: JPEG/PNG/WebP bytes do not shrink
+    under gzip, so proxies should pass them through as-is.
+    """
+
+    def __init__(self, *args, etag_for=None, default_cache_control: str = "public, max-age=86400", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.etag_for = etag_for
+        self.default_cache_control = default_cache_control
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        relative_path = self.get_path(scope).replace("\\", "/")
+        etag = self.etag_for(relative_path) if self.etag_for else None
+        headers = {"Cache-Control": IMMUTABLE if etag else self.default_cache_control}
+        if etag:
+            headers["ETag"] = etag
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+class TransferStats:
+    """Per-process counters of responses and body bytes sent, by path prefix."""
+
+    def __init__(self, prefixes):
+        self.prefixes = tuple(prefixes)
+        self._lock = threading.Lock()
+        self._counts = {prefix: {"responses": 0, "not_modified": 0, "partial": 0, "bytes_sent": 0} for prefix in self.prefixes}
+
+    def record(self, prefix: str, status_code: int, body_bytes: int):
+        with self._lock:
+            counts = self._counts[prefix]
+            counts["responses"] += 1
+            counts["bytes_sent"] += body_bytes
+            if status_code == 304:
+                counts["not_modified"] += 1
+            elif status_code == 206:
+                counts["partial"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {prefix: dict(counts) for prefix, counts in self._counts.items()}
+
+class TransferCountingMiddleware:
+    """ASGI middleware feeding TransferStats for requests under its prefixes."""
+
+    def __init__(self, app, transfer_stats: TransferStats):
+        self.app = app
+        self.transfer_stats = transfer_stats
+
+    async def __call__(self, scope, receive, send):
+        prefix = None
+        if scope["type"] == "http":
+            prefix = next((p for p in self.transfer_stats.prefixes if scope["path"].startswith(p + "/")), None)
+        if prefix is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 0
+        body_bytes = 0
+
+        async def counting_send(message):
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            self.transfer_stats.record(prefix, status_code, body_bytes)
+
+# Image traffic served by this process (GET /admin/image-traffic)
+image_transfer_stats = TransferStats(["/uploads", "/images"])
@@ -0,0 +1,35 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+# History timestamps are nullable; rows without one sort last (and are encoded
+# in cursors as an empty timestamp) so every row is reachable by paging.
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque cursor for the (timestamp, id) position of the last row on a page."""
+    raw = f"{timestamp.isoformat() if timestamp is not None else ''}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """(timestamp, id) from encode_cursor(); ValueError if the cursor is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def newest_first(time_column, id_column):
+    """ORDER BY for history pages: time DESC with NULLs last, then id DESC."""
+    return time_column.desc().nulls_last(), id_column.desc()
+
+def before_position(time_column, id_column, timestamp: datetime, row_id: int):
+    """Rows strictly after (timestamp, id) in newest_first() order."""
+    if timestamp is None:
+        return and_(time_column.is_(None), id_column < row_id)
+    return or_(
+        time_column < timestamp,
+        and_(time_column == timestamp, id_column < row_id),
+        time_column.is_(None)
+    )
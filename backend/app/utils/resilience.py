@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit is open."""
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls pass; `failure_threshold` failures in a row open it.
+    open      -> calls fail fast for `reset_timeout` seconds.
+    half-open -> exactly one trial call; success closes, failure re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial call is allowed (0 when not open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def call(self, fn, *args, is_failure=lambda e: True, **kwargs):
+        """
+        Run fn through the breaker. Exceptions for which is_failure(e) is
+        false (e.g. a 4xx for a bad request) still propagate, but they show
+        upstream is answering, so they count as a success.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit open, retry in {self.retry_after():.0f}s")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+def retry_with_jitter(fn, attempts: int, base_delay: float, max_delay: float, should_retry=lambda e: True):
+    """
+    Call fn() up to `attempts` times, sleeping a "full jitter" exponential
+    backoff (uniform 0..min(max_delay, base_delay * 2**n)) between tries so
+    recovering clients don't retry in lockstep.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not should_retry(e):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from app.config import settings
+from app.services.blob_store import blob_store
+
+# content type -> (file extension, magic-byte check on the first bytes)
+IMAGE_TYPES = {
+    "image/jpeg": ("jpg", lambda head: head.startswith(b"\xff\xd8\xff")),
+    "image/png": ("png", lambda head: head.startswith(b"\x89PNG\r\n\x1a\n")),
+    "image/webp": ("webp", lambda head: head[:4] == b"RIFF" and head[8:12] == b"WEBP"),
+}
+
+class StoredUpload(NamedTuple):
+    path: str # on-disk location, for inference
+    url_path: str # "uploads/blobs/...", what image_path columns store
+    sha256: str
+    size: int
+    content_type: str
+
+def sniff_image_type(head: bytes):
+    """Content type from the file's magic bytes, or None if it is not an allowed image."""
+    for content_type, (_ext, matches) in IMAGE_TYPES.items():
+        if content_type in settings.UPLOAD_ALLOWED_TYPES and matches(head):
+            return content_type
+    return None
+
+def _too_large():
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload exceeds {settings.UPLOAD_MAX_BYTES} bytes"
+    )
+
+async def save_upload(file: UploadFile) -> StoredUpload:
+    """
+    Stream an uploaded image into the blob store without blocking the event loop.
+
+    The type comes from the magic bytes (not the client's filename or
+    Content-Type), the size is capped at UPLOAD_MAX_BYTES and the sha256 is
+    computed on the way through and names the blob, so a repeated image is
+    stored once. Data goes to a temp file that is only moved into place once
+    complete, so rejected or aborted uploads never leave partial images
+    behind. Raises 413 / 415 HTTPExceptions.
+    """
+    if file.size is not None and file.size > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    os.makedirs(blob_store.root, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=blob_store.root, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if content_type is None:
+                    content_type = sniff_image_type(chunk)
+                    if content_type is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Only {', '.join(settings.UPLOAD_ALLOWED_TYPES)} images are accepted"
+                        )
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        if content_type is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+
+        sha256 = digest.hexdigest()
+        url_path = blob_store.put(tmp_path, sha256, IMAGE_TYPES[content_type][0])
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return StoredUpload(blob_store.path_for(url_path), url_path, sha256, size, content_type)
+
+class _BodyTooLarge(Exception):
+    pass
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that caps multipart request bodies at max_bytes before
+    they are parsed. Starlette spools every uploaded file to disk while it
+    parses the form, so a limit checked in the handler only applies once the
+    whole body has been written. This middleware rejects a too-large
+    Content-Length up front. It also stops a chunked or understated body as
+    soon as it passes the cap. Both cases get a 413.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # The app may turn the aborted read into its own error response; ours wins
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded:
+            await self._reject(scope, receive, send)
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        return dict(scope["headers"]).get(b"content-type", b"").startswith(b"multipart/form-data")
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            {"detail": f"Upload exceeds {settings.UPLOAD_MAX_BYTES} bytes"},
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,24 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def upsert(session: Session, model, values: dict, conflict_columns, update_values: dict = None):
+    """
+    INSERT values, or apply update_values to the row already holding the same
+    conflict_columns, as one atomic statement. Unlike UPDATE-then-INSERT, two
+    transactions writing the same new key cannot fail with a duplicate key:
+    the second waits for the first and then updates its row. update_values
+    may refer to the existing row's columns (e.g. {"n": Model.n + 1}); without
+    them an existing row is left as it is. The result's rowcount is 0 then.
+    """
+    make_insert = CONFLICT_INSERTS.get(session.get_bind().dialect.name)
+    if make_insert is None:
+        # No ON CONFLICT support: plain insert, a concurrent first write raises IntegrityError
+        return session.execute(insert(model).values(**values))
+    stmt = make_insert(model).values(**values)
+    if update_values is None:
+        return session.execute(stmt.on_conflict_do_nothing(index_elements=list(conflict_columns)))
+    return session.execute(stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=update_values))
@@ -0,0 +1,119 @@
+"""
+API latency during a login burst.
+
+Fires a burst of concurrent logins at an in-process app while probing a
+cheap sync endpoint (a stand-in for /plants or /users/me, which share the
+request threadpool), and reports probe latency and login outcomes for:
+
+  inline     bcrypt verified inside the shared threadpool (previous behaviour)
+  offloaded  bcrypt on the dedicated PasswordHasher pool (current /auth/login)
+
+Usage (from backend/):
+    python -m benchmarks.bench_login_burst --logins 200 --rounds 12
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.database import Base
+from app.models import User
+from app.models.plant_log import PlantLog
+from app.routers import auth
+from app.services.password_hasher import PasswordHasher
+
+
+def build_app(context):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    db.add(User(email="bench@example.com", hashed_password=context.hash("correct horse")))
+    db.commit()
+    db.close()
+
+    def get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[database.get_db] = get_db
+
+    @app.post("/inline-login")
+    def inline_login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(database.get_db)):
+        user = db.query(User).filter(User.email == form_data.username).first()
+        if not user or not context.verify(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/probe")
+    def probe(db=Depends(database.get_db)):
+        return {"users": db.execute(text("SELECT COUNT(*) FROM users")).scalar()}
+
+    return app
+
+
+async def run(mode: str, logins: int, probes: int, context):
+    app = build_app(context)
+    path = "/inline-login" if mode == "inline" else "/auth/login"
+    form = {"username": "bench@example.com", "password": "correct horse"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/probe") # warm up
+
+        async def probe_loop():
+            latencies = []
+            for _ in range(probes):
+                start = time.perf_counter()
+                await client.get("/probe")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+            return latencies
+
+        started = time.perf_counter()
+        burst = asyncio.gather(*(client.post(path, data=form) for _ in range(logins)))
+        latencies, responses = await asyncio.gather(probe_loop(), burst)
+        elapsed = time.perf_counter() - started
+
+    codes = {}
+    for response in responses:
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    latencies.sort()
+    print(
+        f"{mode:>9}: probe p50={statistics.median(latencies):7.1f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:7.1f}ms max={latencies[-1]:7.1f}ms | "
+        f"logins {codes} in {elapsed:.1f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=32)
+    args = parser.parse_args()
+
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    auth.password_hasher = PasswordHasher(max_workers=args.workers, max_queue=args.queue, context=context)
+    for mode in ("inline", "offloaded"):
+        asyncio.run(run(mode, args.logins, args.probes, context))
+    auth.password_hasher.close()
+
+
+if __name__ == "__main__":
+    main()
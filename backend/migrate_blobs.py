@@ -0,0 +1,68 @@
+"""
+Move legacy flat uploads (uploads/<uuid>.jpg, uploads/<plant>_<ts>_<name>)
+into the content-addressed blob store and repoint every image_path at them.
+Duplicate images collapse into one blob. Safe to re-run: rows already under
+uploads/blobs/ are skipped, and an original is only removed after the rows
+pointing at it are committed.
+
+Usage (from backend/):
+    python migrate_blobs.py
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from sqlalchemy import select, union, update
+
+from app.database import SessionLocal
+import app.models # registers the mappers the image tables relate to
+from app.services.blob_store import BLOB_PREFIX, IMAGE_COLUMNS, blob_store
+from app.utils.uploads import IMAGE_TYPES, sniff_image_type
+
+def _hash_file(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        head = f.read(64)
+        digest.update(head)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest(), head
+
+def migrate():
+    db = SessionLocal()
+    moved = missing = 0
+    try:
+        legacy = db.execute(union(*(
+            select(column).where(column.isnot(None), ~column.startswith(f"uploads/{BLOB_PREFIX}/"))
+            for column in IMAGE_COLUMNS
+        ))).scalars().all()
+        print(f"Found {len(legacy)} legacy image paths.")
+
+        for old_path in legacy:
+            source = blob_store.path_for(old_path)
+            if not os.path.isfile(source):
+                print(f"Missing file, left as is: {old_path}")
+                missing += 1
+                continue
+
+            sha256, head = _hash_file(source)
+            content_type = sniff_image_type(head)
+            ext = IMAGE_TYPES[content_type][0] if content_type else (os.path.splitext(source)[1].lstrip(".").lower() or "bin")
+
+            fd, tmp_path = tempfile.mkstemp(dir=blob_store.root, suffix=".part")
+            os.close(fd)
+            shutil.copyfile(source, tmp_path)
+            new_path = blob_store.put(tmp_path, sha256, ext)
+
+            for column in IMAGE_COLUMNS:
+                db.execute(update(column.class_).where(column == old_path).values({column.key: new_path}))
+            db.commit()
+            os.remove(source)
+            moved += 1
+    finally:
+        db.close()
+    print(f"Migrated {moved} images into {BLOB_PREFIX}/ ({missing} missing on disk).")
+
+if __name__ == "__main__":
+    migrate()
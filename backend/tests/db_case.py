@@ -0,0 +1,41 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+# Register every mapper so relationships resolve whichever models a test imports
+from app.models import (
+    daily_activity, disease_record, garden_summary, job_run, onboarding_job,
+    plant, plant_log, plant_state, reminder, user, weather_cache_entry
+)
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    A fresh in-memory SQLite database per test. self.Session makes sessions
+    on it (all sharing one connection), self.db is one already open and
+    get_db() stands in for app.database.get_db. Subclasses call
+    super().setUp() first and add their own rows.
+    """
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.db = self.Session()
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(bind=self.engine)
+        self.engine.dispose()
+
+    def get_db(self):
+        db = self.Session()
+        try:
+            yield db
+        finally:
+            db.close()
@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+from app.models.disease_record import DiseaseRecord
+from app.models.daily_activity import DailyActivity
+from app.models.garden_summary import GardenSummary
+from app.services import activity
+from app.services.garden_summary import garden_summary_service
+from tests.db_case import DatabaseTestCase
+
+NOW = datetime(2026, 10, 19, 12, 0)
+TODAY = activity.day_number(NOW)
+
+
+class TestActivityStreaks(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User(email="streak@example.com")
+        self.db.add(user)
+        self.db.commit()
+        self.user_id = user.id
+        plant = Plant(name="Tom", species="Tomato", category="vegetables", user_id=self.user_id)
+        self.db.add(plant)
+        self.db.commit()
+        self.plant_id = plant.id
+
+    def log_on(self, days_ago):
+        self.db.add(PlantLog(plant_id=self.plant_id, height=10.0, recorded_at=NOW - timedelta(days=days_ago)))
+        self.db.commit()
+
+    def summary(self):
+        self.db.expire_all()
+        return self.db.get(GardenSummary, self.user_id)
+
+    def test_incremental_streak(self):
+        for days_ago in (4, 2, 1, 1, 0):
+            self.log_on(days_ago)
+        self.db.add(DiseaseRecord(plant_id=self.plant_id, predicted_class="Healthy", confidence=0.9, timestamp=NOW))
+        activity.mark_activity(self.db, self.user_id, NOW) # watering
+        self.db.commit()
+
+        summary = self.summary()
+        self.assertEqual((summary.streak_days, summary.streak_last_day), (3, TODAY))
+        rollup = dict(self.db.query(DailyActivity.day_number, DailyActivity.events).all())
+        self.assertEqual(rollup, {TODAY - 4: 1, TODAY - 2: 1, TODAY - 1: 2, TODAY: 3})
+
+    def test_streak_lapses_after_a_missed_day(self):
+        self.assertEqual(activity.current_streak(5, TODAY, today=TODAY + 1), 5)
+        self.assertEqual(activity.current_streak(5, TODAY, today=TODAY + 2), 0)
+        self.assertEqual(activity.current_streak(0, None, today=TODAY), 0)
+
+    def test_gaps_and_islands_matches_incremental(self):
+        other = User(email="other@example.com")
+        self.db.add(other)
+        self.db.flush()
+        self.db.add_all([DailyActivity(user_id=other.id, day_number=TODAY - d, events=1) for d in (0, 1, 2, 3, 7, 8)])
+        self.db.commit()
+        for days_ago in (9, 8, 6, 5):
+            self.log_on(days_ago)
+
+        streaks = activity.latest_streaks(self.db, [self.user_id, other.id, 999])
+        self.assertEqual(streaks[self.user_id], (2, TODAY - 5))
+        self.assertEqual(streaks[other.id], (4, TODAY))
+        self.assertEqual(streaks[999], (0, None))
+        summary = self.summary()
+        self.assertEqual((summary.streak_days, summary.streak_last_day), streaks[self.user_id])
+
+    def test_reconcile_repairs_back_dated_activity(self):
+        self.log_on(0)
+        self.log_on(2)
+        self.log_on(1) # back-dated: incremental path leaves it to reconcile
+        self.assertEqual(self.summary().streak_days, 1)
+        garden_summary_service.reconcile(self.db, [self.user_id])
+        self.db.commit()
+        self.assertEqual(self.summary().streak_days, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
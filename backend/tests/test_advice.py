@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.routers import advice
+from app.services.care_advisor import CareAdvisor
+from tests.db_case import DatabaseTestCase
+
+HOT = {"temperature": 35.0, "humidity": 50, "wind_speed": 5.0, "condition": "Clear sky", "is_day": 1}
+
+
+class TestGardenAdvice(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User(email="gardener@example.com", latitude=28.6, longitude=77.2)
+        self.db.add(self.user)
+        self.db.flush()
+        self.db.add_all([
+            Plant(name="Roma", species="Roma Tomato", user_id=self.user.id),
+            Plant(name="Cherry", species="Cherry Tomato", user_id=self.user.id),
+            Plant(name="Spike", species="Cactus", user_id=self.user.id),
+            Plant(name="Mystery", species="Xyzzy", user_id=self.user.id),
+        ])
+        self.db.commit()
+
+    def test_rules_run_once_per_profile(self):
+        with patch.object(CareAdvisor, "evaluate", wraps=CareAdvisor.evaluate) as evaluate:
+            result = CareAdvisor.get_garden_advice(["Roma Tomato", "Tomato", "Cactus", "Roma Tomato"], temperature=35.0)
+        self.assertEqual(evaluate.call_count, 2)
+        self.assertEqual(result["Roma Tomato"], result["Tomato"])
+        self.assertEqual(result["Roma Tomato"]["severity"], "critical")
+        self.assertEqual(result["Cactus"]["severity"], "success")
+
+    def test_garden_endpoint_fetches_weather_once(self):
+        with patch.object(advice.weather_service, "get_current_weather", return_value=HOT) as get_weather:
+            response = advice.get_garden_advice(db=self.db, current_user=self.user)
+
+        get_weather.assert_called_once_with(28.6, 77.2)
+        self.assertEqual(response.profiles_evaluated, 3)
+        self.assertEqual([p.name for p in response.plants], ["Roma", "Cherry", "Spike", "Mystery"])
+        self.assertEqual(response.plants[0].profile_name, "Tomato")
+        self.assertEqual(response.plants[0].text, response.plants[1].text)
+        self.assertIsNone(response.plants[3].profile_name)
+
+    def test_garden_endpoint_requires_location(self):
+        self.user.latitude = None
+        with self.assertRaises(HTTPException) as ctx:
+            advice.get_garden_advice(db=self.db, current_user=self.user)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+class TestQuantizedAdvice(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(advice.router)
+        self.client = TestClient(app)
+
+    def test_quantize_keeps_rule_outcome(self):
+        samples = [
+            (31.2, "Clear", 50, 0), (29.9, "Clear", 39.9, 25.1), (9.5, "Light rain", 60, 3),
+            (22.0, "Overcast", 35, 51), (15.0, "Drizzle", 85, 50.0), (12.0, "Clear", 41, 26),
+        ]
+        for species in ["Tomato", "Cactus", "Fern", "Xyzzy"]:
+            for inputs in samples:
+                raw = CareAdvisor.get_advice(species, *inputs)
+                snapped = CareAdvisor.get_quantized_advice(species, *inputs)
+                self.assertEqual(raw["severity"], snapped["severity"], (species, inputs))
+                self.assertEqual(raw["text"].split()[:2], snapped["text"].split()[:2], (species, inputs))
+
+    def test_nearby_inputs_share_a_response(self):
+        first = CareAdvisor.get_quantized_advice("Roma Tomato", 33.1, "Clear sky", 55, 4)
+        second = CareAdvisor.get_quantized_advice("tomato", 38.7, "Mainly clear", 62, 12)
+        self.assertIs(first, second)
+
+    def test_etag_and_not_modified(self):
+        params = {"species": "Fern", "temperature": 22.4, "humidity": 36.2, "quantize": "true"}
+        response = self.client.get("/advice/", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("35.0%", response.json()["text"])
+        etag = response.headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("max-age=", response.headers["cache-control"])
+
+        nearby = dict(params, temperature=25.0, humidity=35.1)
+        cached = self.client.get("/advice/", params=nearby, headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.headers["etag"], etag)
+
+        other = self.client.get("/advice/", params=dict(params, humidity=20), headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(other.headers["etag"], etag)
+
+    def test_rejects_non_finite_and_out_of_range_readings(self):
+        for bad in ({"temperature": "inf"}, {"temperature": "nan"}, {"humidity": "nan"},
+                    {"wind_speed": "inf"}, {"wind_speed": -1}, {"humidity": 101}):
+            params = dict({"species": "Fern", "temperature": 22.0, "quantize": "true"}, **bad)
+            response = self.client.get("/advice/", params=params)
+            self.assertEqual(response.status_code, 422, bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
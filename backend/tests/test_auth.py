@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app import database
+from app.models.user import User
+from app.routers import auth
+from app.services.password_hasher import HasherBusyError, PasswordHasher
+from tests.db_case import DatabaseTestCase
+
+
+def fast_context(rounds):
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+class TestAuthHashing(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.hasher = PasswordHasher(max_workers=1, max_queue=1, context=fast_context(5))
+        original = auth.password_hasher
+        auth.password_hasher = self.hasher
+        self.addCleanup(setattr, auth, "password_hasher", original)
+        self.addCleanup(self.hasher.close)
+
+        app = FastAPI()
+        app.include_router(auth.router)
+        app.dependency_overrides[database.get_db] = self.get_db
+        self.client = TestClient(app)
+
+    def stored_hash(self):
+        db = self.Session()
+        try:
+            return db.query(User.hashed_password).filter(User.email == "bee@example.com").scalar()
+        finally:
+            db.close()
+
+    def login(self, password="pollen"):
+        return self.client.post("/auth/login", data={"username": "bee@example.com", "password": password})
+
+    def test_register_login_and_rehash(self):
+        response = self.client.post("/auth/register", json={"email": "bee@example.com", "password": "pollen"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.stored_hash().startswith("$2b$05$"))
+
+        self.assertEqual(self.login("wrong").status_code, 401)
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith("$2b$05$"))
+
+        # Raising the work factor upgrades the stored hash on the next good login
+        self.hasher.context = fast_context(6)
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith("$2b$06$"))
+
+    def test_unknown_user_is_rejected(self):
+        self.assertEqual(self.login().status_code, 401)
+
+    def test_saturated_pool_sheds_load(self):
+        release = threading.Event()
+        hasher = PasswordHasher(max_workers=1, max_queue=1, context=fast_context(4))
+        self.addCleanup(hasher.close)
+        blocking = lambda *args: release.wait(5) or "hash"
+        hasher.context = type("Ctx", (), {"hash": staticmethod(blocking)})()
+
+        async def burst():
+            running = [asyncio.ensure_future(hasher.hash("x")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with self.assertRaises(HasherBusyError):
+                await hasher.hash("x")
+            self.assertEqual(hasher.stats()["pending"], 2)
+            release.set()
+            return await asyncio.gather(*running)
+
+        self.assertEqual(asyncio.run(burst()), [True, True])
+        self.assertEqual(hasher.stats()["rejected"], 1)
+        self.assertEqual(hasher.stats()["pending"], 0)
+
+    def test_busy_hasher_returns_503(self):
+        self.client.post("/auth/register", json={"email": "bee@example.com", "password": "pollen"})
+        self.hasher.max_workers = self.hasher.max_queue = 0
+        response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+from app.models.disease_record import DiseaseRecord
+from app.services.blob_store import BlobStore, plant_image_paths
+from tests.db_case import DatabaseTestCase
+
+
+class TestBlobStore(DatabaseTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.store = BlobStore(self.dir)
+        super().setUp()
+        self.user = User(email="blobs@example.com")
+        self.db.add(self.user)
+        self.db.flush()
+
+    def put(self, sha256, data=b"leaf"):
+        tmp_path = os.path.join(self.dir, f"{sha256}.part")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return self.store.put(tmp_path, sha256, "jpg")
+
+    def add_plant(self, image_path, log_image=None):
+        plant = Plant(name="P", species="Tomato", user_id=self.user.id, image_path=image_path)
+        self.db.add(plant)
+        self.db.flush()
+        self.db.add(DiseaseRecord(plant_id=plant.id, predicted_class="Healthy", confidence=0.9, image_path=image_path))
+        if log_image:
+            self.db.add(PlantLog(plant_id=plant.id, height=1.0, health_score=90.0, image_path=log_image))
+        self.db.commit()
+        return plant
+
+    def test_sharded_paths_and_dedup(self):
+        first = self.put("abcdef")
+        second = self.put("abcdef")
+        self.assertEqual(first, "uploads/blobs/ab/cd/abcdef.jpg")
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.isfile(os.path.join(self.dir, "blobs", "ab", "cd", "abcdef.jpg")))
+        self.assertEqual(sorted(os.listdir(self.dir)), ["blobs"])
+
+    def test_delete_frees_only_unreferenced_blobs(self):
+        shared, own = self.put("aa11"), self.put("bb22")
+        keep = self.add_plant(shared)
+        doomed = self.add_plant(shared, log_image=own)
+        self.assertEqual(self.store.reference_count(self.db, shared), 4)
+
+        image_paths = plant_image_paths(doomed)
+        self.db.delete(doomed)
+        self.db.commit()
+        self.assertEqual(self.store.release(self.db, image_paths), 1)
+        self.assertTrue(os.path.exists(self.store.path_for(shared)))
+        self.assertFalse(os.path.exists(self.store.path_for(own)))
+
+        image_paths = plant_image_paths(keep)
+        self.db.delete(keep)
+        self.db.commit()
+        self.assertEqual(self.store.release(self.db, image_paths), 1)
+        self.assertFalse(os.path.exists(self.store.path_for(shared)))
+
+    def test_recently_uploaded_blobs_survive_release(self):
+        self.store.grace_seconds = 60
+        path = self.put("cc33")
+        self.assertEqual(self.store.release(self.db, [path, "uploads/legacy.jpg", None]), 0)
+        self.assertTrue(os.path.exists(self.store.path_for(path)))
+
+    def test_sweep_frees_blobs_skipped_during_grace(self):
+        self.store.grace_seconds = 60
+        kept, orphan, fresh = self.put("dd44"), self.put("ee55"), self.put("ff66")
+        self.add_plant(kept)
+        old = time.time() - 120
+        for path in (kept, orphan):
+            os.utime(self.store.path_for(path), (old, old))
+        self.assertEqual(self.store.release(self.db, [fresh]), 0)
+
+        self.assertEqual(self.store.sweep(self.db), 1)
+        self.assertTrue(os.path.exists(self.store.path_for(kept)))
+        self.assertFalse(os.path.exists(self.store.path_for(orphan)))
+        self.assertTrue(os.path.exists(self.store.path_for(fresh)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+
+from app.utils.cache import TTLCache
+
+
+class DictBackend:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value, stored_at):
+        self.entries[key] = (value, stored_at)
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a") # "b" is now least recently used
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1, stored_at=time.time() - 120)
+        self.assertIsNone(cache.get("a"))
+
+    def test_none_is_not_cached(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        calls = []
+        loader = lambda: calls.append(1)
+        cache.get_or_load("a", loader)
+        cache.get_or_load("a", loader)
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        release = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            release.wait(2)
+            return {"temperature": 20}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("cell", slow_loader))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"temperature": 20}] * 8)
+        self.assertEqual(cache.stats()["loads"], 1)
+
+    def test_shared_backend_is_consulted_on_local_miss(self):
+        backend = DictBackend()
+        writer = TTLCache(maxsize=10, ttl=60, backend=backend)
+        reader = TTLCache(maxsize=10, ttl=60, backend=backend)
+        writer.get_or_load("cell", lambda: {"temperature": 30})
+
+        value = reader.get_or_load("cell", lambda: self.fail("should not load"))
+        self.assertEqual(value, {"temperature": 30})
+        stats = reader.stats()
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertEqual(stats["hit_ratio"], 1.0)
+
+    def test_stale_value_is_served_while_refreshing(self):
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=600)
+        cache.set("cell", {"temperature": 20}, stored_at=time.time() - 120)
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return {"temperature": 25}
+
+        value, age = cache.get_or_load_with_age("cell", loader)
+        self.assertEqual(value, {"temperature": 20})
+        self.assertGreaterEqual(age, 120)
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(50):
+            if cache.get("cell") is not None:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get("cell"), {"temperature": 25})
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=600)
+        cache.set("cell", {"temperature": 20}, stored_at=time.time() - 120)
+        cache.get_or_load("cell", lambda: None)
+        time.sleep(0.05)
+        self.assertIsNone(cache.get("cell"))
+        self.assertEqual(cache.get("cell", allow_stale=True), {"temperature": 20})
+
+
+if __name__ == '__main__':
+    unittest.main()
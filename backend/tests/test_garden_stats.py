@@ -0,0 +1,60 @@
+import unittest
+
+from sqlalchemy import event
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.plant_state import PlantState
+from app.models.garden_summary import GardenSummary
+from app.services.garden_summary import garden_summary_service
+from app.services.species_resolver import species_resolver
+from tests.db_case import DatabaseTestCase
+
+
+class TestGardenStats(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User(email="stats@example.com")
+        self.other = User(email="other@example.com")
+        self.db.add_all([self.user, self.other])
+        self.db.flush()
+
+    def add_plant(self, species, health=None, user=None):
+        plant = Plant(name=species, species=species, category=species_resolver.category(species), user_id=(user or self.user).id)
+        self.db.add(plant)
+        self.db.flush()
+        if health is not None:
+            self.db.add(PlantState(plant_id=plant.id, health_score=health))
+        return plant
+
+    def stats(self, user_id):
+        counters = garden_summary_service.aggregate(self.db, [user_id])[user_id]
+        return garden_summary_service.to_stats(GardenSummary(streak_days=0, **counters))
+
+    def test_empty_garden(self):
+        stats = self.stats(self.user.id)
+        self.assertEqual(stats.total_plants, 0)
+        self.assertEqual(stats.garden_status, "Good")
+
+    def test_counts_and_average_in_one_query(self):
+        self.add_plant("Roma Tomato", 90)
+        self.add_plant("Sweet Basil", 80)
+        self.add_plant("Peace Lily", 70)
+        self.add_plant("Cactus") # no state -> counts as 0 health
+        legacy = self.add_plant("Mint", 100)
+        legacy.category = None # rows created before the column existed
+        self.add_plant("Tomato", 10, user=self.other)
+        self.db.commit()
+        user_id = self.user.id
+
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        stats = self.stats(user_id)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual((stats.total_plants, stats.flowering, stats.vegetables, stats.herbs), (5, 3, 1, 1))
+        self.assertEqual(stats.garden_status, "Average") # (90 + 80 + 70 + 0 + 100) / 5 = 68
+
+
+if __name__ == '__main__':
+    unittest.main()
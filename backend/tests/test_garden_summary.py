@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import delete, event, insert
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.plant_state import PlantState
+from app.models.garden_summary import GardenSummary
+from app.services.garden_summary import GardenSummaryService, garden_summary_service
+from app.services.twin_engine import TwinEngine
+from tests.db_case import DatabaseTestCase
+
+
+class TestGardenSummary(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User(email="summary@example.com")
+        self.db.add(user)
+        self.db.commit()
+        self.user_id = user.id
+
+    def add_plant(self, species, category, health=None):
+        # Same two-step shape as POST /plants/
+        plant = Plant(name=species, species=species, category=category, user_id=self.user_id)
+        self.db.add(plant)
+        self.db.commit()
+        if health is not None:
+            self.db.add(PlantState(plant_id=plant.id, health_score=health))
+            self.db.commit()
+        return plant.id
+
+    def summary(self):
+        self.db.expire_all()
+        return self.db.get(GardenSummary, self.user_id)
+
+    def assert_matches_source(self):
+        expected = garden_summary_service.aggregate(self.db, [self.user_id])[self.user_id]
+        summary = self.summary()
+        for key, value in expected.items():
+            self.assertAlmostEqual(getattr(summary, key), value, msg=key)
+
+    def test_counters_follow_plant_writes(self):
+        tomato = self.add_plant("Tomato", "vegetables", 90.0)
+        self.add_plant("Basil", "herbs", 40.0)
+        self.add_plant("Rose", "flowering")
+        summary = self.summary()
+        self.assertEqual((summary.total_plants, summary.vegetables, summary.herbs, summary.flowering), (3, 1, 1, 1))
+        self.assertEqual(summary.health_sum, 130.0)
+        self.assertEqual(summary.needs_attention, 1)
+        self.assertIsNotNone(summary.last_activity_at)
+
+        # Health change through a TwinEngine path
+        state = self.db.query(PlantState).filter(PlantState.plant_id == tomato).one()
+        state.water_stress = 0.6
+        state.health_score = TwinEngine.calculate_health_score(state)
+        self.db.commit()
+        self.assert_matches_source()
+        self.assertEqual(self.summary().needs_attention, 2)
+
+        self.db.delete(self.db.get(Plant, tomato))
+        self.db.commit()
+        self.assert_matches_source()
+        self.assertEqual(self.summary().total_plants, 2)
+
+    def test_concurrent_first_write_is_merged(self):
+        real_expected = GardenSummaryService.expected
+
+        def racing_expected(session, user_ids):
+            # Another request creates the user's row between our UPDATE and INSERT
+            counters = real_expected(session, user_ids)
+            session.execute(insert(GardenSummary).values(user_id=self.user_id, total_plants=1, herbs=1))
+            return counters
+
+        with patch.object(GardenSummaryService, "expected", side_effect=racing_expected):
+            self.add_plant("Tomato", "vegetables")
+        summary = self.summary()
+        self.assertEqual((summary.total_plants, summary.vegetables, summary.herbs), (2, 1, 1))
+
+    def test_profile_read_is_a_primary_key_lookup(self):
+        self.add_plant("Tomato", "vegetables", 80.0)
+        self.db.expire_all()
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        stats = garden_summary_service.get_stats(self.db, self.user_id)
+        self.assertEqual(len(statements), 1)
+        self.assertIn("garden_summaries", statements[0])
+        self.assertEqual(stats.total_plants, 1)
+        self.assertEqual(stats.garden_status, "Good")
+
+    def test_missing_row_is_built_on_read(self):
+        self.add_plant("Tomato", "vegetables", 30.0)
+        self.db.execute(delete(GardenSummary))
+        self.db.commit()
+        stats = garden_summary_service.get_stats(self.db, self.user_id)
+        self.assertEqual(stats.total_plants, 1)
+        self.assertEqual(stats.garden_status, "Needs Attention")
+
+    def test_concurrent_first_reads_do_not_collide(self):
+        self.add_plant("Tomato", "vegetables", 30.0)
+        self.db.execute(delete(GardenSummary))
+        self.db.commit()
+        other = self.Session()
+        try:
+            garden_summary_service.reconcile(self.db, [self.user_id])
+            stats = garden_summary_service.get_stats(other, self.user_id)
+            self.db.commit()
+        finally:
+            other.close()
+        self.assertEqual(stats.total_plants, 1)
+        self.assertEqual(self.db.query(GardenSummary).count(), 1)
+
+    def test_reconcile_repairs_bulk_writes(self):
+        self.add_plant("Tomato", "vegetables", 80.0)
+        self.add_plant("Mint", "herbs", 80.0)
+        # Bulk delete bypasses the unit of work, so the summary drifts
+        self.db.execute(delete(PlantState))
+        self.db.execute(delete(Plant).where(Plant.category == "herbs"))
+        self.db.commit()
+        self.assertEqual(self.summary().total_plants, 2)
+
+        inserted, updated = garden_summary_service.reconcile(self.db, [self.user_id])
+        self.db.commit()
+        self.assertEqual((inserted, updated), (0, 1))
+        self.assert_matches_source()
+        self.assertEqual(garden_summary_service.reconcile(self.db, [self.user_id]), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
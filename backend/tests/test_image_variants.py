@@ -0,0 +1,88 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.routers import images
+from app.services.blob_store import blob_store
+from app.services.image_variants import image_variants
+
+
+class TestImageVariants(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        for name, value in [("root", self.dir), ("grace_seconds", blob_store.grace_seconds)]:
+            patcher = patch.object(blob_store, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (2000, 1500), (40, 160, 60)).save(buffer, format="JPEG", quality=95)
+        self.original = buffer.getvalue()
+        tmp_path = os.path.join(self.dir, "upload.part")
+        with open(tmp_path, "wb") as f:
+            f.write(self.original)
+        self.url_path = blob_store.put(tmp_path, "ab12" + "0" * 60, "jpg")
+
+        app = FastAPI()
+        app.include_router(images.router)
+        self.client = TestClient(app)
+
+    def test_generate_all_renders_every_variant(self):
+        image_variants.generate_all(self.url_path)
+        for variant, size in image_variants.sizes.items():
+            with Image.open(image_variants.path_for(self.url_path, variant)) as rendered:
+                self.assertEqual(rendered.format, "WEBP")
+                self.assertEqual(max(rendered.size), size)
+                self.assertEqual(rendered.size[0] * 3, rendered.size[1] * 4) # aspect ratio kept
+
+    def test_endpoint_renders_lazily_and_is_much_smaller(self):
+        path = image_variants.path_for(self.url_path, "thumb")
+        self.assertFalse(os.path.exists(path))
+        response = self.client.get("/images/thumb/" + self.url_path[len("uploads/"):])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "image/webp")
+        self.assertTrue(os.path.exists(path))
+        self.assertLess(len(response.content) * 10, len(self.original))
+
+        self.assertIn("immutable", response.headers["cache-control"])
+        etag = response.headers["etag"]
+        with patch.object(image_variants, "ensure") as ensure:
+            cached = self.client.get("/images/thumb/" + self.url_path[len("uploads/"):], headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        ensure.assert_not_called()
+
+    def test_release_removes_variants(self):
+        image_variants.generate_all(self.url_path)
+        blob_store.grace_seconds = 0
+        blob_store.release(_NoReferences(), [self.url_path])
+        self.assertFalse(os.path.exists(image_variants.path_for(self.url_path, "thumb")))
+        self.assertFalse(os.path.exists(blob_store.path_for(self.url_path)))
+
+    def test_unknown_paths_and_variants(self):
+        self.assertEqual(self.client.get("/images/thumb/blobs/zz/zz/missing.jpg").status_code, 404)
+        with self.assertRaises(HTTPException) as ctx:
+            images.get_image_variant(None, "thumb", "../app/main.py")
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual(self.client.get("/images/huge/" + self.url_path[len("uploads/"):]).status_code, 422)
+
+
+class _NoReferences:
+    """Stands in for a session in which nothing references the blob."""
+
+    def execute(self, statement):
+        return self
+
+    def scalar(self):
+        return 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+
+from app.services.leader_election import LeaderElection
+
+
+class TestLeaderElection(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_single_leader_per_lock(self):
+        first = LeaderElection("jobs", bind=self.engine)
+        second = LeaderElection("jobs", bind=self.engine)
+
+        self.assertTrue(first.is_leader())
+        self.assertFalse(second.is_leader())
+        # Leadership is sticky for the holder
+        self.assertTrue(first.is_leader())
+
+        first.release()
+        self.assertTrue(second.is_leader())
+        self.assertFalse(first.is_leader())
+        second.release()
+
+    def test_lock_names_are_independent(self):
+        heat = LeaderElection("heat", bind=self.engine)
+        rain = LeaderElection("rain", bind=self.engine)
+        self.assertTrue(heat.is_leader())
+        self.assertTrue(rain.is_leader())
+        self.assertNotEqual(heat.lock_path, rain.lock_path)
+        heat.release()
+        rain.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import asyncio
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import event
+
+from app import database
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.onboarding_job import OnboardingJob
+from app.models.plant_state import PlantState
+from app.routers import onboarding, plants
+from app.services.garden_summary import garden_summary_service
+from app.services.blob_store import blob_store
+from app.services.onboarding import OnboardingQueue
+from tests.db_case import DatabaseTestCase
+
+
+class InlineQueue(OnboardingQueue):
+    """Runs each job as soon as it is submitted."""
+
+    def __init__(self, *args, run_jobs=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.run_jobs = run_jobs
+
+    def submit(self, job_id):
+        if self.run_jobs:
+            self.run(job_id)
+
+
+class TestPlantOnboarding(DatabaseTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        patcher = patch.object(blob_store, "root", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        super().setUp()
+        db = self.Session()
+        db.add(User(email="grower@example.com"))
+        db.commit()
+        self.user = User(id=db.query(User.id).scalar(), email="grower@example.com")
+        db.close()
+
+        self.predictions = []
+        self.queue = InlineQueue(max_workers=1, session_factory=self.Session, predict=self.predict)
+        patcher = patch.object(onboarding, "onboarding_queue", self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+        app.include_router(onboarding.router)
+        app.include_router(plants.router)
+        app.dependency_overrides[database.get_db] = self.get_db
+        app.dependency_overrides[get_current_user] = lambda: self.user
+        self.client = TestClient(app)
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 64), (30, 140, 50)).save(buffer, format="PNG")
+        self.image = buffer.getvalue()
+
+    def predict(self, image_path):
+        self.predictions.append(image_path)
+        return {"class": "Tomato___Late_blight", "confidence": 0.9}
+
+    def onboard(self, key="key-1", name="Roma"):
+        return self.client.post(
+            "/onboarding/plants",
+            data={"name": name, "species": "Roma Tomato"},
+            files={"file": ("leaf.jpg", self.image, "image/jpeg")},
+            headers={"Idempotency-Key": key}
+        )
+
+    def test_accepts_and_completes_in_background(self):
+        response = self.onboard()
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual(response.headers["location"], f"/onboarding/jobs/{job['id']}")
+
+        polled = self.client.get(response.headers["location"]).json()
+        self.assertEqual((polled["status"], polled["stage"]), ("succeeded", "done"))
+
+        db = self.Session()
+        plant = db.get(Plant, job["plant_id"])
+        self.assertEqual(plant.onboarding_status, "ready")
+        self.assertEqual(plant.category, "vegetables")
+        self.assertLess(plant.plant_state.health_score, 100.0)
+        self.assertEqual([r.predicted_class for r in plant.disease_records], ["Tomato___Late_blight"])
+        db.close()
+
+    def test_retries_with_the_same_key_do_not_duplicate(self):
+        first = self.onboard(key="retry-me").json()
+        second = self.onboard(key="retry-me", name="Roma (retry)")
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(second.json()["id"], first["id"])
+        self.assertEqual(len(self.predictions), 1)
+
+        db = self.Session()
+        self.assertEqual(db.query(Plant).count(), 1)
+        db.close()
+        self.assertNotEqual(self.onboard(key="another").json()["plant_id"], first["plant_id"])
+
+    def test_failed_inference_marks_plant_failed(self):
+        self.queue.predict = lambda image_path: 1 / 0
+        job = self.onboard().json()
+        polled = self.client.get(f"/onboarding/jobs/{job['id']}").json()
+        self.assertEqual(polled["status"], "failed")
+        self.assertIn("division by zero", polled["error"])
+
+        db = self.Session()
+        self.assertEqual(db.get(Plant, job["plant_id"]).onboarding_status, "failed")
+        db.close()
+
+    def test_event_stream(self):
+        self.queue.run_jobs = False
+        job = self.onboard().json()
+        with patch.object(settings, "ONBOARDING_EVENTS_TIMEOUT_SECONDS", 0):
+            pending = self.client.get(f"/onboarding/jobs/{job['id']}/events")
+        self.assertEqual(pending.headers["content-type"], "text/event-stream; charset=utf-8")
+        self.assertTrue(pending.text.startswith("event: progress\n"))
+        self.assertIn('"status": "queued"', pending.text)
+
+        # The job is still queued, as after a restart; recovery picks it up
+        self.queue.run_jobs = True
+        self.assertEqual(self.queue.recover(), 1)
+        self.assertEqual(self.queue.recover(), 0)
+        done = self.client.get(f"/onboarding/jobs/{job['id']}/events")
+        self.assertEqual(done.text.count("event: "), 1)
+        self.assertTrue(done.text.startswith("event: done\n"))
+
+    def test_pending_plant_has_default_state_and_cannot_be_watered(self):
+        self.queue.run_jobs = False
+        job = self.onboard().json()
+
+        db = self.Session()
+        plant = db.get(Plant, job["plant_id"])
+        self.assertEqual(plant.onboarding_status, "pending")
+        self.assertEqual(plant.plant_state.health_score, 100.0)
+        self.assertEqual(garden_summary_service.get_stats(db, self.user.id).garden_status, "Good")
+        db.close()
+
+        response = self.client.post(f"/plants/{job['plant_id']}/water")
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("pending", response.json()["detail"])
+
+        self.queue.run_jobs = True
+        self.queue.recover()
+        db = self.Session()
+        plant = db.get(Plant, job["plant_id"])
+        self.assertEqual(db.query(PlantState).filter(PlantState.plant_id == plant.id).count(), 1)
+        self.assertLess(plant.plant_state.health_score, 100.0) # scored in place
+        db.close()
+        self.assertEqual(self.client.post(f"/plants/{job['plant_id']}/water").status_code, 200)
+
+    def test_database_work_stays_off_the_event_loop(self):
+        self.queue.run_jobs = False
+        on_loop = []
+
+        def record(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(args[2])
+            except RuntimeError:
+                pass
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        self.assertEqual(self.onboard(key="first").status_code, 202)
+        self.assertEqual(self.onboard(key="first").status_code, 202)
+        self.assertEqual(on_loop, [])
+
+    def test_jobs_are_private(self):
+        job = self.onboard().json()
+        self.user = User(id=self.user.id + 1, email="someone@example.com")
+        self.assertEqual(self.client.get(f"/onboarding/jobs/{job['id']}").status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
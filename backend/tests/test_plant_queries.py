@@ -0,0 +1,143 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.plant_log import PlantLog
+from app.models.plant_state import PlantState
+from app.models.disease_record import DiseaseRecord
+from app.schemas.plant_schema import PlantOut, PlantSummaryOut
+from app.services.plant_queries import attach_latest_history, history_page, list_plants_page
+from app.utils.pagination import decode_cursor, encode_cursor
+from tests.db_case import DatabaseTestCase
+
+
+class TestPlantListing(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        user = User(email="lister@example.com")
+        other = User(email="other@example.com")
+        db.add_all([user, other])
+        db.flush()
+        for i in range(7):
+            plant = Plant(name=f"P{i}", species="Tomato", user_id=user.id)
+            db.add(plant)
+            db.flush()
+            db.add(PlantState(plant_id=plant.id, health_score=90.0 - i, last_updated=datetime.utcnow()))
+            db.add_all([PlantLog(plant_id=plant.id, height=float(h), health_score=90.0) for h in range(3)])
+            db.add(DiseaseRecord(plant_id=plant.id, predicted_class="Healthy", confidence=0.9, image_path="x.jpg"))
+        db.add(Plant(name="Not mine", species="Rose", user_id=other.id))
+        db.commit()
+        self.user_id = user.id
+        db.close()
+
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def test_pages_follow_the_cursor(self):
+        names, cursor = [], None
+        while True:
+            plants, cursor = list_plants_page(self.db, self.user_id, limit=3, after_id=cursor, view="summary")
+            names.extend(p.name for p in plants)
+            if cursor is None:
+                break
+        self.assertEqual(names, [f"P{i}" for i in range(7)])
+
+    def test_full_view_is_a_fixed_number_of_queries(self):
+        plants, cursor = list_plants_page(self.db, self.user_id, limit=5, view="full")
+        payload = [PlantOut.model_validate(p).model_dump() for p in plants]
+        self.assertEqual(len(self.statements), 4) # plants + state + logs + disease records
+        self.assertIsNotNone(cursor)
+        self.assertEqual(len(payload[0]["logs"]), 3)
+        self.assertEqual(len(payload[4]["disease_records"]), 1)
+
+    def test_full_view_caps_history_per_plant(self):
+        plants, _ = list_plants_page(self.db, self.user_id, limit=50, view="full", history_limit=2)
+        payload = [PlantOut.model_validate(p).model_dump() for p in plants]
+        self.assertEqual(len(self.statements), 4)
+        for plant in payload:
+            self.assertEqual([log["height"] for log in plant["logs"]], [1.0, 2.0])
+            self.assertEqual(len(plant["disease_records"]), 1)
+
+    def test_summary_view_skips_histories(self):
+        plants, _ = list_plants_page(self.db, self.user_id, limit=50, view="summary")
+        payload = [PlantSummaryOut.model_validate(p).model_dump() for p in plants]
+        self.assertEqual(len(self.statements), 2) # plants + state
+        self.assertNotIn("logs", payload[0])
+        self.assertEqual(payload[6]["plant_state"]["health_score"], 84.0)
+
+
+class TestPlantHistory(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User(email="history@example.com")
+        self.db.add(user)
+        self.db.flush()
+        self.plant = Plant(name="Roma", species="Tomato", user_id=user.id)
+        self.db.add(self.plant)
+        self.db.flush()
+        self.start = datetime(2026, 1, 1)
+        # Pairs of logs share a timestamp so the id tie-break matters
+        self.db.add_all([
+            PlantLog(plant_id=self.plant.id, height=float(i), health_score=80.0, recorded_at=self.start + timedelta(days=i // 2))
+            for i in range(10)
+        ])
+        self.db.add_all([
+            DiseaseRecord(plant_id=self.plant.id, predicted_class="Healthy", confidence=0.9, image_path="x.jpg",
+                          timestamp=self.start + timedelta(days=i))
+            for i in range(3)
+        ])
+        self.db.commit()
+
+    def test_pages_are_newest_first_without_gaps(self):
+        heights, position = [], None
+        while True:
+            logs, position = history_page(self.db, PlantLog, PlantLog.recorded_at, self.plant.id, 3, position)
+            heights.extend(log.height for log in logs)
+            if position is None:
+                break
+            position = decode_cursor(encode_cursor(*position))
+        self.assertEqual(heights, [float(h) for h in range(9, -1, -1)])
+
+    def test_date_range(self):
+        logs, position = history_page(
+            self.db, PlantLog, PlantLog.recorded_at, self.plant.id, 50,
+            since=self.start + timedelta(days=1), until=self.start + timedelta(days=2)
+        )
+        self.assertEqual([log.height for log in logs], [5.0, 4.0, 3.0, 2.0])
+        self.assertIsNone(position)
+
+    def test_rows_without_time_page_last(self):
+        undated = [PlantLog(plant_id=self.plant.id, height=float(h), health_score=80.0) for h in (10, 11, 12)]
+        self.db.add_all(undated)
+        self.db.flush()
+        for log in undated:
+            log.recorded_at = None
+        self.db.commit()
+
+        heights, position = [], None
+        while True:
+            logs, position = history_page(self.db, PlantLog, PlantLog.recorded_at, self.plant.id, 4, position)
+            heights.extend(log.height for log in logs)
+            if position is None:
+                break
+            position = decode_cursor(encode_cursor(*position))
+        self.assertEqual(heights, [float(h) for h in range(9, -1, -1)] + [12.0, 11.0, 10.0])
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+
+    def test_bad_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_detail_gets_latest_history_in_time_order(self):
+        attach_latest_history(self.db, [self.plant], 4)
+        payload = PlantOut.model_validate(self.plant).model_dump()
+        self.assertEqual([log["height"] for log in payload["logs"]], [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(len(payload["disease_records"]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.services.principal_cache import PrincipalCache
+from app.utils.security import create_access_token
+from app import dependencies
+from tests.db_case import DatabaseTestCase
+
+
+class TestPrincipalCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        user = User(email="cached@example.com", full_name="Cached", latitude=1.0, longitude=2.0)
+        db.add(user)
+        db.commit()
+        self.user_id = user.id
+        db.close()
+
+        self.cache = PrincipalCache(maxsize=100, ttl=60)
+        original = dependencies.principal_cache
+        dependencies.principal_cache = self.cache
+        self.addCleanup(setattr, dependencies, "principal_cache", original)
+
+        self.token = create_access_token({"sub": "cached@example.com", "uid": self.user_id}, timedelta(minutes=5))
+        self.sessions = []
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def tearDown(self):
+        for db in self.sessions:
+            db.close()
+        super().tearDown()
+
+    def authenticate(self, token=None):
+        db = self.Session()
+        self.sessions.append(db)
+        return db, get_current_user(token or self.token, db)
+
+    def test_second_request_needs_no_query(self):
+        _, first = self.authenticate()
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("users.id =", self.statements[0])
+
+        db, second = self.authenticate()
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual((second.id, second.full_name, second.latitude), (self.user_id, "Cached", 1.0))
+        self.assertIn(second, db)
+
+    def test_cached_user_can_be_updated(self):
+        self.authenticate()
+        db, user = self.authenticate()
+        user.latitude = 10.0
+        db.commit()
+        self.cache.invalidate(user.email)
+
+        _, fresh = self.authenticate()
+        self.assertEqual(fresh.latitude, 10.0)
+
+    def test_invalidation_forces_reload(self):
+        self.authenticate()
+        self.cache.invalidate("cached@example.com")
+        self.authenticate()
+        self.assertEqual(len(self.statements), 2)
+
+    def test_generations_are_forgotten_after_a_ttl(self):
+        now = [0.0]
+        cache = PrincipalCache(maxsize=100, ttl=60, clock=lambda: now[0])
+        for i in range(50):
+            cache.invalidate(f"user{i}@example.com")
+        self.assertEqual(cache.generation("user0@example.com"), 1)
+        now[0] = 61.0
+        cache.invalidate("late@example.com")
+        self.assertEqual(list(cache._generations), ["late@example.com"])
+        self.assertEqual(cache.generation("user0@example.com"), 0)
+
+    def test_put_after_invalidation_is_skipped(self):
+        db = self.Session()
+        self.sessions.append(db)
+        user = db.get(User, self.user_id)
+        generation = self.cache.generation(user.email)
+        self.cache.invalidate(user.email)
+        self.cache.put(user.email, 1, user, generation)
+        self.assertIsNone(self.cache.get(db, user.email, 1))
+
+    def test_uid_must_match_subject(self):
+        token = create_access_token({"sub": "someone-else@example.com", "uid": self.user_id}, timedelta(minutes=5))
+        with self.assertRaises(HTTPException) as ctx:
+            self.authenticate(token)
+        self.assertEqual(ctx.exception.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
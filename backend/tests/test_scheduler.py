@@ -0,0 +1,144 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.models.user import User
+from app.models.plant import Plant
+from app.models.reminder import Reminder
+from app.models.job_run import JobRun
+from app.services import job_metrics, scheduler
+from tests.db_case import DatabaseTestCase
+
+
+def make_weather(temperature=25.0, condition="Clear sky"):
+    return {"temperature": temperature, "humidity": 50, "wind_speed": 5.0, "condition": condition, "is_day": 1}
+
+
+class TestSchedulerJobs(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for module in (scheduler, job_metrics):
+            patcher = patch.object(module, "SessionLocal", self.Session)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        db = self.Session()
+        self.hot_user = User(email="hot@example.com", latitude=28.6, longitude=77.2)
+        self.mild_user = User(email="mild@example.com", latitude=51.5, longitude=-0.1)
+        db.add_all([self.hot_user, self.mild_user])
+        db.flush()
+        self.hot_plants = [Plant(name=f"Hot {i}", species="Tomato", user_id=self.hot_user.id) for i in range(3)]
+        self.mild_plant = Plant(name="Mild", species="Fern", user_id=self.mild_user.id)
+        db.add_all(self.hot_plants + [self.mild_plant])
+        db.commit()
+        self.hot_plant_ids = [p.id for p in self.hot_plants]
+        self.mild_plant_id = self.mild_plant.id
+        db.close()
+
+    def _weather(self, hot=None, mild=None):
+        weather = {
+            (28.6, 77.2): hot or make_weather(),
+            (51.5, -0.1): mild or make_weather(),
+        }
+        return patch.object(
+            scheduler.weather_service, "fetch_current_many",
+            side_effect=lambda cells, concurrency=1: {cell: weather[cell] for cell in cells}
+        )
+
+    def test_heat_emergency_creates_one_reminder_per_plant(self):
+        with self._weather(hot=make_weather(temperature=41.0)):
+            scheduler.check_heat_emergencies()
+            # Second run the same day must not duplicate alerts
+            scheduler.check_heat_emergencies()
+
+        db = self.Session()
+        reminders = db.query(Reminder).all()
+        db.close()
+        self.assertEqual(sorted(r.plant_id for r in reminders), sorted(self.hot_plant_ids))
+        self.assertTrue(all(r.reminder_type == "water" and not r.is_completed for r in reminders))
+
+    def test_job_run_is_recorded(self):
+        with self._weather(hot=make_weather(temperature=41.0)):
+            scheduler.check_heat_emergencies()
+
+        db = self.Session()
+        run = db.query(JobRun).one()
+        db.close()
+        self.assertEqual(run.job_name, "check_heat_emergencies")
+        self.assertEqual(run.users_scanned, 2)
+        self.assertEqual(run.cells_fetched, 2)
+        self.assertEqual(run.rows_inserted, 3)
+        self.assertEqual(run.errors, 0)
+        self.assertIsNotNone(run.finished_at)
+
+    def test_failing_chunk_does_not_roll_back_other_chunks(self):
+        db = self.Session()
+        other = User(email="hot2@example.com", latitude=28.6, longitude=77.2)
+        db.add(other)
+        db.flush()
+        other_plant = Plant(name="Hot other", species="Basil", user_id=other.id)
+        db.add(other_plant)
+        db.commit()
+        other_plant_id = other_plant.id
+        db.close()
+
+        real_insert = scheduler.insert_heat_reminders
+        calls = []
+
+        def flaky_insert(db, user_ids, now):
+            calls.append(user_ids)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return real_insert(db, user_ids, now)
+
+        with self._weather(hot=make_weather(temperature=41.0)), \
+                patch.object(scheduler.settings, "SCHEDULER_USER_CHUNK_SIZE", 1), \
+                patch.object(scheduler, "insert_heat_reminders", side_effect=flaky_insert):
+            scheduler.check_heat_emergencies()
+
+        db = self.Session()
+        reminder_plants = [r.plant_id for r in db.query(Reminder).all()]
+        run = db.query(JobRun).one()
+        db.close()
+        self.assertEqual(reminder_plants, [other_plant_id])
+        self.assertEqual(run.users_scanned, 3)
+        self.assertEqual(run.errors, 1)
+
+    def test_heat_emergency_skips_plants_already_alerted(self):
+        db = self.Session()
+        db.add(Reminder(plant_id=self.hot_plant_ids[0], reminder_type="water",
+                        next_due_date=datetime.utcnow(), frequency="daily", is_completed=False))
+        db.commit()
+        db.close()
+
+        with self._weather(hot=make_weather(temperature=38.0)):
+            scheduler.check_heat_emergencies()
+
+        db = self.Session()
+        counts = {pid: db.query(Reminder).filter(Reminder.plant_id == pid).count() for pid in self.hot_plant_ids}
+        db.close()
+        self.assertEqual(list(counts.values()), [1, 1, 1])
+
+    def test_rain_skips_only_due_water_reminders(self):
+        now = datetime.utcnow()
+        db = self.Session()
+        due = Reminder(plant_id=self.hot_plant_ids[0], reminder_type="water", next_due_date=now, frequency="daily")
+        later = Reminder(plant_id=self.hot_plant_ids[1], reminder_type="water", next_due_date=now + timedelta(days=2), frequency="daily")
+        fertilizer = Reminder(plant_id=self.hot_plant_ids[2], reminder_type="fertilizer", next_due_date=now, frequency="weekly")
+        dry = Reminder(plant_id=self.mild_plant_id, reminder_type="water", next_due_date=now, frequency="daily")
+        db.add_all([due, later, fertilizer, dry])
+        db.commit()
+        ids = (due.id, later.id, fertilizer.id, dry.id)
+        db.close()
+
+        with self._weather(hot=make_weather(condition="Rain")):
+            scheduler.smart_skip_logic()
+
+        db = self.Session()
+        completed = [db.get(Reminder, rid).is_completed for rid in ids]
+        db.close()
+        self.assertEqual(completed, [True, False, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from app.services.care_advisor import CareAdvisor
+from app.services.species_resolver import SpeciesResolver, species_resolver
+
+
+class TestSpeciesResolver(unittest.TestCase):
+    def test_exact_and_case_insensitive_names(self):
+        self.assertEqual(species_resolver.resolve("Tomato")[0], "Tomato")
+        self.assertEqual(species_resolver.resolve("  snake   PLANT ")[0], "Snake Plant")
+        # An exact name wins over an earlier key it happens to contain ("Rose")
+        self.assertEqual(species_resolver.resolve("rosemary")[0], "Rosemary")
+
+    def test_free_text_uses_first_key_in_catalog_order(self):
+        self.assertEqual(species_resolver.resolve("Cherry Tomato")[0], "Tomato")
+        self.assertEqual(species_resolver.resolve("Pepper, bell___Bacterial_spot")[0], "Pepper, Bell")
+        self.assertEqual(species_resolver.resolve("my big monstera deliciosa")[0], "Monstera")
+
+    def test_unknown_species_gets_default_profile(self):
+        name, profile = species_resolver.resolve("Xyzzy")
+        self.assertIsNone(name)
+        self.assertEqual(profile, CareAdvisor.DEFAULT_PROFILE)
+        self.assertEqual(species_resolver.resolve(None)[1], CareAdvisor.DEFAULT_PROFILE)
+
+    def test_categories(self):
+        self.assertEqual(species_resolver.category("Tulsi (Holy Basil)"), "herbs")
+        self.assertEqual(species_resolver.category("Roma Tomato"), "vegetables")
+        self.assertEqual(species_resolver.category("Peace Lily"), "flowering")
+        self.assertEqual(species_resolver.category("Cactus"), "flowering")
+        # Earlier categories take precedence when several keywords match
+        self.assertEqual(species_resolver.category("Tomato with basil"), "vegetables")
+
+    def test_overlapping_patterns_match_like_substring_search(self):
+        profiles = {name: {"water": 1, "heat": 1, "desc": name} for name in ["bcd", "abcx", "c", "he", "she", "hers"]}
+        resolver = SpeciesResolver(profiles, {}, {}, "other")
+        for text in ["abcd", "ushers", "xhex", "abc", "her", "zzz", "abcx"]:
+            expected = next((name for name in profiles if name in text), None)
+            self.assertEqual(resolver.resolve(text)[0], expected, text)
+
+    def test_lookups_are_memoized(self):
+        resolver = SpeciesResolver({"Mint": {}}, {}, {"herbs": ["mint"]}, "other")
+        for _ in range(3):
+            resolver.resolve("Chocolate Mint")
+        self.assertEqual(resolver.cache_info()["resolve"]["hits"], 2)
+
+    def test_advisor_uses_resolved_name(self):
+        advice = CareAdvisor.get_advice("Garden Basil", temperature=35.0)
+        self.assertIn("Basil", advice["text"])
+        self.assertEqual(advice["severity"], "critical")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.blob_store import BlobStore
+from app.utils.http_cache import ImmutableStaticFiles, TransferCountingMiddleware, TransferStats, strong_etag
+
+DATA = bytes(range(256)) * 40
+
+
+class TestImmutableStaticFiles(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        store = BlobStore(self.dir)
+        tmp_path = os.path.join(self.dir, "upload.part")
+        with open(tmp_path, "wb") as f:
+            f.write(DATA)
+        self.blob_url = "/" + store.put(tmp_path, hashlib.sha256(DATA).hexdigest(), "jpg")
+        with open(os.path.join(self.dir, "legacy.jpg"), "wb") as f:
+            f.write(DATA)
+
+        self.transfer_stats = TransferStats(["/uploads"])
+        app = FastAPI()
+        app.mount("/uploads", ImmutableStaticFiles(directory=self.dir, etag_for=store.content_etag))
+        app.add_middleware(TransferCountingMiddleware, transfer_stats=self.transfer_stats)
+        self.client = TestClient(app)
+
+    def test_blobs_are_immutable_with_content_etag(self):
+        response = self.client.get(self.blob_url)
+        self.assertEqual(response.content, DATA)
+        self.assertEqual(response.headers["etag"], strong_etag(DATA))
+        self.assertEqual(response.headers["cache-control"], "public, max-age=31536000, immutable")
+
+        cached = self.client.get(self.blob_url, headers={"If-None-Match": strong_etag(DATA)})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+
+    def test_range_requests(self):
+        response = self.client.get(self.blob_url, headers={"Range": "bytes=100-199"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, DATA[100:200])
+        self.assertEqual(response.headers["content-range"], f"bytes 100-199/{len(DATA)}")
+
+    def test_legacy_files_keep_revalidating(self):
+        response = self.client.get("/uploads/legacy.jpg")
+        self.assertEqual(response.headers["cache-control"], "public, max-age=86400")
+        self.assertNotEqual(response.headers["etag"], strong_etag(DATA))
+
+    def test_bytes_served_counter(self):
+        self.client.get(self.blob_url)
+        self.client.get(self.blob_url, headers={"Range": "bytes=0-9"})
+        self.client.get(self.blob_url, headers={"If-None-Match": strong_etag(DATA)})
+        self.assertEqual(self.transfer_stats.stats()["/uploads"], {
+            "responses": 3, "not_modified": 1, "partial": 1, "bytes_sent": len(DATA) + 10
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.services.blob_store import blob_store
+from app.utils.uploads import UploadSizeLimitMiddleware, save_upload, sniff_image_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 200
+WEBP = b"RIFF\x00\x00\x00\x00WEBPVP8 " + b"\x00" * 200
+
+
+class TestSaveUpload(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        for name, value in [("UPLOAD_DIR", self.dir), ("UPLOAD_CHUNK_BYTES", 64), ("UPLOAD_MAX_BYTES", 1024)]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(blob_store, "root", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save(self, data, filename="leaf.jpg"):
+        return asyncio.run(save_upload(UploadFile(io.BytesIO(data), filename=filename)))
+
+    def test_sniffs_type_instead_of_trusting_filename(self):
+        self.assertEqual(sniff_image_type(JPEG), "image/jpeg")
+        self.assertEqual(sniff_image_type(WEBP), "image/webp")
+        upload = self.save(PNG, filename="leaf.jpg")
+        sha256 = hashlib.sha256(PNG).hexdigest()
+        self.assertEqual(upload.content_type, "image/png")
+        self.assertEqual(upload.sha256, sha256)
+        self.assertEqual(upload.url_path, f"uploads/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}.png")
+        self.assertEqual(upload.size, len(PNG))
+        with open(upload.path, "rb") as f:
+            self.assertEqual(f.read(), PNG)
+
+    def test_identical_images_share_a_blob(self):
+        first = self.save(JPEG, filename="a.jpg")
+        second = self.save(JPEG, filename="b.jpeg")
+        self.assertEqual(first.url_path, second.url_path)
+        self.assertEqual(os.listdir(self.dir), ["blobs"]) # no temp files left over
+
+    def test_rejects_non_images(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self.save(b"#!/bin/sh\nrm -rf /\n" * 10, filename="evil.png")
+        self.assertEqual(ctx.exception.status_code, 415)
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_rejects_oversized_stream_and_cleans_up(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self.save(JPEG * 10)
+        self.assertEqual(ctx.exception.status_code, 413)
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+
+class TestUploadSizeLimit(unittest.TestCase):
+    def setUp(self):
+        self.parsed = []
+        app = FastAPI()
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            self.parsed.append(file.filename)
+            return {"size": file.size}
+
+        app.add_middleware(UploadSizeLimitMiddleware, max_bytes=1024)
+        self.client = TestClient(app)
+
+    def multipart(self, data):
+        boundary = "leafboundary"
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"leaf.jpg\"\r\n"
+            f"Content-Type: image/jpeg\r\n\r\n"
+        ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+        return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    def test_small_upload_passes(self):
+        response = self.client.post("/upload", files={"file": ("leaf.jpg", JPEG, "image/jpeg")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.parsed, ["leaf.jpg"])
+
+    def test_declared_oversize_is_rejected_before_parsing(self):
+        response = self.client.post("/upload", files={"file": ("leaf.jpg", JPEG * 10, "image/jpeg")})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.parsed, [])
+
+    def test_streamed_oversize_is_cut_off(self):
+        body, headers = self.multipart(JPEG * 10)
+        chunks = (body[i:i + 256] for i in range(0, len(body), 256)) # chunked, no Content-Length
+        response = self.client.post("/upload", content=chunks, headers=headers)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.parsed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
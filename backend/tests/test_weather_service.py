@@ -0,0 +1,278 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import weather
+from app.services.weather_forecast import CellForecast
+from app.services.weather_service import WeatherService, settings, weather_cell
+from app.utils.resilience import CircuitBreaker, retry_with_jitter
+
+START = 1_760_000_400 # an exact hour
+
+
+def open_meteo_payload(lat=28.6, lon=77.2, hours=48, weathercode=61):
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "current_weather": {"temperature": 31.5, "windspeed": 12.0, "weathercode": weathercode, "is_day": 1},
+        "hourly": {
+            "time": [START + h * 3600 for h in range(hours)],
+            "temperature_2m": [20.0 + h for h in range(hours)],
+            "relativehumidity_2m": [40 + h for h in range(hours)],
+            "precipitation_probability": [None if h == 5 else h * 2 for h in range(hours)],
+        },
+    }
+
+
+class TestCellForecast(unittest.TestCase):
+    def setUp(self):
+        self.forecast = CellForecast.from_open_meteo(open_meteo_payload())
+
+    def test_lookups_use_the_hour_containing_the_timestamp(self):
+        ts = START + 3 * 3600 + 1799
+        self.assertEqual(self.forecast.index_at(ts), 3)
+        self.assertEqual(self.forecast.temperature_at(ts), 23.0)
+        self.assertEqual(self.forecast.humidity_at(ts), 43.0)
+        self.assertEqual(self.forecast.precipitation_probability_at(ts), 6.0)
+
+    def test_out_of_range_and_missing_hours(self):
+        self.assertIsNone(self.forecast.humidity_at(START - 1))
+        self.assertIsNone(self.forecast.humidity_at(START + 48 * 3600))
+        self.assertIsNone(self.forecast.precipitation_probability_at(START + 5 * 3600))
+
+    def test_temperatures_next(self):
+        self.assertEqual(self.forecast.temperatures_next(3, START + 46 * 3600), [66.0, 67.0])
+        self.assertEqual(self.forecast.temperatures_next(2, START), [20.0, 21.0])
+
+    def test_round_trips_through_dict(self):
+        restored = CellForecast.from_dict(self.forecast.to_dict())
+        self.assertEqual(restored.current, self.forecast.current)
+        self.assertEqual(restored.humidity_at(START + 7200), 42.0)
+        self.assertIsNone(restored.precipitation_probability_at(START + 5 * 3600))
+
+    def test_format_current_uses_current_hour(self):
+        weather = WeatherService.format_current(self.forecast, START + 10 * 3600)
+        self.assertEqual(weather["temperature"], 31.5)
+        self.assertEqual(weather["humidity"], 50.0)
+        self.assertEqual(weather["precipitation_probability"], 20.0)
+        self.assertEqual(weather["condition"], "Rain")
+
+
+class TestWeatherCell(unittest.TestCase):
+    def test_nearby_points_share_a_cell(self):
+        self.assertEqual(weather_cell(28.61, 77.23), weather_cell(28.64, 77.19))
+        self.assertEqual(weather_cell(28.61, 77.23), (28.6, 77.2))
+        self.assertNotEqual(weather_cell(28.61, 77.23), weather_cell(28.66, 77.23))
+
+
+class StubOpenMeteo(BaseHTTPRequestHandler):
+    """Answers like Open-Meteo: an object for one location, a list for several."""
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        lats = query["latitude"][0].split(",")
+        lons = query["longitude"][0].split(",")
+        StubOpenMeteo.requests.append(len(lats))
+        locations = [open_meteo_payload(float(lat), float(lon), weathercode=0 if float(lat) > 0 else 61)
+                     for lat, lon in zip(lats, lons)]
+        body = json.dumps(locations[0] if len(locations) == 1 else locations).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBulkFetch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenMeteo)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubOpenMeteo.requests = []
+        no_backoff = patch.object(settings, "WEATHER_RETRY_BASE_DELAY_SECONDS", 0)
+        no_backoff.start()
+        self.addCleanup(no_backoff.stop)
+        self.service = WeatherService()
+        self.service.BASE_URL = f"http://127.0.0.1:{self.server.server_port}/v1/forecast"
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_many_cells_in_one_request(self):
+        cells = [(10.0 + i, 20.0) for i in range(5)] + [(-5.0, 30.0)]
+        forecasts = self.service.fetch_forecasts(cells)
+
+        self.assertEqual(StubOpenMeteo.requests, [6])
+        self.assertEqual(set(forecasts), set(cells))
+        self.assertEqual(forecasts[(-5.0, 30.0)].current["weathercode"], 61)
+        self.assertEqual(forecasts[(12.0, 20.0)].current["weathercode"], 0)
+
+    def test_async_current_weather_uses_pooled_session_and_timeouts(self):
+        with patch.object(settings, "WEATHER_CONNECT_TIMEOUT_SECONDS", 1.5), \
+                patch.object(settings, "WEATHER_READ_TIMEOUT_SECONDS", 7.0):
+            service = WeatherService()
+        self.addCleanup(service.close)
+        service.BASE_URL = self.service.BASE_URL
+
+        with patch.object(service.http, "get", wraps=service.http.get) as get:
+            weather = asyncio.run(service.get_current_weather_async(28.6, 77.2))
+        self.assertEqual(weather["temperature"], 31.5)
+        self.assertFalse(weather["stale"])
+        self.assertEqual(StubOpenMeteo.requests, [1])
+        self.assertEqual(get.call_args.kwargs["timeout"], (1.5, 7.0))
+        self.assertEqual(service._async_limiter.total_tokens, settings.WEATHER_MAX_CONNECTIONS)
+        self.assertEqual(service.http.get_adapter(service.BASE_URL)._pool_maxsize, settings.WEATHER_MAX_CONNECTIONS)
+
+    def test_async_calls_run_off_the_event_loop(self):
+        threads = []
+        real_request = self.service._request_batch
+
+        def request_batch(batch):
+            threads.append(threading.current_thread())
+            return real_request(batch)
+
+        async def both():
+            return await asyncio.gather(
+                self.service.get_current_weather_async(28.6, 77.2),
+                self.service.get_current_weather_async(-5.0, 30.0)
+            )
+
+        with patch.object(self.service, "_request_batch", side_effect=request_batch):
+            results = asyncio.run(both())
+        self.assertEqual([r["condition"] for r in results], ["Clear sky", "Rain"])
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_batches_are_chunked(self):
+        cells = [(float(i), 1.0) for i in range(1, 8)]
+        with patch.object(settings, "WEATHER_BATCH_MAX_LOCATIONS", 3):
+            forecasts = self.service.fetch_forecasts(cells, concurrency=2)
+        self.assertEqual(sorted(StubOpenMeteo.requests), [1, 3, 3])
+        self.assertTrue(all(forecasts[cell] is not None for cell in cells))
+        self.assertEqual(self.service.upstream_calls, 3)
+
+    def test_single_location_response_is_an_object(self):
+        forecast = self.service.fetch_forecast(28.6, 77.2)
+        self.assertEqual(StubOpenMeteo.requests, [1])
+        self.assertEqual(forecast.current["temperature"], 31.5)
+
+    def test_get_current_weather_many_uses_cache(self):
+        cells = [(1.0, 1.0), (2.0, 2.0)]
+        first = self.service.get_current_weather_many(cells)
+        second = self.service.get_current_weather_many(cells + [(3.0, 3.0)])
+        self.assertEqual(StubOpenMeteo.requests, [2, 1])
+        self.assertEqual(first[(1.0, 1.0)]["condition"], "Clear sky")
+        self.assertEqual(len(second), 3)
+
+    def test_each_cell_is_one_cache_lookup(self):
+        cells = [(1.0, 1.0), (2.0, 2.0)]
+        self.service.get_current_weather_many(cells[:1])
+        self.service.get_current_weather_many(cells)
+        stats = self.service.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_upstream_failure_maps_cells_to_none(self):
+        with patch.object(StubOpenMeteo, "do_GET", lambda handler: handler.send_error(500)):
+            forecasts = self.service.fetch_forecasts([(1.0, 1.0), (2.0, 2.0)])
+        self.assertEqual(forecasts, {(1.0, 1.0): None, (2.0, 2.0): None})
+        self.assertEqual(self.service.upstream_errors, 1)
+        self.assertEqual(len(StubOpenMeteo.requests), 0)
+        self.assertEqual(self.service.upstream_calls, settings.WEATHER_RETRY_ATTEMPTS)
+
+    def test_client_errors_are_not_retried(self):
+        with patch.object(StubOpenMeteo, "do_GET", lambda handler: handler.send_error(400)):
+            self.service.fetch_forecasts([(1.0, 1.0)])
+        self.assertEqual(self.service.upstream_calls, 1)
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        self.service.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        with patch.object(StubOpenMeteo, "do_GET", lambda handler: handler.send_error(400)):
+            for _ in range(3):
+                self.service.fetch_forecasts([(1.0, 1.0)])
+        self.assertEqual(self.service.breaker.state, "closed")
+        self.assertEqual(self.service.upstream_errors, 3)
+
+    def test_open_circuit_serves_stale_weather(self):
+        cell = (1.0, 1.0)
+        self.service.get_current_weather_many([cell])
+        entry = self.service.cache._entries[cell]
+        self.service.cache._entries[cell] = (entry[0], time.time() - settings.WEATHER_CACHE_TTL_SECONDS - 60)
+        self.service.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+        with patch.object(StubOpenMeteo, "do_GET", lambda handler: handler.send_error(503)):
+            first = self.service.get_current_weather_many([cell])
+            calls = self.service.upstream_calls
+            second = self.service.get_current_weather_many([cell])
+
+        self.assertEqual(first[cell]["condition"], "Clear sky")
+        self.assertEqual(second[cell]["condition"], "Clear sky")
+        self.assertEqual(self.service.upstream_calls, calls)
+        stats = self.service.stats()
+        self.assertEqual(stats["circuit_state"], "open")
+        self.assertEqual(stats["short_circuited"], 1)
+
+    def test_current_weather_reports_age(self):
+        weather = self.service.get_current_weather(1.0, 1.0)
+        self.assertEqual(weather["age_seconds"], 0)
+        self.assertFalse(weather["stale"])
+
+
+class TestWeatherRoute(unittest.TestCase):
+    def test_rejects_out_of_range_coordinates(self):
+        app = FastAPI()
+        app.include_router(weather.router)
+        client = TestClient(app)
+        with patch.object(weather.weather_service, "get_current_weather_async") as get_weather:
+            self.assertEqual(client.get("/weather/", params={"lat": 91, "lon": 0}).status_code, 422)
+            self.assertEqual(client.get("/weather/", params={"lat": 0, "lon": -180.5}).status_code, 422)
+        get_weather.assert_not_called()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_allows_one_trial(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request()) # only one trial at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_retry_stops_on_non_retryable_errors(self):
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise KeyError("nope")
+
+        with self.assertRaises(KeyError):
+            retry_with_jitter(fail, attempts=3, base_delay=0, max_delay=0, should_retry=lambda e: not isinstance(e, KeyError))
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
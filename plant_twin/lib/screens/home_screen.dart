@@ -119,7 +119,7 @@ class _HomeScreenState extends State<HomeScreen> {
           );
           _refreshPlants();
         },
-        child: PlantCard(plant: plant, imageUrl: plant.imagePath != null ? _apiService.getImageUrl(plant.imagePath!) : null),
+        child: PlantCard(plant: plant, imageUrl: plant.imagePath != null ? _apiService.getImageUrl(plant.imagePath!, variant: 'thumb') : null),
       ),
     );
   }
@@ -155,7 +155,7 @@ class _PlantDetailScreenState extends State<PlantDetailScreen> {
                     fit: StackFit.expand,
                     children: [
                       plant.imagePath != null
-                          ? Image.network(_apiService.getImageUrl(plant.imagePath!), fit: BoxFit.cover)
+                          ? Image.network(_apiService.getImageUrl(plant.imagePath!, variant: 'medium'), fit: BoxFit.cover)
                           : Container(color: Colors.green.shade200, child: const Icon(Icons.park, size: 80, color: Colors.white)),
                       const DecoratedBox(
                         decoration: BoxDecoration(
@@ -339,7 +339,7 @@ class _PlantDetailScreenState extends State<PlantDetailScreen> {
                 decoration: BoxDecoration(
                   borderRadius: BorderRadius.circular(10),
                   image: log.imagePath != null 
-                    ? DecorationImage(image: NetworkImage(_apiService.getImageUrl(log.imagePath!)), fit: BoxFit.cover)
+                    ? DecorationImage(image: NetworkImage(_apiService.getImageUrl(log.imagePath!, variant: 'thumb')), fit: BoxFit.cover)
                     : null,
                   color: Colors.grey.shade100,
                 ),
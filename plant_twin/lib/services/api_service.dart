@@ -124,19 +124,29 @@ class ApiService {
     final token = await _getToken();
     if (token == null) throw Exception('Not authenticated');
 
-    final response = await http.get(
-      Uri.parse('$baseUrl/plants/'),
-      headers: {
-        'Authorization': 'Bearer $token',
-      },
-    );
+    // The list is paged; follow X-Next-Cursor until the last page. List
+    // screens don't show histories (details come from getPlantDetails).
+    final plants = <Plant>[];
+    String? cursor;
+    do {
+      final response = await http.get(
+        Uri.parse('$baseUrl/plants/').replace(queryParameters: {
+          'view': 'summary',
+          if (cursor != null) 'after_id': cursor,
+        }),
+        headers: {
+          'Authorization': 'Bearer $token',
+        },
+      );
 
-    if (response.statusCode == 200) {
+      if (response.statusCode != 200) {
+        throw Exception('Failed to fetch plants');
+      }
       final List<dynamic> data = jsonDecode(response.body);
-      return data.map((json) => Plant.fromJson(json)).toList();
-    } else {
-      throw Exception('Failed to fetch plants');
-    }
+      plants.addAll(data.map((json) => Plant.fromJson(json)));
+      cursor = response.headers['x-next-cursor'];
+    } while (cursor != null);
+    return plants;
   }
 
   Future<Plant> getPlantDetails(int plantId) async {
@@ -340,7 +350,11 @@ class ApiService {
   }
 
   // --- Helper to get image URL ---
-  String getImageUrl(String relativePath) {
+  // variant: null for the original, or "thumb" / "medium" for a downscaled WebP
+  String getImageUrl(String relativePath, {String? variant}) {
+    if (variant != null && relativePath.startsWith('uploads/')) {
+      return "$baseUrl/images/$variant/${relativePath.substring('uploads/'.length)}";
+    }
     return "$baseUrl/$relativePath";
   }
   Future<void> updateGrowthStage(int plantId, String stage) async {